@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark the built-in FIT decoder against fitparse.
+
+Decodes the workout messages (file_id, exercise_title, workout, workout_step)
+of every .fit file in the corpus with both decoders and reports throughput.
+
+Usage:
+    python benchmarks/bench_fit_decoder.py [FOLDER_OR_FILE ...] [--repeat N]
+
+Defaults to ~/GarminWorkouts when no corpus is given.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fit_decoder import WORKOUT_MESSAGE_TYPES, iter_fit_messages
+
+try:
+    from fitparse import FitFile
+    FITPARSE_AVAILABLE = True
+except ImportError:
+    FITPARSE_AVAILABLE = False
+
+
+def find_fit_files(paths):
+    """Expand folders into the .fit files they contain"""
+    files = []
+    for path in paths:
+        path = Path(path).expanduser()
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix.lower() == '.fit'))
+        elif path.is_file():
+            files.append(path)
+    return files
+
+
+def decode_native(data):
+    """Decode workout messages with the built-in decoder; returns message count"""
+    return sum(1 for _ in iter_fit_messages(data, WORKOUT_MESSAGE_TYPES))
+
+
+def decode_fitparse(data):
+    """Decode workout messages with fitparse; returns message count"""
+    fitfile = FitFile(data)
+    count = 0
+    for message_type in WORKOUT_MESSAGE_TYPES:
+        for record in fitfile.get_messages(message_type):
+            {field.name: field.value for field in record.fields}
+            count += 1
+    return count
+
+
+def run(name, decode, corpus, repeat):
+    """Time decode over the in-memory corpus, keeping the best of repeat runs"""
+    total_bytes = sum(len(data) for data in corpus)
+    best = None
+    messages = failures = 0
+    for _ in range(repeat):
+        messages = failures = 0
+        start = time.perf_counter()
+        for data in corpus:
+            try:
+                messages += decode(data)
+            except Exception:
+                failures += 1
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    mb = total_bytes / (1024 * 1024)
+    print(f"{name:<10} {best * 1000:10.1f} ms  {mb / best if best else 0:8.2f} MB/s  "
+          f"{len(corpus) / best if best else 0:9.1f} files/s  {messages:8d} msgs  {failures} failed")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the built-in FIT decoder against fitparse")
+    parser.add_argument('paths', nargs='*', default=[str(Path.home() / "GarminWorkouts")],
+                        help="FIT files or folders to decode")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per decoder (best is reported)")
+    args = parser.parse_args()
+
+    files = find_fit_files(args.paths)
+    if not files:
+        print("No .fit files found")
+        return 1
+
+    # Read everything up front so both decoders are timed on decoding alone
+    corpus = [f.read_bytes() for f in files]
+    total_mb = sum(len(data) for data in corpus) / (1024 * 1024)
+    print(f"Corpus: {len(corpus)} files, {total_mb:.2f} MB (best of {args.repeat})")
+    print()
+
+    native = run('native', decode_native, corpus, args.repeat)
+    if FITPARSE_AVAILABLE:
+        fitparse_time = run('fitparse', decode_fitparse, corpus, args.repeat)
+        if native:
+            print()
+            print(f"native is {fitparse_time / native:.1f}x faster than fitparse")
+    else:
+        print("fitparse not installed - skipping comparison")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
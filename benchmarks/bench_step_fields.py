@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for workout_step field decoding.
+
+Compares the table-driven decoder in step_fields.py against the elif chain
+it replaced, on the workout_step messages of a FIT corpus. Messages are
+decoded up front, so only the field-to-step conversion is timed.
+
+Usage:
+    python benchmarks/bench_step_fields.py [FOLDER_OR_FILE ...] [--repeat N]
+
+Defaults to ~/GarminWorkouts when no corpus is given.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fit_decoder import FitDecodeError, iter_fit_messages
+from step_fields import MAC_STEP_FIELD_HANDLERS, decode_step_fields
+from bench_fit_decoder import find_fit_files
+
+
+def decode_step_fields_elif(fields):
+    """The Mac parser's original per-field elif chain, kept as the baseline"""
+    step = {'is_rest': False, 'is_repeat': False}
+    for name, value in fields.items():
+        if name == 'wkt_step_name' and value:
+            step['name'] = value
+        elif name == 'exercise_category' and value:
+            step['category'] = str(value)
+        elif name == 'exercise_name':
+            step['exercise_id'] = value
+        elif name == 'duration_type':
+            dtype_str = str(value) if value else ''
+            step['duration_type'] = dtype_str
+            if 'repeat' in dtype_str.lower() or dtype_str in ('6', '7', '8', '9'):
+                step['is_repeat'] = True
+        elif name == 'duration_step' and value is not None:
+            step['duration_step'] = int(value)
+        elif name == 'duration_value' and value is not None:
+            if step.get('is_repeat'):
+                step['repeat_count'] = int(value)
+        elif name == 'duration_reps' and value:
+            step['reps'] = int(value)
+        elif name == 'duration_time' and value:
+            step['duration'] = float(value)
+        elif name == 'duration_distance' and value:
+            step['distance'] = float(value)
+        elif name == 'intensity':
+            intensity = str(value) if value is not None else None
+            step['intensity'] = intensity
+            if intensity in ('rest', '1', 1):
+                step['is_rest'] = True
+            elif intensity in ('warmup', '2', 2):
+                step['is_warmup'] = True
+        elif name == 'repeat_steps' and value:
+            step['is_repeat'] = True
+            step['repeat_count'] = int(value)
+        elif name == 'exercise_weight' and value:
+            step['weight'] = float(value)
+        elif name == 'weight_display_unit':
+            step['weight_unit'] = str(value) if value else 'kg'
+        elif name == 'notes' and value:
+            step['notes'] = value
+        elif name == 'target_type' and value:
+            step['target_type'] = str(value)
+        elif name == 'target_value' and value:
+            step['target_value'] = value
+    return step
+
+
+def decode_step_fields_table(fields):
+    return decode_step_fields(fields, MAC_STEP_FIELD_HANDLERS)
+
+
+def load_steps(files):
+    """Decode every workout_step message in the corpus"""
+    steps = []
+    for path in files:
+        try:
+            steps.extend(fields for _, fields in iter_fit_messages(path.read_bytes(), ('workout_step',)))
+        except (OSError, FitDecodeError):
+            pass
+    return steps
+
+
+def run(name, decode, steps, field_count, repeat):
+    """Time decode over all steps, keeping the best of repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for fields in steps:
+            decode(fields)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<8} {best * 1000:9.2f} ms  {best * 1e9 / field_count:7.1f} ns/field  "
+          f"{best * 1e9 / len(steps):8.1f} ns/step")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workout_step field decoding")
+    parser.add_argument('paths', nargs='*', default=[str(Path.home() / "GarminWorkouts")],
+                        help="FIT files or folders to take workout steps from")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per decoder (best is reported)")
+    args = parser.parse_args()
+
+    steps = load_steps(find_fit_files(args.paths))
+    if not steps:
+        print("No workout steps found")
+        return 1
+
+    mismatched = sum(1 for fields in steps
+                     if decode_step_fields_elif(fields) != decode_step_fields_table(fields))
+    field_count = sum(len(fields) for fields in steps)
+    print(f"Corpus: {len(steps)} steps, {field_count} fields (best of {args.repeat})")
+    if mismatched:
+        print(f"WARNING: {mismatched} steps decode differently")
+    print()
+
+    elif_time = run('elif', decode_step_fields_elif, steps, field_count, args.repeat)
+    table_time = run('table', decode_step_fields_table, steps, field_count, args.repeat)
+    print()
+    print(f"table is {elif_time / table_time:.2f}x the speed of the elif chain")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Display plans for workout previews.
+
+Previews show a workout's flat step list with its repeat structure made
+visible: an exercise followed by a rest and a repeat marker, or an exercise
+with sets > 1, is shown as a repeat header with the exercise and its rest
+nested beneath it. A display plan records that structure as a tuple of
+PlanRow(display_type, index, repeat_count) pointing back into the workout's
+steps, so building one copies no steps.
+
+Where a step lands in the plan depends only on its shape (repeat marker,
+rest, sets, repeat count), so plans are memoized on the workout's shape and
+shared by every workout with the same structure.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from workout_model import Step
+
+# display_type is 'repeat_header', 'nested_exercise', 'nested_rest' or
+# 'regular'; index is the step the row shows (the repeat marker or exercise
+# a header was made from; None for an implied rest); repeat_count is a
+# header's count and 0 for every other row
+PlanRow = namedtuple('PlanRow', ['display_type', 'index', 'repeat_count'])
+
+# Rest shown between the sets of an exercise with no rest step of its own,
+# like Garmin Connect's "Lap Button" rest
+IMPLIED_REST = Step({
+    'is_rest': True,
+    'step_type': 'rest',
+    'name': 'Rest',
+    'duration_type': 'open',
+    'rest_seconds': 0,
+})
+
+# Distinct workout shapes to remember plans for
+PLAN_CACHE_SIZE = 512
+
+
+def is_rest_step(step):
+    return bool(step.get('is_rest')) or step.get('step_type') == 'rest'
+
+
+def workout_shape(steps):
+    """The (is_repeat, is_rest, sets, repeat_count) of each step - all a plan depends on"""
+    shape = []
+    for step in steps:
+        is_repeat = bool(step.get('is_repeat', False))
+        shape.append((is_repeat, is_rest_step(step), step.get('sets', 1),
+                      step.get('repeat_count', 0) if is_repeat else 0))
+    return tuple(shape)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _plan_for_shape(shape):
+    rows = []
+    count = len(shape)
+    i = 0
+    while i < count:
+        is_repeat, is_rest, sets, _repeat_count = shape[i]
+
+        # Repeat markers are metadata, not displayable steps
+        if is_repeat:
+            i += 1
+            continue
+
+        if is_rest:
+            # A rest followed by an exercise with sets is shown with that exercise
+            if i + 1 < count and shape[i + 1][2] > 1:
+                i += 1
+                continue
+            rows.append(PlanRow('regular', i, 0))
+            i += 1
+            continue
+
+        # Explicit repeat: exercise -> rest -> repeat marker
+        if i + 2 < count and shape[i + 1][1] and shape[i + 2][0]:
+            rows.append(PlanRow('repeat_header', i + 2, shape[i + 2][3]))
+            rows.append(PlanRow('nested_exercise', i, 0))
+            rows.append(PlanRow('nested_rest', i + 1, 0))
+            i += 3
+            continue
+
+        # Exercise with sets > 1, followed by its rest or an implied one
+        if sets > 1:
+            rows.append(PlanRow('repeat_header', i, sets))
+            rows.append(PlanRow('nested_exercise', i, 0))
+            if i + 1 < count and shape[i + 1][1]:
+                rows.append(PlanRow('nested_rest', i + 1, 0))
+                i += 2
+            else:
+                rows.append(PlanRow('nested_rest', None, 0))
+                i += 1
+            continue
+
+        rows.append(PlanRow('regular', i, 0))
+        i += 1
+    return tuple(rows)
+
+
+def display_plan(steps):
+    """Return the (shared, memoized) display plan for a workout's steps"""
+    return _plan_for_shape(workout_shape(steps))
+
+
+def plan_step(row, steps):
+    """The step a plan row shows"""
+    return IMPLIED_REST if row.index is None else steps[row.index]
+
+
+def row_kind(row, step):
+    """How a plan row is drawn: repeat_header, nested_exercise, nested_rest,
+    rest, warmup or exercise"""
+    if row.display_type != 'regular':
+        return row.display_type
+    if is_rest_step(step):
+        return 'rest'
+    if step.get('step_type') == 'warmup':
+        return 'warmup'
+    return 'exercise'
@@ -0,0 +1,65 @@
+"""
+Shared, pre-indexed Garmin exercise lookup.
+
+amakaflow-fitfiletool's GarminExerciseLookup loads its exercise database on
+construction and normalizes, scans keywords and fuzzy-matches on every
+find(). ExerciseIndex wraps one lookup for the whole process: the database
+is loaded once, on first use, and each name's match is resolved on its first
+lookup and memoized by raw and normalized name. Resolving a name seen before
+(or one normalizing to the same thing) is then a dict probe, and nobody pays
+for resolving database entries no workout uses.
+"""
+
+import threading
+
+# Try to import amakaflow-fitfiletool's exercise lookup
+try:
+    from amakaflow_fitfiletool import GarminExerciseLookup
+    FITFILETOOL_AVAILABLE = True
+except ImportError:
+    FITFILETOOL_AVAILABLE = False
+
+
+class ExerciseIndex:
+    """GarminExerciseLookup with its matches memoized by normalized name.
+
+    Results are shared between callers and must not be modified.
+    """
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+        self._by_name = {}
+        self._by_normalized = {}
+
+    def find(self, step_name):
+        """Return the lookup's match for a step name (category_id, exercise_name_id, ...)"""
+        match = self._by_name.get(step_name)
+        if match is None:
+            normalized = self.lookup.normalize(step_name)
+            match = self._by_normalized.get(normalized)
+            if match is None:
+                match = self._by_normalized[normalized] = self.lookup.find(step_name)
+            self._by_name[step_name] = match
+        return match
+
+    def category_for(self, step_name):
+        """Return (category_id, exercise_name_id or None) for a step name"""
+        match = self.find(step_name)
+        return match['category_id'], match.get('exercise_name_id')
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_exercise_index():
+    """Return the process-wide ExerciseIndex, building it on first use.
+    Returns None when amakaflow-fitfiletool isn't installed."""
+    global _shared_index
+    if not FITFILETOOL_AVAILABLE:
+        return None
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = ExerciseIndex(GarminExerciseLookup())
+    return _shared_index
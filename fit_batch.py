@@ -0,0 +1,91 @@
+"""
+Batch parsing of FIT files across a pool of worker processes.
+
+Parsing is CPU-bound pure Python, so large batches are spread over a
+process pool that is started on first use and kept warm for later batches.
+Small batches are parsed in-process, where pool overhead would dominate.
+
+Workers must be module-level functions taking a file path (e.g. the ones in
+workout_parser.py) so they can be pickled into spawned processes. Apps that
+are frozen with PyInstaller must call multiprocessing.freeze_support() first
+thing in main().
+"""
+
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# Below this many files a batch is parsed in-process
+MIN_POOL_BATCH = 8
+
+# (filepath, value, error) - error is a message string when parsing failed
+BatchResult = namedtuple('BatchResult', ['filepath', 'value', 'error'])
+
+
+def _default_workers():
+    """Leave a core for the UI thread"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class BatchParser:
+    """Runs a per-file worker over many files on a warm process pool"""
+
+    def __init__(self, max_workers=None, min_pool_batch=MIN_POOL_BATCH):
+        self.max_workers = max_workers or _default_workers()
+        self.min_pool_batch = min_pool_batch
+        self._executor = None
+        # Batches may be started from background threads as well as the UI thread
+        self._lock = threading.Lock()
+
+    def parse_many(self, filepaths, worker, ordered=True):
+        """Yield a BatchResult per file, in input order or (ordered=False) as each completes.
+        A failure in one file is reported in its result and doesn't affect the others.
+        Closing the generator early cancels the files still waiting for a worker."""
+        filepaths = list(filepaths)
+        if len(filepaths) < self.min_pool_batch or self.max_workers < 2:
+            for filepath in filepaths:
+                yield self._run_inline(worker, filepath)
+            return
+
+        executor = self._get_executor()
+        futures = {executor.submit(worker, filepath): filepath for filepath in filepaths}
+        try:
+            for future in (futures if ordered else as_completed(futures)):
+                filepath = futures[future]
+                try:
+                    yield BatchResult(filepath, future.result(), None)
+                except BrokenProcessPool:
+                    # A worker died (e.g. crashed on a file); retry this file in-process
+                    self._discard_executor()
+                    yield self._run_inline(worker, filepath)
+                except Exception as e:
+                    yield BatchResult(filepath, None, str(e))
+        finally:
+            # If the caller stops early, files not yet started are dropped
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self._discard_executor()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _discard_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _run_inline(worker, filepath):
+        try:
+            return BatchResult(filepath, worker(filepath), None)
+        except Exception as e:
+            return BatchResult(filepath, None, str(e))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+FIT header and file CRC verification.
+
+FIT files carry a CRC-16 (reflected polynomial 0xA001, initial value 0) over
+the 12-byte header, when the header is 14 bytes long, and over the whole file
+after the data records. The checksum is computed two bytes per step from a
+65536-entry table, over a memory-mapped view of the file, in fixed-size
+chunks.
+
+Run as a script to scan folders for corrupted files:
+    python fit_crc.py [FOLDER_OR_FILE ...]
+"""
+
+import argparse
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+from fit_io import open_fit_buffer
+
+FIT_SIGNATURE = b'.FIT'
+
+# Bytes checksummed per chunk (must be even)
+CRC_CHUNK_SIZE = 1024 * 1024
+
+_CRC_TABLE_8 = None
+_CRC_TABLE_16 = None
+
+
+def _crc_tables():
+    """Build the byte and 16-bit lookup tables on first use"""
+    global _CRC_TABLE_8, _CRC_TABLE_16
+    if _CRC_TABLE_16 is None:
+        table8 = []
+        for byte in range(256):
+            crc = byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+            table8.append(crc)
+        # Two bytes at once: fold the low byte, then the high byte
+        table16 = array('H', bytes(2 * 65536))
+        for value in range(65536):
+            crc = (value >> 8) ^ table8[value & 0xFF]
+            table16[value] = (crc >> 8) ^ table8[crc & 0xFF]
+        _CRC_TABLE_8, _CRC_TABLE_16 = table8, table16
+    return _CRC_TABLE_8, _CRC_TABLE_16
+
+
+def fit_crc16(data, crc=0):
+    """Return the FIT CRC-16 of a bytes-like object, continuing from crc"""
+    table8, table16 = _crc_tables()
+    view = memoryview(data).cast('B')
+    size = len(view)
+    even = size & ~1
+    little_endian = sys.byteorder == 'little'
+
+    for start in range(0, even, CRC_CHUNK_SIZE):
+        chunk = view[start:min(start + CRC_CHUNK_SIZE, even)]
+        if little_endian:
+            words = chunk.cast('H')
+        else:
+            words = array('H', chunk)
+            words.byteswap()
+        for word in words:
+            crc = table16[crc ^ word]
+        if little_endian:
+            words.release()
+        chunk.release()
+
+    if size & 1:
+        crc = (crc >> 8) ^ table8[(crc ^ view[even]) & 0xFF]
+    return crc
+
+
+def verify_fit_crc(data):
+    """Check the header and file CRCs of every (chained) FIT file in a buffer.
+    Returns a list of issue strings; empty when everything checks out."""
+    buf = memoryview(data)
+    total = len(buf)
+    if not total:
+        return ["File is empty"]
+    issues = []
+    file_start = 0
+    while file_start < total:
+        if total - file_start < 12 or bytes(buf[file_start + 8:file_start + 12]) != FIT_SIGNATURE:
+            if file_start == 0:
+                issues.append("Not a FIT file (missing .FIT signature)")
+            else:
+                issues.append(f"{total - file_start} unexpected bytes after the file CRC")
+            break
+
+        header_size = buf[file_start]
+        data_size = struct.unpack_from('<I', buf, file_start + 4)[0]
+        if header_size < 12 or file_start + header_size > total:
+            issues.append(f"Invalid FIT header size: {header_size}")
+            break
+
+        if header_size >= 14:
+            header_crc = struct.unpack_from('<H', buf, file_start + 12)[0]
+            # A zero header CRC means "not computed"
+            if header_crc and fit_crc16(buf[file_start:file_start + 12]) != header_crc:
+                issues.append("FIT header CRC mismatch - the file header is corrupted")
+
+        crc_pos = file_start + header_size + data_size
+        if crc_pos + 2 > total:
+            issues.append("File is truncated - it's shorter than its header says "
+                          "(possibly an incomplete download)")
+            break
+        file_crc = struct.unpack_from('<H', buf, crc_pos)[0]
+        if fit_crc16(buf[file_start:crc_pos]) != file_crc:
+            issues.append("File CRC mismatch - the file is corrupted")
+
+        file_start = crc_pos + 2
+    return issues
+
+
+def check_fit_file_crc(filepath):
+    """Verify a FIT file's header and file CRCs; returns a list of issue strings"""
+    with open_fit_buffer(filepath) as data:
+        return verify_fit_crc(data)
+
+
+def scan(paths):
+    """Check every .fit file under paths, printing failures and throughput"""
+    files = []
+    for path in paths:
+        path = Path(path).expanduser()
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix.lower() == '.fit'))
+        elif path.is_file():
+            files.append(path)
+    if not files:
+        print("No .fit files found")
+        return 1
+
+    bad = 0
+    total_bytes = 0
+    start = time.perf_counter()
+    for path in files:
+        try:
+            total_bytes += path.stat().st_size
+            issues = check_fit_file_crc(path)
+        except OSError as e:
+            issues = [f"Could not read file: {e}"]
+        if issues:
+            bad += 1
+            print(f"✗ {path}")
+            for issue in issues:
+                print(f"    {issue}")
+    elapsed = time.perf_counter() - start
+
+    mb = total_bytes / (1024 * 1024)
+    print()
+    print(f"{len(files)} files, {mb:.2f} MB checked in {elapsed:.2f}s "
+          f"({mb / elapsed if elapsed else 0:.1f} MB/s) - {bad} corrupted")
+    return 1 if bad else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify FIT header and file CRCs")
+    parser.add_argument('paths', nargs='*', default=[str(Path.home() / "GarminWorkouts")],
+                        help="FIT files or folders to scan")
+    args = parser.parse_args()
+    return scan(args.paths)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+"""
+Native FIT decoder for workout files.
+
+Walks a FIT file record by record over a memoryview, honouring definition
+messages, local message types, architecture (endianness) and field sizes.
+Each definition is compiled once into a struct.Struct that unpacks a whole
+data record in a single call, so decoding does not depend on fitparse.
+"""
+
+import struct
+from datetime import datetime, timedelta
+
+from fit_io import open_fit_buffer
+
+FIT_HEADER_MIN_SIZE = 12
+FIT_SIGNATURE = b'.FIT'
+FIT_EPOCH = datetime(1989, 12, 31)
+# date_time values below this are relative (seconds since device power on)
+FIT_MIN_ABSOLUTE_TIME = 0x10000000
+
+
+class FitDecodeError(Exception):
+    """Raised when data is not a decodable FIT file"""
+
+
+# Base types keyed by base type number (low 5 bits of the base type byte):
+# (struct format char, size in bytes, invalid value)
+BASE_TYPES = {
+    0x00: ('B', 1, 0xFF),                   # enum
+    0x01: ('b', 1, 0x7F),                   # sint8
+    0x02: ('B', 1, 0xFF),                   # uint8
+    0x03: ('h', 2, 0x7FFF),                 # sint16
+    0x04: ('H', 2, 0xFFFF),                 # uint16
+    0x05: ('i', 4, 0x7FFFFFFF),             # sint32
+    0x06: ('I', 4, 0xFFFFFFFF),             # uint32
+    0x07: ('s', 1, None),                   # string
+    0x08: ('f', 4, None),                   # float32
+    0x09: ('d', 8, None),                   # float64
+    0x0A: ('B', 1, 0x00),                   # uint8z
+    0x0B: ('H', 2, 0x0000),                 # uint16z
+    0x0C: ('I', 4, 0x00000000),             # uint32z
+    0x0D: ('B', 1, 0xFF),                   # byte
+    0x0E: ('q', 8, 0x7FFFFFFFFFFFFFFF),     # sint64
+    0x0F: ('Q', 8, 0xFFFFFFFFFFFFFFFF),     # uint64
+    0x10: ('Q', 8, 0x0000000000000000),     # uint64z
+}
+
+
+# =========================================================================
+# Profile (subset of the FIT SDK profile needed for workout files)
+# =========================================================================
+
+MANUFACTURER = {
+    1: 'garmin', 13: 'dynastream_oem', 15: 'dynastream', 89: 'tacx', 255: 'development',
+}
+
+GARMIN_PRODUCT = {
+    20119: 'training_center', 65534: 'connect',
+}
+
+FILE_TYPE = {
+    1: 'device', 2: 'settings', 3: 'sport', 4: 'activity', 5: 'workout',
+    6: 'course', 7: 'schedules', 9: 'weight', 10: 'totals', 11: 'goals',
+    14: 'blood_pressure', 15: 'monitoring_a', 20: 'activity_summary',
+    28: 'monitoring_daily', 32: 'monitoring_b', 34: 'segment', 35: 'segment_list',
+}
+
+SPORT = {
+    0: 'generic', 1: 'running', 2: 'cycling', 3: 'transition', 4: 'fitness_equipment',
+    5: 'swimming', 6: 'basketball', 7: 'soccer', 8: 'tennis', 9: 'american_football',
+    10: 'training', 11: 'walking', 12: 'cross_country_skiing', 13: 'alpine_skiing',
+    14: 'snowboarding', 15: 'rowing', 16: 'mountaineering', 17: 'hiking',
+    18: 'multisport', 19: 'paddling', 20: 'flying', 21: 'e_biking', 22: 'motorcycling',
+    23: 'boating', 24: 'driving', 25: 'golf', 26: 'hang_gliding', 27: 'horseback_riding',
+    28: 'hunting', 29: 'fishing', 30: 'inline_skating', 31: 'rock_climbing',
+    32: 'sailing', 33: 'ice_skating', 34: 'sky_diving', 35: 'snowshoeing',
+    36: 'snowmobiling', 37: 'stand_up_paddleboarding', 38: 'surfing',
+    39: 'wakeboarding', 40: 'water_skiing', 41: 'kayaking', 42: 'rafting',
+    43: 'windsurfing', 44: 'kitesurfing', 45: 'tactical', 46: 'jumpmaster',
+    47: 'boxing', 48: 'floor_climbing', 53: 'diving', 62: 'hiit', 64: 'racket',
+    254: 'all',
+}
+
+SUB_SPORT = {
+    0: 'generic', 1: 'treadmill', 2: 'street', 3: 'trail', 4: 'track', 5: 'spin',
+    6: 'indoor_cycling', 7: 'road', 8: 'mountain', 9: 'downhill', 10: 'recumbent',
+    11: 'cyclocross', 12: 'hand_cycling', 13: 'track_cycling', 14: 'indoor_rowing',
+    15: 'elliptical', 16: 'stair_climbing', 17: 'lap_swimming', 18: 'open_water',
+    19: 'flexibility_training', 20: 'strength_training', 21: 'warm_up', 22: 'match',
+    23: 'exercise', 24: 'challenge', 25: 'indoor_skiing', 26: 'cardio_training',
+    27: 'indoor_walking', 28: 'e_bike_fitness', 29: 'bmx', 30: 'casual_walking',
+    31: 'speed_walking', 32: 'bike_to_run_transition', 33: 'run_to_bike_transition',
+    34: 'swim_to_bike_transition', 35: 'atv', 36: 'motocross', 37: 'backcountry',
+    38: 'resort', 39: 'rc_drone', 40: 'wingsuit', 41: 'whitewater',
+    42: 'skate_skiing', 43: 'yoga', 44: 'pilates', 45: 'indoor_running',
+    46: 'gravel_cycling', 47: 'e_bike_mountain', 48: 'commuting',
+    49: 'mixed_surface', 50: 'navigate', 51: 'track_me', 52: 'map', 254: 'all',
+}
+
+WKT_STEP_DURATION = {
+    0: 'time', 1: 'distance', 2: 'hr_less_than', 3: 'hr_greater_than', 4: 'calories',
+    5: 'open', 6: 'repeat_until_steps_cmplt', 7: 'repeat_until_time',
+    8: 'repeat_until_distance', 9: 'repeat_until_calories',
+    10: 'repeat_until_hr_less_than', 11: 'repeat_until_hr_greater_than',
+    12: 'repeat_until_power_less_than', 13: 'repeat_until_power_greater_than',
+    14: 'power_less_than', 15: 'power_greater_than', 16: 'training_peaks_tss',
+    17: 'repeat_until_power_last_lap_less_than',
+    18: 'repeat_until_max_power_last_lap_less_than', 19: 'power_3s_less_than',
+    20: 'power_10s_less_than', 21: 'power_30s_less_than', 22: 'power_3s_greater_than',
+    23: 'power_10s_greater_than', 24: 'power_30s_greater_than',
+    25: 'power_lap_less_than', 26: 'power_lap_greater_than',
+    27: 'repeat_until_training_peaks_tss', 28: 'repetition_time', 29: 'reps',
+    31: 'time_only',
+}
+
+WKT_STEP_TARGET = {
+    0: 'speed', 1: 'heart_rate', 2: 'open', 3: 'cadence', 4: 'power', 5: 'grade',
+    6: 'resistance', 7: 'power_3s', 8: 'power_10s', 9: 'power_30s', 10: 'power_lap',
+    11: 'swim_stroke', 12: 'speed_lap', 13: 'heart_rate_lap',
+}
+
+INTENSITY = {
+    0: 'active', 1: 'rest', 2: 'warmup', 3: 'cooldown', 4: 'recovery',
+    5: 'interval', 6: 'other',
+}
+
+EXERCISE_CATEGORY = {
+    0: 'bench_press', 1: 'calf_raise', 2: 'cardio', 3: 'carry', 4: 'chop', 5: 'core',
+    6: 'crunch', 7: 'curl', 8: 'deadlift', 9: 'flye', 10: 'hip_raise',
+    11: 'hip_stability', 12: 'hip_swing', 13: 'hyperextension', 14: 'lateral_raise',
+    15: 'leg_curl', 16: 'leg_raise', 17: 'lunge', 18: 'olympic_lift', 19: 'plank',
+    20: 'plyo', 21: 'pull_up', 22: 'push_up', 23: 'row', 24: 'shoulder_press',
+    25: 'shoulder_stability', 26: 'shrug', 27: 'sit_up', 28: 'squat',
+    29: 'total_body', 30: 'triceps_extension', 31: 'warm_up', 32: 'run',
+    65534: 'unknown',
+}
+
+FIT_BASE_UNIT = {0: 'other', 1: 'kilogram', 2: 'pound'}
+
+
+def _enum(table):
+    return lambda value: table.get(value, value)
+
+
+def _scale(factor):
+    return lambda value: value / factor
+
+
+def _date_time(value):
+    if value < FIT_MIN_ABSOLUTE_TIME:
+        return value
+    return FIT_EPOCH + timedelta(seconds=value)
+
+
+def _string(value):
+    text = value.split(b'\x00', 1)[0]
+    return text.decode('utf-8', errors='replace') if text else None
+
+
+# Global message number -> (message name, {field number: (field name, converter)})
+MESSAGES = {
+    0: ('file_id', {
+        0: ('type', _enum(FILE_TYPE)),
+        1: ('manufacturer', _enum(MANUFACTURER)),
+        2: ('product', None),
+        3: ('serial_number', None),
+        4: ('time_created', _date_time),
+        5: ('number', None),
+        8: ('product_name', None),
+    }),
+    26: ('workout', {
+        4: ('sport', _enum(SPORT)),
+        5: ('capabilities', None),
+        6: ('num_valid_steps', None),
+        8: ('wkt_name', None),
+        11: ('sub_sport', _enum(SUB_SPORT)),
+        14: ('pool_length', _scale(100)),
+        15: ('pool_length_unit', None),
+    }),
+    27: ('workout_step', {
+        254: ('message_index', None),
+        0: ('wkt_step_name', None),
+        1: ('duration_type', _enum(WKT_STEP_DURATION)),
+        2: ('duration_value', None),
+        3: ('target_type', _enum(WKT_STEP_TARGET)),
+        4: ('target_value', None),
+        5: ('custom_target_value_low', None),
+        6: ('custom_target_value_high', None),
+        7: ('intensity', _enum(INTENSITY)),
+        8: ('notes', None),
+        9: ('equipment', None),
+        10: ('exercise_category', _enum(EXERCISE_CATEGORY)),
+        11: ('exercise_name', None),
+        12: ('exercise_weight', _scale(100)),
+        13: ('weight_display_unit', _enum(FIT_BASE_UNIT)),
+        19: ('secondary_target_type', _enum(WKT_STEP_TARGET)),
+        20: ('secondary_target_value', None),
+    }),
+    264: ('exercise_title', {
+        254: ('message_index', None),
+        0: ('exercise_category', _enum(EXERCISE_CATEGORY)),
+        1: ('exercise_name', None),
+        2: ('wkt_step_name', None),
+    }),
+}
+
+MESSAGE_NUMBERS = {name: num for num, (name, _fields) in MESSAGES.items()}
+
+# Messages needed to build a workout preview
+WORKOUT_MESSAGE_TYPES = ('file_id', 'exercise_title', 'workout', 'workout_step')
+
+_REPEAT_UNTIL_HR = ('repeat_until_hr_less_than', 'repeat_until_hr_greater_than')
+_REPEAT_UNTIL_POWER = ('repeat_until_power_less_than', 'repeat_until_power_greater_than')
+
+# Dynamic fields: message number ->
+#   {field name: ((reference field, {reference value: (subfield name, converter)}), ...)}
+# The first reference that matches wins, mirroring the FIT SDK subfield order.
+SUBFIELDS = {
+    0: {
+        'product': (
+            ('manufacturer', {m: ('garmin_product', _enum(GARMIN_PRODUCT))
+                              for m in ('garmin', 'dynastream', 'dynastream_oem', 'tacx')}),
+        ),
+    },
+    27: {
+        'duration_value': (
+            ('duration_type', {
+                'time': ('duration_time', _scale(1000)),
+                'repetition_time': ('duration_time', _scale(1000)),
+                'distance': ('duration_distance', _scale(100)),
+                'hr_less_than': ('duration_hr', None),
+                'hr_greater_than': ('duration_hr', None),
+                'calories': ('duration_calories', None),
+                'power_less_than': ('duration_power', None),
+                'power_greater_than': ('duration_power', None),
+                'reps': ('duration_reps', None),
+                **{d: ('duration_step', None) for d in (
+                    'repeat_until_steps_cmplt', 'repeat_until_time', 'repeat_until_distance',
+                    'repeat_until_calories') + _REPEAT_UNTIL_HR + _REPEAT_UNTIL_POWER},
+            }),
+        ),
+        'target_value': (
+            ('target_type', {
+                'speed': ('target_speed_zone', None),
+                'heart_rate': ('target_hr_zone', None),
+                'cadence': ('target_cadence_zone', None),
+                'power': ('target_power_zone', None),
+                'swim_stroke': ('target_stroke_type', None),
+            }),
+            ('duration_type', {
+                'repeat_until_steps_cmplt': ('repeat_steps', None),
+                'repeat_until_time': ('repeat_time', _scale(1000)),
+                'repeat_until_distance': ('repeat_distance', _scale(100)),
+                'repeat_until_calories': ('repeat_calories', None),
+                **{d: ('repeat_hr', None) for d in _REPEAT_UNTIL_HR},
+                **{d: ('repeat_power', None) for d in _REPEAT_UNTIL_POWER},
+            }),
+        ),
+    },
+}
+
+
+# =========================================================================
+# Decoder
+# =========================================================================
+
+class _Definition:
+    """Compiled definition message for one local message type"""
+
+    __slots__ = ('global_num', 'name', 'size', 'unpack_from', 'fields', 'subfields')
+
+    def __init__(self, global_num, little_endian, field_defs, dev_size, wanted, field_names=None):
+        self.global_num = global_num
+        profile = MESSAGES.get(global_num)
+        self.name = profile[0] if profile else f'unknown_{global_num}'
+        self.subfields = SUBFIELDS.get(global_num)
+
+        decode = wanted is None or global_num in wanted
+        profile_fields = profile[1] if profile else {}
+
+        parts = ['<' if little_endian else '>']
+        fields = []
+        index = 0
+        for field_num, size, base_type in field_defs:
+            fmt_char, base_size, invalid = BASE_TYPES.get(base_type & 0x1F, ('B', 1, 0xFF))
+            name, convert = profile_fields.get(field_num, (None, None))
+            if name is None and profile is None and decode:
+                name = f'field_{field_num}'
+            if field_names is not None and name not in field_names:
+                name = None
+            if not decode or name is None or size == 0:
+                parts.append(f'{size}x')
+                continue
+            if fmt_char == 's':
+                parts.append(f'{size}s')
+                fields.append((name, index, 1, None, convert or _string))
+                index += 1
+            elif size % base_size:
+                # Malformed size for this base type - keep the raw bytes
+                parts.append(f'{size}s')
+                fields.append((name, index, 1, None, bytes))
+                index += 1
+            else:
+                count = size // base_size
+                parts.append(f'{count}{fmt_char}' if count > 1 else fmt_char)
+                fields.append((name, index, count, invalid, convert))
+                index += count
+        if dev_size:
+            parts.append(f'{dev_size}x')
+
+        compiled = struct.Struct(''.join(parts))
+        self.size = compiled.size
+        self.unpack_from = compiled.unpack_from
+        self.fields = tuple(fields) if decode else None
+
+    def decode(self, buf, offset):
+        """Decode the data record starting at offset into a {field name: value} dict"""
+        values = self.unpack_from(buf, offset)
+        message = {}
+        for name, index, count, invalid, convert in self.fields:
+            if count == 1:
+                value = values[index]
+                if value == invalid:
+                    continue
+                if convert is not None:
+                    value = convert(value)
+                    if value is None:
+                        continue
+            else:
+                raw = values[index:index + count]
+                if all(v == invalid for v in raw):
+                    continue
+                value = tuple(convert(v) if convert else v for v in raw if v != invalid)
+            message[name] = value
+
+        if self.subfields:
+            for field_name, references in self.subfields.items():
+                if field_name not in message:
+                    continue
+                for ref_name, choices in references:
+                    choice = choices.get(message.get(ref_name))
+                    if choice:
+                        sub_name, convert = choice
+                        value = message.pop(field_name)
+                        message[sub_name] = convert(value) if convert else value
+                        break
+        return message
+
+
+def _message_numbers(message_types):
+    """Translate an iterable of message names/numbers into global message numbers"""
+    if message_types is None:
+        return None
+    numbers = set()
+    for msg in message_types:
+        if isinstance(msg, str):
+            if msg in MESSAGE_NUMBERS:
+                numbers.add(MESSAGE_NUMBERS[msg])
+        else:
+            numbers.add(msg)
+    return numbers
+
+
+def read_fit_header(buf):
+    """Return (header_size, data_size) for the FIT file header at the start of buf"""
+    if len(buf) < FIT_HEADER_MIN_SIZE:
+        raise FitDecodeError("File too small to be a FIT file")
+    header_size = buf[0]
+    if header_size < FIT_HEADER_MIN_SIZE or len(buf) < header_size:
+        raise FitDecodeError(f"Invalid FIT header size: {header_size}")
+    if bytes(buf[8:12]) != FIT_SIGNATURE:
+        raise FitDecodeError("Missing .FIT signature")
+    data_size = struct.unpack_from('<I', buf, 4)[0]
+    return header_size, data_size
+
+
+def iter_fit_messages(data, message_types=None, field_names=None):
+    """Yield (message_name, fields) for each data message in a FIT buffer.
+
+    message_types limits decoding to the given message names (or global
+    numbers); records of other types are skipped without being unpacked.
+    field_names likewise limits decoding to the named profile fields
+    (subfields are resolved from, and must be requested by, their base field).
+    Chained FIT files are decoded one after another.
+    """
+    buf = memoryview(data)
+    wanted = _message_numbers(message_types)
+    unpack_u16 = struct.Struct('<H').unpack_from
+    unpack_u16_be = struct.Struct('>H').unpack_from
+
+    file_start = 0
+    total = len(buf)
+    while file_start < total:
+        if file_start and bytes(buf[file_start + 8:file_start + 12]) != FIT_SIGNATURE:
+            break  # Trailing bytes after the last file, not another chained file
+        header_size, data_size = read_fit_header(buf[file_start:])
+        pos = file_start + header_size
+        end = pos + data_size
+        if end > total:
+            raise FitDecodeError("FIT file is truncated")
+
+        definitions = {}
+        while pos < end:
+            record_header = buf[pos]
+            pos += 1
+
+            if record_header & 0x80:
+                # Compressed timestamp header: local type in bits 5-6
+                local_type = (record_header >> 5) & 0x03
+                is_definition = False
+            else:
+                local_type = record_header & 0x0F
+                is_definition = record_header & 0x40
+
+            if is_definition:
+                if pos + 5 > end:
+                    raise FitDecodeError("Truncated definition message")
+                little_endian = buf[pos + 1] == 0
+                global_num = (unpack_u16 if little_endian else unpack_u16_be)(buf, pos + 2)[0]
+                num_fields = buf[pos + 4]
+                pos += 5
+                fields_end = pos + num_fields * 3
+                if fields_end > end:
+                    raise FitDecodeError("Truncated definition message")
+                raw = buf[pos:fields_end]
+                field_defs = [(raw[i], raw[i + 1], raw[i + 2]) for i in range(0, len(raw), 3)]
+                pos = fields_end
+
+                dev_size = 0
+                if record_header & 0x20:
+                    num_dev_fields = buf[pos]
+                    pos += 1
+                    dev_end = pos + num_dev_fields * 3
+                    if dev_end > end:
+                        raise FitDecodeError("Truncated developer field definition")
+                    dev_size = sum(buf[pos + i + 1] for i in range(0, num_dev_fields * 3, 3))
+                    pos = dev_end
+
+                definitions[local_type] = _Definition(global_num, little_endian, field_defs,
+                                                      dev_size, wanted, field_names)
+                continue
+
+            definition = definitions.get(local_type)
+            if definition is None:
+                raise FitDecodeError(f"Data message for undefined local type {local_type}")
+            if pos + definition.size > end:
+                raise FitDecodeError("Truncated data message")
+            if definition.fields is not None:
+                yield definition.name, definition.decode(buf, pos)
+            pos += definition.size
+
+        # Skip the 2-byte file CRC; continue with a chained file if present
+        file_start = end + 2
+
+
+def decode_fit_messages(data, message_types=None):
+    """Decode a FIT buffer and group its messages by name.
+
+    Returns {message_name: [fields, ...]} in file order.
+    """
+    messages = {}
+    for name, fields in iter_fit_messages(data, message_types):
+        messages.setdefault(name, []).append(fields)
+    return messages
+
+
+def read_fit_messages(filepath, message_types=None):
+    """Decode a FIT file and group its messages by name.
+
+    Returns {message_name: [fields, ...]} in file order.
+    """
+    with open_fit_buffer(filepath) as data:
+        return decode_fit_messages(data, message_types)
@@ -0,0 +1,35 @@
+"""
+Zero-copy file input for FIT readers.
+
+open_fit_buffer() memory-maps a file and hands out a read-only memoryview,
+so the decoder, CRC check and content fingerprinting can all walk a file -
+even a tens-of-MB activity file dropped in by mistake - without reading it
+into a bytes copy first.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def open_fit_buffer(filepath):
+    """Yield a read-only memoryview of a file's contents, memory-mapped.
+
+    The view (and any slices of it) must not be used after the block exits.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap can't map an empty file
+            yield memoryview(b'')
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                pass  # A slice is still alive; the map closes when it's collected
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+In-place binary repair of FIT workout exercise categories.
+
+Instead of re-encoding a workout, the repair walks the file's records and
+rewrites only the exercise_category/exercise_name bytes of workout_step and
+exercise_title records whose category watches reject, and recomputes the
+file CRC as the result streams to disk (see fit_writer.py). Every other
+byte - rests, repeats, warmups, targets, developer data - is copied through
+untouched, so the repaired file keeps the original structure exactly.
+
+Run as a script to repair files from the command line:
+    python fit_repair.py FILE ...
+"""
+
+import os
+import struct
+import sys
+
+from fit_crc import verify_fit_crc
+from exercise_lookup import get_exercise_index
+from fit_decoder import FitDecodeError, read_fit_header
+from fit_io import open_fit_buffer
+from fit_writer import FitFileWriter
+
+# Valid FIT SDK exercise categories are 0-32; 65534 is 'unknown'
+VALID_CATEGORIES = frozenset(range(33)) | {65534}
+UINT16_INVALID = 0xFFFF
+
+# Category used when no better match is known (fitfiletool's default too)
+FALLBACK_CATEGORY = 5  # core
+
+# Global message number -> (exercise_category, exercise_name, wkt_step_name) field numbers
+REPAIRABLE_MESSAGES = {
+    27: (10, 11, 0),    # workout_step
+    264: (0, 1, 2),     # exercise_title
+}
+
+
+class _Layout:
+    """Where a repairable message's fields sit within its data records"""
+
+    __slots__ = ('size', 'endian', 'category', 'name', 'step_name')
+
+    def __init__(self, global_num, little_endian, field_defs, dev_size):
+        category_num, name_num, step_name_num = REPAIRABLE_MESSAGES.get(global_num, (None, None, None))
+        self.endian = '<' if little_endian else '>'
+        self.category = self.name = self.step_name = None
+        offset = 0
+        for field_num, size, _base_type in field_defs:
+            if field_num == category_num and size == 2:
+                self.category = offset
+            elif field_num == name_num and size == 2:
+                self.name = offset
+            elif field_num == step_name_num:
+                self.step_name = (offset, size)
+            offset += size
+        self.size = offset + dev_size
+
+
+def _find_category_fields(buf):
+    """Walk a FIT buffer and locate every exercise category that needs repair.
+
+    Returns (fixes, used, names, file_ends): fixes lists
+    (category_offset, name_offset_or_None, endian, category, exercise_name)
+    per bad record, used holds the valid (category, exercise_name) pairs
+    already in the file, names maps a bad pair to its step name, and
+    file_ends gives (file_start, crc_offset) for each chained file.
+    """
+    fixes = []
+    used = set()
+    names = {}
+    file_ends = []
+
+    file_start = 0
+    total = len(buf)
+    while file_start < total:
+        if file_start and bytes(buf[file_start + 8:file_start + 12]) != b'.FIT':
+            break  # Trailing bytes after the last file
+        header_size, data_size = read_fit_header(buf[file_start:])
+        pos = file_start + header_size
+        end = pos + data_size
+        if end + 2 > total:
+            raise FitDecodeError("FIT file is truncated")
+
+        layouts = {}
+        while pos < end:
+            record_header = buf[pos]
+            pos += 1
+            if record_header & 0x80:
+                local_type = (record_header >> 5) & 0x03
+                is_definition = False
+            else:
+                local_type = record_header & 0x0F
+                is_definition = record_header & 0x40
+
+            if is_definition:
+                if pos + 5 > end:
+                    raise FitDecodeError("Truncated definition message")
+                little_endian = buf[pos + 1] == 0
+                global_num = struct.unpack_from('<H' if little_endian else '>H', buf, pos + 2)[0]
+                num_fields = buf[pos + 4]
+                pos += 5
+                fields_end = pos + num_fields * 3
+                if fields_end > end:
+                    raise FitDecodeError("Truncated definition message")
+                raw = buf[pos:fields_end]
+                field_defs = [(raw[i], raw[i + 1], raw[i + 2]) for i in range(0, len(raw), 3)]
+                pos = fields_end
+
+                dev_size = 0
+                if record_header & 0x20:
+                    num_dev_fields = buf[pos]
+                    pos += 1
+                    dev_end = pos + num_dev_fields * 3
+                    if dev_end > end:
+                        raise FitDecodeError("Truncated developer field definition")
+                    dev_size = sum(buf[pos + i + 1] for i in range(0, num_dev_fields * 3, 3))
+                    pos = dev_end
+
+                layout = _Layout(global_num, little_endian, field_defs, dev_size)
+                layouts[local_type] = layout if layout.category is not None else layout.size
+                continue
+
+            layout = layouts.get(local_type)
+            if layout is None:
+                raise FitDecodeError(f"Data message for undefined local type {local_type}")
+            if isinstance(layout, int):
+                pos += layout
+                continue
+            if pos + layout.size > end:
+                raise FitDecodeError("Truncated data message")
+
+            u16 = layout.endian + 'H'
+            category = struct.unpack_from(u16, buf, pos + layout.category)[0]
+            exercise_name = None
+            if layout.name is not None:
+                exercise_name = struct.unpack_from(u16, buf, pos + layout.name)[0]
+            pair = (category, exercise_name)
+            if category in VALID_CATEGORIES or category == UINT16_INVALID:
+                used.add(pair)
+            else:
+                fixes.append((pos + layout.category,
+                              None if layout.name is None else pos + layout.name,
+                              layout.endian, category, exercise_name))
+                if layout.step_name is not None and not names.get(pair):
+                    offset, size = layout.step_name
+                    text = bytes(buf[pos + offset:pos + offset + size]).split(b'\x00', 1)[0]
+                    names[pair] = text.decode('utf-8', errors='replace')
+            pos += layout.size
+
+        file_ends.append((file_start, end))
+        file_start = end + 2
+    return fixes, used, names, file_ends
+
+
+def resolve_category(step_name):
+    """Pick a valid (category, exercise_name or None) for a step name"""
+    index = get_exercise_index() if step_name else None
+    if index is None:
+        return FALLBACK_CATEGORY, None
+    return index.category_for(step_name)
+
+
+def plan_repairs(data, resolve=resolve_category):
+    """Work out the byte patches that repair a FIT buffer's exercise categories.
+
+    Returns (patches, replacements, file_ends): patches is a sorted list of
+    (offset, bytes) to overwrite, replacements maps each old (category,
+    name) pair to its new one, and file_ends gives (file_start, crc_offset)
+    per chained file. resolve(step_name) picks the replacement (category,
+    exercise_name) for each distinct bad pair; an exercise_name of None
+    gets the next id not already used in that category, as fitfiletool's
+    builder numbers them. Raises FitDecodeError if the file can't be walked
+    or its CRC is already bad (recomputing it would hide the corruption).
+    """
+    buf = memoryview(data)
+    crc_issues = verify_fit_crc(buf)
+    if crc_issues:
+        raise FitDecodeError(crc_issues[0])
+    fixes, used, names, file_ends = _find_category_fields(buf)
+
+    patches = []
+    replacements = {}
+    for category_offset, name_offset, endian, category, exercise_name in fixes:
+        pair = (category, exercise_name)
+        new_pair = replacements.get(pair)
+        if new_pair is None:
+            new_category, new_name = resolve(names.get(pair))
+            if new_name is None:
+                new_name = 0
+                while (new_category, new_name) in used:
+                    new_name += 1
+            new_pair = (new_category, new_name)
+            used.add(new_pair)
+            replacements[pair] = new_pair
+        patches.append((category_offset, struct.pack(endian + 'H', new_pair[0])))
+        if name_offset is not None:
+            patches.append((name_offset, struct.pack(endian + 'H', new_pair[1])))
+    patches.sort()
+    return patches, replacements, file_ends
+
+
+def write_patched_fit(buf, patches, file_ends, writer):
+    """Stream a FIT buffer through writer with patches applied, re-computing each file CRC"""
+    patches = iter(patches)
+    patch = next(patches, None)
+    pos = 0
+    for _file_start, crc_offset in file_ends:
+        while patch is not None and patch[0] < crc_offset:
+            offset, data = patch
+            writer.write(buf[pos:offset])
+            writer.write(data)
+            pos = offset + len(data)
+            patch = next(patches, None)
+        writer.write(buf[pos:crc_offset])
+        writer.end_file()
+        pos = crc_offset + 2
+    # Anything after the last file is copied through as it was
+    writer.write(buf[pos:])
+
+
+def repair_fit_file_binary(filepath, new_filepath=None, resolve=resolve_category):
+    """Repair a FIT file's exercise categories in place, byte for byte.
+
+    Streams the patched file to base_repaired.ext (or new_filepath), which
+    appears atomically, and returns (new_filepath, replacements); nothing is
+    written when there's nothing to repair, and new_filepath is then None.
+    """
+    if new_filepath is None:
+        base, ext = os.path.splitext(filepath)
+        new_filepath = f"{base}_repaired{ext}"
+
+    with open_fit_buffer(filepath) as data:
+        patches, replacements, file_ends = plan_repairs(data, resolve)
+        if not patches:
+            return None, replacements
+        with FitFileWriter(new_filepath, mode=os.stat(filepath).st_mode & 0o777) as writer:
+            write_patched_fit(data, patches, file_ends, writer)
+    return new_filepath, replacements
+
+
+def main(paths):
+    if not paths:
+        print("Usage: python fit_repair.py FILE ...")
+        return 2
+    failed = 0
+    for path in paths:
+        try:
+            new_path, replacements = repair_fit_file_binary(path)
+        except (OSError, FitDecodeError, struct.error) as e:
+            failed += 1
+            print(f"✗ {path}: {e}")
+            continue
+        if new_path is None:
+            print(f"  {path}: no invalid exercise categories")
+            continue
+        print(f"✓ {path} -> {new_path}")
+        for (old_category, old_name), (new_category, new_name) in replacements.items():
+            print(f"    category {old_category}/{old_name} -> {new_category}/{new_name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
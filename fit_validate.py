@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Batch validation of FIT workouts with a machine-readable report.
+
+Validates every .fit file under the given folders across a process pool
+(the same checks as the preview's validate_fit_file, including CRCs) and
+writes one record per file: validity, issues, warnings, invalid exercise
+categories, the validator used, how long the file took and how long each
+validation rule took.
+
+Usage:
+    python fit_validate.py FOLDER_OR_FILE ... [--format json|jsonl] [--output FILE] [--workers N]
+
+Exits with status 1 if any file is invalid, so it can gate nightly runs.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fit_batch import BatchParser
+from workout_parser import validate_workout_file
+
+
+def find_fit_files(paths):
+    """Expand folders into the .fit files they contain"""
+    files = []
+    for path in paths:
+        path = Path(path).expanduser()
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix.lower() == '.fit'))
+        elif path.is_file():
+            files.append(path)
+    return [str(f) for f in files]
+
+
+def validation_record(filepath):
+    """Validate one file and return its report record (runs in a worker process)"""
+    start = time.perf_counter()
+    validation = validate_workout_file(filepath)
+    elapsed = time.perf_counter() - start
+    return {
+        'file': filepath,
+        'size': os.path.getsize(filepath),
+        'valid': validation['valid'],
+        'crc_valid': validation.get('crc_valid'),
+        'issues': validation.get('issues', []),
+        'warnings': validation.get('warnings', []),
+        'invalid_categories': sorted(validation.get('invalid_categories', [])),
+        'validator': validation.get('validator'),
+        'elapsed_ms': round(elapsed * 1000, 3),
+        'rule_ms': validation.get('rule_timings', {}),
+    }
+
+
+def validate_many(filepaths, workers=None):
+    """Yield a report record per file as each completes"""
+    batch = BatchParser(max_workers=workers)
+    try:
+        for result in batch.parse_many(filepaths, validation_record, ordered=False):
+            if result.error is not None:
+                yield {
+                    'file': result.filepath, 'valid': False, 'crc_valid': None,
+                    'issues': [f"Error validating file: {result.error}"], 'warnings': [],
+                    'invalid_categories': [], 'validator': None, 'elapsed_ms': None,
+                    'rule_ms': {},
+                }
+            else:
+                yield result.value
+    finally:
+        batch.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate FIT workouts and write a JSON report")
+    parser.add_argument('paths', nargs='+', help="FIT files or folders to validate")
+    parser.add_argument('--format', choices=('json', 'jsonl'), default='json',
+                        help="one JSON document, or one JSON object per line as files finish")
+    parser.add_argument('--output', '-o', help="report file (default: stdout)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count - 1)")
+    args = parser.parse_args()
+
+    files = find_fit_files(args.paths)
+    if not files:
+        print("No .fit files found", file=sys.stderr)
+        return 1
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    records = []
+    invalid = 0
+    start = time.perf_counter()
+    try:
+        for record in validate_many(files, args.workers):
+            invalid += not record['valid']
+            if args.format == 'jsonl':
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+            else:
+                records.append(record)
+        elapsed = time.perf_counter() - start
+
+        summary = {
+            'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'files': len(files),
+            'valid': len(files) - invalid,
+            'invalid': invalid,
+            'elapsed_s': round(elapsed, 3),
+            'files_per_s': round(len(files) / elapsed, 1) if elapsed else None,
+        }
+        if args.format == 'json':
+            records.sort(key=lambda r: r['file'])
+            json.dump({'summary': summary, 'results': records}, out, indent=2)
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{len(files)} files validated in {elapsed:.2f}s "
+          f"({summary['files_per_s']} files/s) - {invalid} invalid", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Streaming, atomic output for FIT files.
+
+FitFileWriter writes to a temporary file in the destination's folder and
+only renames it over the destination on commit, so a crash or error
+mid-write never leaves a truncated .fit behind. Bytes are written as they
+come and folded into the running file CRC on the way, so output of any
+size is produced without holding it in memory.
+"""
+
+import os
+import struct
+import tempfile
+
+from fit_crc import fit_crc16
+
+
+class FitFileWriter:
+    """Write a FIT file incrementally and move it into place atomically.
+
+    Use as a context manager: the file is committed when the block exits
+    normally and discarded if it raises.
+    """
+
+    def __init__(self, filepath, mode=None):
+        self.filepath = os.fspath(filepath)
+        self.mode = mode
+        self.crc = 0
+        self.size = 0
+        folder, name = os.path.split(os.path.abspath(self.filepath))
+        fd, self._temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=folder)
+        self._file = os.fdopen(fd, 'wb')
+
+    def write(self, data):
+        """Append bytes, updating the running file CRC"""
+        self._file.write(data)
+        self.crc = fit_crc16(data, self.crc)
+        self.size += len(data)
+
+    def end_file(self):
+        """Append the file CRC of everything written since the last end_file()"""
+        self._file.write(struct.pack('<H', self.crc))
+        self.size += 2
+        self.crc = 0
+
+    def commit(self):
+        """Flush to disk and rename over the destination"""
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            if self.mode is not None:
+                os.chmod(self._temp_path, self.mode)
+            os.replace(self._temp_path, self.filepath)
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """Discard everything written"""
+        self._file.close()
+        try:
+            os.unlink(self._temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
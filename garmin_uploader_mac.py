@@ -14,6 +14,8 @@ import re
 import threading
 import time
 import json
+import multiprocessing
+import queue
 from pathlib import Path
 from tkinter import *
 from tkinter import ttk, filedialog, messagebox
@@ -34,19 +36,10 @@ try:
 except ImportError:
     DND_AVAILABLE = False
 
-# Try to import fitparse for FIT file parsing
-try:
-    from fitparse import FitFile
-    FITPARSE_AVAILABLE = True
-except ImportError:
-    FITPARSE_AVAILABLE = False
-
 # Try to import amakaflow-fitfiletool for workout repair and FIT parsing
 try:
     from amakaflow_fitfiletool import (
-        GarminExerciseLookup, build_fit_workout, get_preview_steps, get_fit_metadata,
-        parse_fit_file as fitfiletool_parse_fit_file,
-        validate_fit_file as fitfiletool_validate_fit_file,
+        build_fit_workout, get_preview_steps, get_fit_metadata,
         get_sport_display, get_sport_color, format_duration, format_distance,
         SPORT_COLORS, SPORT_DISPLAY_NAMES, SUB_SPORT_DISPLAY_NAMES, EXERCISE_CATEGORY_NAMES
     )
@@ -58,12 +51,46 @@ except ImportError:
     EXERCISE_CATEGORY_NAMES = {}
     def get_sport_display(sport, sub_sport=None): return sport.replace('_', ' ').title() if sport else 'Workout'
     def get_sport_color(sport, sub_sport=None): return SPORT_COLORS.get(sport, '#6b7280')
-    def fitfiletool_parse_fit_file(filepath): return None
-    def fitfiletool_validate_fit_file(filepath): return {'valid': True, 'issues': [], 'warnings': []}
+
+# Workout parsing (built-in FIT decoder, falling back to fitparse) and its caches
+from workout_parser import (
+    FITPARSE_AVAILABLE, parse_workout_file, repair_workout_file, summarize_workout_file,
+    validate_workout_file
+)
+from workout_model import Workout
+from workout_summary import summarize_workout, workout_stats
+from workout_cache import ParseCache, PersistentParseCache
+from fit_batch import BatchParser
+from fit_decoder import FitDecodeError
+from fit_repair import repair_fit_file_binary
+from fit_writer import FitFileWriter
+from display_plan import display_plan, PlanRow
+from step_canvas import StepCanvas
 
 # Garmin USB Vendor ID
 GARMIN_VENDOR_ID = "0x091e"
 
+# Memory budgets for the parsed-workout and validation caches
+PARSE_CACHE_BUDGET = 64 * 1024 * 1024
+VALIDATION_CACHE_BUDGET = 4 * 1024 * 1024
+
+# Persistent parse cache, kept in the staging folder
+PARSE_CACHE_FILENAME = ".parse_cache.sqlite3"
+# Identifies the parser configuration that produced a stored workout
+PARSER_TAG = 'fitfiletool' if FITFILETOOL_AVAILABLE else ('native+fitparse' if FITPARSE_AVAILABLE else 'native')
+# File list badges by validation result (None = not checked yet)
+FILE_BADGES = {None: '📄', True: '✅', False: '⚠️'}
+
+# Multi-file preview cards: fixed height, so the list can be virtualized,
+# plus the spacing between cards and the cards kept ready off screen
+PREVIEW_CARD_HEIGHT = 76
+PREVIEW_CARD_GAP = 8
+PREVIEW_CARD_BUFFER = 3
+# How often the preview picks up workouts parsed in the background (ms)
+PREVIEW_POLL_MS = 50
+# Memory for the parsed workouts, plans and validations list cards open into
+LIST_DETAIL_CACHE_BUDGET = 16 * 1024 * 1024
+
 
 # Garmin exercise name mapping (from FIT SDK)
 EXERCISE_NAMES = {
@@ -80,16 +107,6 @@ EXERCISE_NAMES = {
     65534: "Workout", 65535: "Unknown"
 }
 
-# Duration type mapping
-DURATION_TYPES = {
-    0: "time", 1: "distance", 2: "hr_less_than", 3: "hr_greater_than",
-    4: "calories", 5: "open", 6: "repeat_until_steps_cmplt",
-    7: "repeat_until_time", 8: "repeat_until_distance", 9: "repeat_until_calories",
-    10: "repeat_until_hr_less_than", 11: "repeat_until_hr_greater_than",
-    12: "repeat_until_power_less_than", 13: "repeat_until_power_greater_than",
-    14: "power_less_than", 15: "power_greater_than", 28: "reps"
-}
-
 
 class UpdateChecker:
     """Check for app updates from GitHub releases"""
@@ -212,6 +229,23 @@ class GarminUploaderMac:
         # Track connected device for model-specific adjustments
         self.current_device = None
 
+        # Parse/validation results keyed on (path, size, mtime_ns), so moving
+        # between the list and detail previews doesn't re-decode files
+        self.parse_cache = ParseCache(max_bytes=PARSE_CACHE_BUDGET)
+        self.validation_cache = ParseCache(max_bytes=VALIDATION_CACHE_BUDGET)
+        self.preview_cache = ParseCache(max_bytes=PARSE_CACHE_BUDGET)
+        self.summary_cache = ParseCache(max_bytes=VALIDATION_CACHE_BUDGET)
+        # What a multi-file preview card opens into, prepared in the background
+        self.list_detail_cache = ParseCache(max_bytes=LIST_DETAIL_CACHE_BUDGET)
+        # Survives relaunches, so previously seen workouts aren't decoded again
+        self.workout_store = PersistentParseCache(self.staging_folder / PARSE_CACHE_FILENAME,
+                                                  parser_tag=PARSER_TAG)
+        # Worker processes for batch parsing, started on first large batch
+        self.batch_parser = BatchParser()
+        # Set on close so background batches stop posting to the UI
+        self._closing = False
+        self.repair_all_running = False
+
         # Connect IQ app installation
         self.selected_prg_file = None
         self.prg_build_folder = Path.home() / "dev" / "amakaflow-garmin-app" / "bin"
@@ -229,6 +263,9 @@ class GarminUploaderMac:
     def _on_close(self):
         """Handle window close"""
         self._monitor_running = False
+        self._closing = True
+        self.batch_parser.shutdown()
+        self.workout_store.close()
         self.root.destroy()
 
     def _check_updates(self):
@@ -900,6 +937,10 @@ class GarminUploaderMac:
         self.preview_btn = Button(btn_frame, text="👁 Preview", font=('SF Pro Text', 11),
                                   command=self.preview_selected_file, padx=10, pady=5, relief=FLAT)
         self.preview_btn.pack(side=LEFT, padx=(8, 0))
+
+        self.repair_all_btn = Button(btn_frame, text="🔧 Repair All", font=('SF Pro Text', 11),
+                                     command=self.repair_all_files, padx=10, pady=5, relief=FLAT)
+        self.repair_all_btn.pack(side=LEFT, padx=(8, 0))
         
         # File count on its own row for visibility
         count_frame = Frame(parent, bg='#fff')
@@ -993,16 +1034,50 @@ class GarminUploaderMac:
             if f not in self.selected_files:
                 if f.lower().endswith('.fit'):
                     self.selected_files.append(f)
-                    name = os.path.basename(f)
-                    self.file_listbox.insert(END, f"  📄 {name}")
+                    self._insert_file_row(END, f)
                     added_count += 1
         
         if added_count > 0:
             self.update_ui_state()
+            self._check_files_in_background(self.selected_files[-added_count:])
             # Flash success feedback
             self.file_listbox.config(highlightbackground='#34C759')
             self.root.after(300, lambda: self.file_listbox.config(highlightbackground='#e0e0e0'))
     
+    def _insert_file_row(self, index, filepath, suffix=''):
+        """Insert a file list row, badged with the file's cached validation status"""
+        validation = self.validation_cache.get(filepath)
+        valid = None if validation is None else bool(validation['valid'])
+        self.file_listbox.insert(index, f"  {FILE_BADGES[valid]} {os.path.basename(filepath)}{suffix}")
+        if valid is False:
+            self.file_listbox.itemconfig(index, fg='#dc3545')
+
+    def _update_file_badge(self, filepath):
+        """Redraw a file's list row once its validation is cached"""
+        if filepath not in self.selected_files:
+            return
+        index = self.selected_files.index(filepath)
+        suffix = ' (repaired)' if self.file_listbox.get(index).endswith(' (repaired)') else ''
+        selected = self.file_listbox.selection_includes(index)
+        self.file_listbox.delete(index)
+        self._insert_file_row(index, filepath, suffix)
+        if selected:
+            self.file_listbox.selection_set(index)
+
+    def _check_files_in_background(self, files):
+        """Validate files not yet in the validation cache, updating their badges as each finishes"""
+        pending = [f for f in files if self.validation_cache.get(f) is None]
+        if pending:
+            threading.Thread(target=self._check_files_worker, args=(pending,), daemon=True).start()
+
+    def _check_files_worker(self, files):
+        for result in self.batch_parser.parse_many(files, validate_workout_file, ordered=False):
+            if self._closing:
+                return
+            if result.error is None:
+                self.validation_cache.put(result.filepath, result.value)
+                self.root.after(0, self._update_file_badge, result.filepath)
+
     def create_prepare_section(self, parent):
         """Step 2: Prepare transfer"""
         # Instructions
@@ -1113,6 +1188,80 @@ class GarminUploaderMac:
         self.file_listbox.config(fg='#999')
         self.update_ui_state()
     
+    def repair_all_files(self):
+        """Validate every selected file and repair the failing ones in the background"""
+        if not self.selected_files or self.repair_all_running:
+            return
+        self.repair_all_running = True
+        self.repair_all_btn.config(text="🔧 Repairing...", state=DISABLED)
+        files = list(self.selected_files)
+        threading.Thread(target=self._repair_all_worker, args=(files,), daemon=True).start()
+
+    def _repair_all_worker(self, files):
+        """Run the repair pipeline over the worker pool, posting progress to the UI"""
+        repaired = {}
+        failed = []
+        start = time.perf_counter()
+        last_update = 0
+        done = 0
+        for result in self.batch_parser.parse_many(files, repair_workout_file, ordered=False):
+            if self._closing:
+                return
+            done += 1
+            if result.error is not None:
+                failed.append((result.filepath, result.error))
+            else:
+                validation, new_filepath, error = result.value
+                self.validation_cache.put(result.filepath, validation)
+                self.root.after(0, self._update_file_badge, result.filepath)
+                if new_filepath:
+                    repaired[result.filepath] = new_filepath
+                elif error or not validation['valid']:
+                    failed.append((result.filepath, error or validation['issues'][0]))
+
+            # Throttle progress updates so large batches don't flood the event loop
+            now = time.perf_counter()
+            if now - last_update >= 0.1 or done == len(files):
+                last_update = now
+                rate = done / (now - start) if now > start else 0
+                self.root.after(0, self._show_repair_progress, done, len(files), rate)
+
+        elapsed = time.perf_counter() - start
+        if not self._closing:
+            self.root.after(0, self._finish_repair_all, files, repaired, failed, elapsed)
+
+    def _show_repair_progress(self, done, total, rate):
+        self.file_count.config(text=f"Repairing... {done}/{total} files ({rate:.0f} files/s)")
+
+    def _finish_repair_all(self, files, repaired, failed, elapsed):
+        """Swap repaired files into the list and report the results"""
+        self.repair_all_running = False
+        self.repair_all_btn.config(text="🔧 Repair All", state=NORMAL)
+
+        # The list may have changed while the batch ran; swap by path, last first
+        for index in reversed(range(len(self.selected_files))):
+            new_filepath = repaired.get(self.selected_files[index])
+            if new_filepath is None:
+                continue
+            self.file_listbox.delete(index)
+            if new_filepath in self.selected_files:
+                del self.selected_files[index]
+            else:
+                self.selected_files[index] = new_filepath
+                self._insert_file_row(index, new_filepath, ' (repaired)')
+        self.update_ui_state()
+        self._check_files_in_background(list(repaired.values()))
+
+        message = (f"Checked {len(files)} file(s) in {elapsed:.1f}s.\n"
+                   f"{len(repaired)} repaired with valid exercise categories.")
+        if failed:
+            message += f"\n\nCould not repair {len(failed)} file(s):"
+            for filepath, error in failed[:5]:
+                message += f"\n{os.path.basename(filepath)}: {error}"
+            messagebox.showwarning("Repair All", message)
+        else:
+            messagebox.showinfo("Repair All", message)
+
     def update_ui_state(self):
         """Update button states based on current state"""
         count = len(self.selected_files)
@@ -1146,6 +1295,10 @@ class GarminUploaderMac:
                 dest = self.staging_folder / filename
                 shutil.copy2(filepath, dest)
                 staged.append(filename)
+                # Same bytes, so the staged copy needn't be validated again
+                validation = self.validation_cache.get(filepath)
+                if validation is not None:
+                    self.validation_cache.put(str(dest), validation)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to copy {filename}: {e}")
         
@@ -1330,16 +1483,13 @@ You still need to drag them to OpenMTP."""
     
     def show_fit_preview(self, filepath):
         """Show FIT file preview matching AmakaFlow app style"""
-        # Parse the FIT file
-        workout_data = self.parse_fit_file(filepath)
+        # Parse the FIT file and validate it for issues
+        workout_data, validation = self.parse_and_validate_fit_file(filepath)
 
         if not workout_data:
             messagebox.showerror("Error", "Could not parse FIT file. It may be corrupted or not a workout file.")
             return
 
-        # Validate the FIT file for issues
-        validation = self.validate_fit_file(filepath)
-
         # Create preview window
         preview = Toplevel(self.root)
         preview.title(f"Workout Preview - {os.path.basename(filepath)}")
@@ -1372,8 +1522,8 @@ You still need to drag them to OpenMTP."""
                 Label(warning_frame, text=issue, font=('SF Pro Text', 9),
                       bg='#dc3545', fg='#fff', wraplength=400, justify=LEFT).pack(anchor='w')
 
-            # Repair button if fitfiletool is available
-            if FITFILETOOL_AVAILABLE:
+            # Repair button when the categories can be patched or fitfiletool can rebuild
+            if FITFILETOOL_AVAILABLE or validation.get('invalid_categories'):
                 def do_repair():
                     new_file, error = self.repair_fit_file(filepath, workout_data)
                     if new_file:
@@ -1383,8 +1533,9 @@ You still need to drag them to OpenMTP."""
                         # Add repaired file to selection
                         if new_file not in self.selected_files:
                             self.selected_files.append(new_file)
-                            self.file_listbox.insert(END, f"  📄 {os.path.basename(new_file)} (repaired)")
+                            self._insert_file_row(END, new_file, ' (repaired)')
                             self.file_count.config(text=f"{len(self.selected_files)} file(s) selected")
+                            self._check_files_in_background([new_file])
                     else:
                         messagebox.showerror("Error", f"Could not repair file:\n{error}")
 
@@ -1426,34 +1577,23 @@ You still need to drag them to OpenMTP."""
             created = workout_data['created'].split(' ')[0] if ' ' in workout_data['created'] else workout_data['created']
             meta_parts.append(f"📅 {created}")
 
-        # Calculate total duration
-        total_duration = sum(ex.get('duration', 0) for ex in workout_data.get('steps', []))
-        if total_duration > 0:
-            meta_parts.append(f"⏱ {self.format_duration(total_duration)}")
+        # Totals were worked out when the workout was parsed
+        summary = summarize_workout(workout_data)
+        if summary['total_duration'] > 0:
+            meta_parts.append(f"⏱ {self.format_duration(summary['total_duration'])}")
 
         if meta_parts:
             Label(meta_frame, text="  •  ".join(meta_parts), font=('SF Pro Text', 9),
                   bg='#000', fg='#666').pack()
 
-        # Scrollable exercise list
+        # Scrollable exercise list, drawn as items on one canvas
         canvas = Canvas(watch_frame, bg='#000', highlightthickness=0, height=400)
         scrollbar = Scrollbar(watch_frame, orient=VERTICAL, command=canvas.yview)
-        exercise_frame = Frame(canvas, bg='#000')
 
         canvas.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side=RIGHT, fill=Y)
         canvas.pack(side=LEFT, fill=BOTH, expand=True)
 
-        canvas_window = canvas.create_window((0, 0), window=exercise_frame, anchor='nw')
-
-        # Bind canvas resize
-        def configure_canvas(event):
-            canvas.configure(scrollregion=canvas.bbox('all'))
-            canvas.itemconfig(canvas_window, width=event.width)
-
-        exercise_frame.bind('<Configure>', configure_canvas)
-        canvas.bind('<Configure>', lambda e: canvas.itemconfig(canvas_window, width=e.width))
-
         # Mouse wheel scrolling - scoped to this canvas
         def on_mousewheel(event):
             if canvas.winfo_exists():
@@ -1462,53 +1602,17 @@ You still need to drag them to OpenMTP."""
         canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", on_mousewheel))
         canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
 
-        # Process steps to detect repeat structures
+        # Lay out the steps with their repeat structure
         exercises = workout_data.get('steps', [])
-        processed_steps = self.process_steps_for_preview(exercises)
-
-        # Stats counters
-        exercise_count = 0
-        rest_count = 0
-        total_sets = 0
-        repeat_count = 0
-
-        # Display processed steps
-        for step_info in processed_steps:
-            step_type = step_info.get('display_type', 'exercise')
-
-            if step_type == 'repeat_header':
-                self.create_repeat_header(exercise_frame, step_info)
-                repeat_count += 1
-                total_sets += step_info.get('repeat_count', 1)
-            elif step_type == 'nested_exercise':
-                self.create_nested_exercise_row(exercise_frame, step_info)
-                exercise_count += 1
-            elif step_type == 'nested_rest':
-                self.create_nested_rest_row(exercise_frame, step_info)
-                rest_count += 1
-            elif step_info.get('is_rest') or step_info.get('step_type') == 'rest':
-                self.create_rest_row(exercise_frame, step_info)
-                rest_count += 1
-            elif step_info.get('step_type') == 'warmup':
-                self.create_warmup_row(exercise_frame, step_info)
-                exercise_count += 1
-            else:
-                self.create_exercise_row(exercise_frame, step_info, exercise_count, sport)
-                exercise_count += 1
-                total_sets += step_info.get('sets', 1)
+        plan = self.preview_plan(filepath, workout_data)
+
+        StepCanvas(canvas, self.format_duration, EXERCISE_CATEGORY_NAMES).show_plan(plan, exercises)
 
         # Footer stats
         footer = Frame(watch_frame, bg='#000')
         footer.pack(fill=X, pady=(15, 5))
 
-        # Build stats parts
-        stats_parts = [f"{len(exercises)} steps"]
-        if exercise_count > 0:
-            stats_parts.append(f"{exercise_count} exercises")
-        if total_sets > exercise_count:
-            stats_parts.append(f"{total_sets} total sets")
-
-        Label(footer, text=" • ".join(stats_parts), font=('SF Pro Text', 11),
+        Label(footer, text=" • ".join(workout_stats(summary)), font=('SF Pro Text', 11),
               bg='#000', fg='#666').pack()
 
         # Legend matching app style with icons
@@ -1530,251 +1634,11 @@ You still need to drag them to OpenMTP."""
                command=on_close, bg='#333', fg='#fff',
                padx=20, pady=8, relief=FLAT, cursor='hand2').pack(pady=(10, 0))
 
-    def process_steps_for_preview(self, steps):
-        """Process flat steps list to detect repeat structures for hierarchical display.
-
-        Handles two patterns:
-        1. Explicit repeat: exercise → rest → repeat_marker
-        2. Exercise with sets > 1 property (followed by optional rest)
-        """
-        processed = []
-        i = 0
-
-        while i < len(steps):
-            step = steps[i]
-
-            # Skip repeat markers (they're metadata, not displayable steps)
-            if step.get('is_repeat', False):
-                i += 1
-                continue
-
-            # Skip standalone rest steps that aren't part of a group
-            if step.get('is_rest') or step.get('step_type') == 'rest':
-                # Check if this rest is followed by an exercise with sets
-                # If so, it will be handled with that exercise
-                if i + 1 < len(steps):
-                    next_step = steps[i + 1]
-                    if next_step.get('sets', 1) > 1:
-                        i += 1
-                        continue
-                # Standalone rest - add it
-                step_copy = step.copy()
-                step_copy['display_type'] = 'regular'
-                processed.append(step_copy)
-                i += 1
-                continue
-
-            # Check if this step is followed by rest + repeat pattern
-            if i + 2 < len(steps):
-                next_step = steps[i + 1]
-                after_next = steps[i + 2]
-
-                is_rest = next_step.get('is_rest') or next_step.get('step_type') == 'rest'
-                is_repeat = after_next.get('is_repeat', False)
-
-                if is_rest and is_repeat:
-                    repeat_count = after_next.get('repeat_count', 0)
-
-                    processed.append({
-                        'display_type': 'repeat_header',
-                        'repeat_count': repeat_count,
-                        'text': f"{repeat_count} Sets"
-                    })
-
-                    nested_step = step.copy()
-                    nested_step['display_type'] = 'nested_exercise'
-                    processed.append(nested_step)
-
-                    nested_rest = next_step.copy()
-                    nested_rest['display_type'] = 'nested_rest'
-                    processed.append(nested_rest)
-
-                    i += 3
-                    continue
-
-            # Check if exercise has sets > 1 (alternate grouping pattern)
-            sets = step.get('sets', 1)
-            if sets > 1:
-                # Create repeat header based on sets count
-                processed.append({
-                    'display_type': 'repeat_header',
-                    'repeat_count': sets,
-                    'text': f"{sets} Sets"
-                })
-
-                # Add exercise as nested
-                nested_step = step.copy()
-                nested_step['display_type'] = 'nested_exercise'
-                processed.append(nested_step)
-
-                # Check if next step is a rest - add it as nested
-                if i + 1 < len(steps):
-                    next_step = steps[i + 1]
-                    if next_step.get('is_rest') or next_step.get('step_type') == 'rest':
-                        nested_rest = next_step.copy()
-                        nested_rest['display_type'] = 'nested_rest'
-                        processed.append(nested_rest)
-                        i += 2
-                        continue
-
-                # No explicit rest step, but sets > 1 implies rest between sets
-                # Add implied "Lap Button" rest like Garmin Connect shows
-                processed.append({
-                    'display_type': 'nested_rest',
-                    'is_rest': True,
-                    'step_type': 'rest',
-                    'name': 'Rest',
-                    'duration_type': 'open',
-                    'rest_seconds': 0
-                })
-
-                i += 1
-                continue
-
-            # Regular step (no sets, no repeat pattern)
-            step_copy = step.copy()
-            step_copy['display_type'] = 'regular'
-            processed.append(step_copy)
-            i += 1
-
-        return processed
-
-    def create_repeat_header(self, parent, step_info):
-        """Create a repeat/sets header row (green background like web app)"""
-        row = Frame(parent, bg='#166534', padx=10, pady=8)  # Dark green to match web rgba(34, 197, 94, 0.2)
-        row.pack(fill=X, pady=(8, 2), padx=2)
-
-        Label(row, text=f"↻  {step_info.get('text', 'Sets')}",
-              font=('SF Pro Text', 12, 'bold'),
-              bg='#166534', fg='#4ade80').pack(anchor='w')  # Green text like web #4ade80
-
-    def create_nested_exercise_row(self, parent, exercise):
-        """Create an exercise row nested within a repeat block"""
-        # Container with left border to show nesting (blue for regular, orange for warmup)
-        is_warmup_set = exercise.get('is_warmup_set', False)
-        border_color = '#f97316' if is_warmup_set else '#3b82f6'  # Orange for warmup, blue for regular
-        bg_color = '#1a1520' if is_warmup_set else '#111827'  # Subtle background tint
-
-        row = Frame(parent, bg=bg_color)
-        row.pack(fill=X, pady=1, padx=2)
-
-        # Left border indicator
-        border = Frame(row, bg=border_color, width=4)
-        border.pack(side=LEFT, fill=Y)
-
-        # Content
-        content = Frame(row, bg=bg_color, padx=10, pady=8)
-        content.pack(side=LEFT, fill=BOTH, expand=True)
-
-        # Exercise name with icon
-        name = exercise.get('name', 'Exercise')
-        text_color = '#fbbf24' if is_warmup_set else '#93c5fd'  # Matching web colors
-        suffix = " (Warm-Up)" if is_warmup_set else ""
-
-        Label(content, text=f"※  {name}{suffix}", font=('SF Pro Text', 11, 'bold'),
-              bg=bg_color, fg=text_color, anchor='w', wraplength=420).pack(fill=X)
-
-        # Badges row
-        badges = Frame(content, bg=bg_color)
-        badges.pack(fill=X, pady=(4, 0))
-
-        # Reps badge (green for reps)
-        if exercise.get('reps'):
-            self.create_badge(badges, f"{exercise['reps']} reps", "#22c55e")
-
-        # Duration badge (blue)
-        if exercise.get('duration'):
-            duration_str = self.format_duration(exercise['duration'])
-            self.create_badge(badges, duration_str, "#3b82f6")
-        elif exercise.get('duration_type') == 'open':
-            self.create_badge(badges, "Lap Button", "#6b7280")
-
-        # Category badge (gray)
-        category = exercise.get('category', '')
-        if category:
-            try:
-                cat_id = int(category)
-                cat_name = EXERCISE_CATEGORY_NAMES.get(cat_id, '')
-                if cat_name and cat_name.lower() not in name.lower():
-                    Label(badges, text=cat_name, font=('SF Pro Text', 9),
-                          bg='#374151', fg='#d1d5db', padx=6, pady=2).pack(side=LEFT, padx=(0, 5))
-            except (ValueError, TypeError):
-                if category.lower() not in name.lower():
-                    Label(badges, text=category.replace('_', ' ').title(), font=('SF Pro Text', 9),
-                          bg='#374151', fg='#d1d5db', padx=6, pady=2).pack(side=LEFT, padx=(0, 5))
-
-    def create_nested_rest_row(self, parent, rest_info):
-        """Create a rest row nested within a repeat block"""
-        row = Frame(parent, bg='#111')
-        row.pack(fill=X, pady=1, padx=2)
-
-        # Left border indicator (gray for rest)
-        border = Frame(row, bg='#6b7280', width=4)
-        border.pack(side=LEFT, fill=Y)
-
-        # Content
-        content = Frame(row, bg='#111', padx=10, pady=6)
-        content.pack(side=LEFT, fill=BOTH, expand=True)
-
-        # Rest label with icon
-        Label(content, text="↷  Rest", font=('SF Pro Text', 11),
-              bg='#111', fg='#9ca3af', anchor='w').pack(side=LEFT)
-
-        # Duration badge
-        duration_type = rest_info.get('duration_type', '')
-        rest_seconds = rest_info.get('rest_seconds', rest_info.get('duration', 0))
-
-        if duration_type in ('open', 'lap_button') or rest_seconds <= 0:
-            self.create_badge(content, "Lap Button", "#6b7280")
-        else:
-            self.create_badge(content, f"{int(rest_seconds)}s rest", "#6b7280")
-
-    def create_rest_row(self, parent, rest_info):
-        """Create a standalone rest row"""
-        row = Frame(parent, bg='#1f2937', padx=10, pady=8)
-        row.pack(fill=X, pady=2, padx=2)
-
-        # Rest label with icon
-        Label(row, text="↷  Rest", font=('SF Pro Text', 11, 'bold'),
-              bg='#1f2937', fg='#9ca3af', anchor='w').pack(side=LEFT)
-
-        # Duration badge
-        duration_type = rest_info.get('duration_type', '')
-        rest_seconds = rest_info.get('rest_seconds', rest_info.get('duration', 0))
-
-        if duration_type in ('open', 'lap_button') or rest_seconds <= 0:
-            self.create_badge(row, "Lap Button", "#f97316")
-        else:
-            self.create_badge(row, f"{int(rest_seconds)}s", "#f97316")
-
-    def create_warmup_row(self, parent, warmup_info):
-        """Create a warmup row with timer icon"""
-        row = Frame(parent, bg='#1c1917', highlightbackground='#eab308',
-                   highlightthickness=1, padx=10, pady=8)
-        row.pack(fill=X, pady=2, padx=2)
+    def preview_plan(self, filepath, workout_data):
+        """Return the display plan for a parsed workout (cached until the file changes)"""
+        return self.preview_cache.get_or_parse(
+            filepath, lambda _path: display_plan(workout_data.get('steps', [])))
 
-        # Content
-        content = Frame(row, bg='#1c1917')
-        content.pack(fill=X)
-
-        # Warmup label with timer icon (yellow/gold)
-        name = warmup_info.get('name', 'Warmup')
-        Label(content, text=f"⊙  {name}", font=('SF Pro Text', 11, 'bold'),
-              bg='#1c1917', fg='#eab308', anchor='w', wraplength=420).pack(fill=X)
-
-        # Duration badge
-        badges = Frame(content, bg='#1c1917')
-        badges.pack(fill=X, pady=(4, 0))
-
-        duration = warmup_info.get('duration', 0)
-        duration_type = warmup_info.get('duration_type', '')
-
-        if duration > 0:
-            duration_str = self.format_duration(duration)
-            self.create_badge(badges, duration_str, "#3b82f6")
-        elif duration_type in ('open', 5):  # 5 is FIT SDK OPEN
-            self.create_badge(badges, "Press Lap", "#6b7280")
-    
     def show_fit_preview_multi(self, filepaths):
         """Show multiple FIT files in a list summary view with single window navigation"""
         # Create or reuse preview window
@@ -1788,12 +1652,22 @@ You still need to drag them to OpenMTP."""
         self._preview_window = preview
         self._preview_filepaths = filepaths
         
-        # Content frame that can be cleared/rebuilt
+        # Content frame holding the list and detail views
         self._preview_content = Frame(preview, bg='#1a1a1a')
         self._preview_content.pack(fill=BOTH, expand=True)
+
+        # The list view is built once and only hidden while a workout is
+        # shown; the detail view is built on first use and re-filled after
+        self._list_view = Frame(self._preview_content, bg='#1a1a1a')
+        self._list_scroll_top = 0.0
+        self._detail_view = None
         
         # Unbind mousewheel on close
         def on_close():
+            # Stop any background loading of the list
+            self._list_load_token = None
+            self._list_detail_token = None
+            self._list_open_pending = None
             try:
                 preview.unbind_all("<MouseWheel>")
             except:
@@ -1803,16 +1677,13 @@ You still need to drag them to OpenMTP."""
         
         # Build the list view
         self._build_list_view()
+        self._list_view.pack(fill=BOTH, expand=True)
     
     def _build_list_view(self):
         """Build the workout list view"""
-        # Clear content
-        for widget in self._preview_content.winfo_children():
-            widget.destroy()
-        
         filepaths = self._preview_filepaths
         preview = self._preview_window
-        content = self._preview_content
+        content = self._list_view
         
         preview.title(f"Workout Preview - {len(filepaths)} files")
         
@@ -1820,26 +1691,25 @@ You still need to drag them to OpenMTP."""
         header = Frame(content, bg='#1a1a1a')
         header.pack(fill=X, padx=15, pady=(15, 10))
         Label(header, text=f"📋 {len(filepaths)} Workouts", font=('SF Pro Display', 18, 'bold'),
-              bg='#1a1a1a', fg='#fff').pack(anchor='w')
-        
-        # Scrollable list
-        canvas = Canvas(content, bg='#1a1a1a', highlightthickness=0)
+              bg='#1a1a1a', fg='#fff').pack(side=LEFT)
+        self._list_progress = Label(header, text="", font=('SF Pro Text', 10),
+                                    bg='#1a1a1a', fg='#888')
+        self._list_progress.pack(side=RIGHT)
+        
+        # Scrollable list, virtualized: only the cards in view (plus a few
+        # either side) exist, and they are re-filled as the list scrolls
+        canvas = Canvas(content, bg='#1a1a1a', highlightthickness=0, yscrollincrement=20)
         scrollbar = Scrollbar(content, orient=VERTICAL, command=canvas.yview)
-        list_frame = Frame(canvas, bg='#1a1a1a')
-        
-        canvas.configure(yscrollcommand=scrollbar.set)
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            self._layout_preview_cards()
+
+        canvas.configure(yscrollcommand=on_scroll)
         scrollbar.pack(side=RIGHT, fill=Y)
         canvas.pack(side=LEFT, fill=BOTH, expand=True, padx=(15, 0))
-        
-        canvas_window = canvas.create_window((0, 0), window=list_frame, anchor='nw')
-        
-        def configure_canvas(event):
-            canvas.configure(scrollregion=canvas.bbox('all'))
-            canvas.itemconfig(canvas_window, width=event.width)
-        
-        list_frame.bind('<Configure>', configure_canvas)
-        canvas.bind('<Configure>', lambda e: canvas.itemconfig(canvas_window, width=e.width))
-        
+        canvas.bind('<Configure>', lambda e: self._layout_preview_cards())
+
         # Mouse wheel scrolling - scoped to this canvas
         def on_mousewheel(event):
             if canvas.winfo_exists():
@@ -1848,64 +1718,28 @@ You still need to drag them to OpenMTP."""
         canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", on_mousewheel))
         canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
 
-        # Parse and display each file as a summary row
-        for filepath in filepaths:
-            workout_data = self.parse_fit_file(filepath)
-            if not workout_data:
-                continue
-
-            # Card for each workout
-            card = Frame(list_frame, bg='#222', highlightbackground='#333', highlightthickness=1)
-            card.pack(fill=X, pady=4, padx=(0, 15))
+        self._list_canvas = canvas
+        self._card_pool = []
+        self._list_scroll_height = None
+
+        # Parse summaries in the background (across the worker pool); cards
+        # appear as workouts come in, and files that aren't workouts get no
+        # card. Workouts are only parsed in full for the cards in view, by a
+        # second thread, so opening one needs no parsing on the UI thread
+        self._list_entries = []
+        self._list_loaded = 0
+        self._list_in_view = set()
+        self._list_open_pending = None
+        self._list_load_token = token = object()
+        self._list_detail_token = detail_token = object()
+        self._list_queue = results = queue.Queue()
+        self._list_detail_requests = requests = queue.Queue()
+        threading.Thread(target=self._load_list_entries, args=(filepaths, results, token),
+                         daemon=True).start()
+        threading.Thread(target=self._load_list_details, args=(requests, detail_token),
+                         daemon=True).start()
+        self._drain_list_queue(token)
 
-            card_content = Frame(card, bg='#222', padx=12, pady=10)
-            card_content.pack(fill=X)
-
-            # Top row: name + sport badge
-            top_row = Frame(card_content, bg='#222')
-            top_row.pack(fill=X)
-
-            name = workout_data.get('name', os.path.basename(filepath))
-            Label(top_row, text=name, font=('SF Pro Text', 13, 'bold'),
-                  bg='#222', fg='#fff').pack(side=LEFT)
-
-            sport = workout_data.get('sport')
-            sub_sport = workout_data.get('sub_sport')
-            if sport:
-                sport_display = get_sport_display(sport, sub_sport)
-                sport_color = get_sport_color(sport, sub_sport)
-                Label(top_row, text=f" {sport_display} ", font=('SF Pro Text', 9, 'bold'),
-                      bg=sport_color, fg='#fff').pack(side=RIGHT)
-            
-            # Stats row
-            stats_row = Frame(card_content, bg='#222')
-            stats_row.pack(fill=X, pady=(6, 0))
-            
-            stats = []
-            exercises = workout_data.get('steps', [])
-            stats.append(f"{len(exercises)} steps")
-            
-            total_duration = sum(ex.get('duration', 0) for ex in exercises)
-            if total_duration > 0:
-                stats.append(f"⏱ {self.format_duration(total_duration)}")
-            
-            total_sets = sum(ex.get('sets', 1) for ex in exercises)
-            if total_sets > len(exercises):
-                stats.append(f"{total_sets} sets")
-            
-            if workout_data.get('created'):
-                created = workout_data['created'].split(' ')[0]
-                stats.append(f"📅 {created}")
-            
-            Label(stats_row, text="  •  ".join(stats), font=('SF Pro Text', 10),
-                  bg='#222', fg='#888').pack(side=LEFT)
-            
-            # Preview button - navigate within same window
-            btn = Label(stats_row, text="👁", font=('SF Pro Text', 14), 
-                       bg='#222', fg='#007AFF', cursor='hand2')
-            btn.pack(side=RIGHT)
-            btn.bind('<Button-1>', lambda e, fp=filepath: self._show_detail_view(fp))
-        
         # Bottom bar
         bottom = Frame(content, bg='#1a1a1a')
         bottom.pack(fill=X, padx=15, pady=15)
@@ -1914,93 +1748,326 @@ You still need to drag them to OpenMTP."""
                command=self._preview_window.destroy, bg='#333', fg='#fff',
                padx=20, pady=8, relief=FLAT, cursor='hand2').pack(side=RIGHT)
     
-    def _show_detail_view(self, filepath):
-        """Show detailed workout view with back button"""
-        workout_data = self.parse_fit_file(filepath)
+    def _load_list_entries(self, filepaths, results, token):
+        """Parse list summaries in file order, queueing each as it's ready (runs in a thread)"""
+        batch = self.parse_many(filepaths, summary_only=True)
+        try:
+            for entry in batch:
+                if token is not self._list_load_token or self._closing:
+                    return  # Cancelled: the window closed or the list was rebuilt
+                results.put(entry)
+        finally:
+            batch.close()
+            results.put(None)
+
+    def _load_list_details(self, requests, token):
+        """Parse and validate the workouts of the cards in view as they come
+        into view, for the detail view to open (runs in a thread)"""
+        while token is self._list_detail_token and not self._closing:
+            try:
+                filepath = requests.get(timeout=PREVIEW_POLL_MS / 1000)
+            except queue.Empty:
+                continue
+            # Skip cards scrolled past before their turn came
+            if filepath in self._list_in_view or filepath == self._list_open_pending:
+                self.list_detail_cache.get_or_parse(filepath, self._list_detail)
+
+    def _list_detail(self, filepath):
+        """The parsed workout, display plan and validation a list card opens into"""
+        workout_data, validation = self.parse_and_validate_fit_file(filepath)
         if not workout_data:
+            return None
+        return {
+            'workout': workout_data,
+            'preview_plan': self.preview_plan(filepath, workout_data),
+            'validation': validation,
+        }
+
+    def _drain_list_queue(self, token):
+        """Add the summaries parsed so far to the list, then check again shortly"""
+        if token is not self._list_load_token:
             return
-        
-        # Clear content
-        for widget in self._preview_content.winfo_children():
-            widget.destroy()
-        
-        preview = self._preview_window
-        content = self._preview_content
-        
-        preview.title(f"Workout Preview - {workout_data.get('name', 'Workout')}")
-        
+        if not self._preview_window.winfo_exists():
+            self._list_load_token = None
+            return
+
+        finished = False
+        added = False
+        while True:
+            try:
+                entry = self._list_queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                finished = True
+                break
+            self._list_loaded += 1
+            filepath, summary = entry
+            if summary:
+                self._list_entries.append(entry)
+                added = True
+
+        if added:
+            self._layout_preview_cards()
+        if self._list_progress.winfo_exists():
+            progress = f"Loading {self._list_loaded}/{len(self._preview_filepaths)}..."
+            self._list_progress.config(text="" if finished else progress)
+        if finished:
+            self._list_load_token = None
+        else:
+            self.root.after(PREVIEW_POLL_MS, self._drain_list_queue, token)
+
+    def _layout_preview_cards(self):
+        """Bind pooled cards to the list entries in view, creating cards only as the view grows"""
+        canvas = self._list_canvas
+        if not canvas.winfo_exists():
+            return
+        entries = self._list_entries
+        slot = PREVIEW_CARD_HEIGHT + PREVIEW_CARD_GAP
+        width = canvas.winfo_width()
+
+        scroll_height = len(entries) * slot
+        if scroll_height != self._list_scroll_height:
+            # Only when it changes - resetting it makes Tk call on_scroll again
+            self._list_scroll_height = scroll_height
+            canvas.configure(scrollregion=(0, 0, width, scroll_height))
+
+        pool = self._card_pool
+        pool_size = min(len(entries), canvas.winfo_height() // slot + 1 + 2 * PREVIEW_CARD_BUFFER)
+        while len(pool) < pool_size:
+            pool.append(self._create_preview_card(canvas))
+
+        first = max(0, int(canvas.canvasy(0)) // slot - PREVIEW_CARD_BUFFER)
+        visible = range(first, min(len(entries), first + len(pool)))
+        self._list_in_view = {entries[index][0] for index in visible}
+        for card in pool:
+            if card['index'] is not None and card['index'] not in visible:
+                canvas.itemconfig(card['window'], state='hidden')
+                card['index'] = None
+        for index in visible:
+            # Each entry always lands on the same pooled card, so scrolling a
+            # little only re-fills the cards that went out of view
+            card = pool[index % len(pool)]
+            if card['index'] != index:
+                self._fill_preview_card(card, *entries[index])
+                card['index'] = index
+                self._list_detail_requests.put(entries[index][0])
+                canvas.coords(card['window'], 0, index * slot)
+            canvas.itemconfig(card['window'], state='normal', width=max(1, width - 15))
+
+    def _create_preview_card(self, canvas):
+        """Create one reusable workout card on the list canvas"""
+        card = Frame(canvas, bg='#222', highlightbackground='#333', highlightthickness=1)
+        card_content = Frame(card, bg='#222', padx=12, pady=10)
+        card_content.pack(fill=X)
+
+        # Top row: name + sport badge
+        top_row = Frame(card_content, bg='#222')
+        top_row.pack(fill=X)
+        name_label = Label(top_row, font=('SF Pro Text', 13, 'bold'), bg='#222', fg='#fff')
+        name_label.pack(side=LEFT)
+        sport_label = Label(top_row, font=('SF Pro Text', 9, 'bold'), fg='#fff')
+
+        # Stats row
+        stats_row = Frame(card_content, bg='#222')
+        stats_row.pack(fill=X, pady=(6, 0))
+        stats_label = Label(stats_row, font=('SF Pro Text', 10), bg='#222', fg='#888')
+        stats_label.pack(side=LEFT)
+
+        pooled = {'index': None, 'filepath': None, 'name': name_label,
+                  'sport': sport_label, 'stats': stats_label}
+
+        # Preview button - navigate within same window
+        btn = Label(stats_row, text="👁", font=('SF Pro Text', 14),
+                    bg='#222', fg='#007AFF', cursor='hand2')
+        btn.pack(side=RIGHT)
+        btn.bind('<Button-1>', lambda e: self._open_list_entry(pooled['filepath']))
+
+        pooled['window'] = canvas.create_window(0, 0, window=card, anchor='nw',
+                                                height=PREVIEW_CARD_HEIGHT, state='hidden')
+        return pooled
+
+    def _fill_preview_card(self, card, filepath, summary):
+        """Show one workout's summary on a pooled card"""
+        card['filepath'] = filepath
+        card['name'].config(text=summary['name'] or os.path.basename(filepath))
+
+        sport = summary['sport']
+        sub_sport = summary['sub_sport']
+        if sport:
+            card['sport'].config(text=f" {get_sport_display(sport, sub_sport)} ",
+                                 bg=get_sport_color(sport, sub_sport))
+            card['sport'].pack(side=RIGHT)
+        else:
+            card['sport'].pack_forget()
+
+        stats = []
+        step_count = summary['step_count']
+        stats.append(f"{step_count} steps")
+
+        total_duration = summary['total_duration']
+        if total_duration > 0:
+            stats.append(f"⏱ {self.format_duration(total_duration)}")
+
+        total_sets = summary['total_sets']
+        if total_sets > summary['exercise_count']:
+            stats.append(f"{total_sets} sets")
+
+        if summary['created']:
+            created = summary['created'].split(' ')[0]
+            stats.append(f"📅 {created}")
+
+        card['stats'].config(text="  •  ".join(stats))
+
+    def _show_list_view(self):
+        """Go back from the detail view to the list, scrolled where it was left"""
+        self._preview_window.unbind_all("<MouseWheel>")
+        self._detail_view['frame'].pack_forget()
+        self._list_view.pack(fill=BOTH, expand=True)
+        self._preview_window.title(f"Workout Preview - {len(self._preview_filepaths)} files")
+        self._list_canvas.yview_moveto(self._list_scroll_top)
+
+    def _open_list_entry(self, filepath):
+        """Open a list card's workout in the detail view. Cards in view have it
+        prepared already; otherwise it's prepared in the background and opened
+        when ready."""
+        self._list_open_pending = filepath
+        if not self._finish_list_open(filepath):
+            self._list_detail_requests.put(filepath)
+            self.root.after(PREVIEW_POLL_MS, self._poll_list_open, filepath)
+
+    def _poll_list_open(self, filepath):
+        """Open a card clicked before its workout was ready, once it is"""
+        if filepath != self._list_open_pending or not self._preview_window.winfo_exists():
+            return
+        if not self._finish_list_open(filepath):
+            self.root.after(PREVIEW_POLL_MS, self._poll_list_open, filepath)
+
+    def _finish_list_open(self, filepath):
+        """Show the pending card's workout if it's been prepared; returns whether it had"""
+        missing = object()
+        detail = self.list_detail_cache.get(filepath, missing)
+        if detail is missing:
+            return False
+        self._list_open_pending = None
+        if detail is not None:  # None: the file turned out not to be a workout
+            self._show_detail_view(filepath, detail)
+        return True
+
+    def _show_detail_view(self, filepath, detail):
+        """Show detailed workout view with back button.
+        detail holds the parsed 'workout', its 'preview_plan' and its 'validation'."""
+        workout_data = detail['workout']
+        validation = detail['validation']
+
+        if self._detail_view is None:
+            self._detail_view = self._build_detail_view()
+        view = self._detail_view
+
+        # Hide (not destroy) the list, remembering how far it was scrolled
+        self._list_scroll_top = self._list_canvas.yview()[0]
+        self._preview_window.unbind_all("<MouseWheel>")
+        self._list_view.pack_forget()
+        view['frame'].pack(fill=BOTH, expand=True)
+
+        title = workout_data.get('name', 'Workout')
+        self._preview_window.title(f"Workout Preview - {title}")
+        view['title'].config(text=title)
+
+        # Warning banner if validation failed
+        if validation['valid']:
+            view['warning'].pack_forget()
+        else:
+            issues = "\n".join(validation['issues'][:2])  # Show first 2 issues
+            view['warning_issues'].config(text=issues)
+            view['warning'].pack(fill=X, pady=(0, 10), before=view['watch'])
+
+        # Sport type badge
+        sport = workout_data.get('sport')
+        sub_sport = workout_data.get('sub_sport')
+        if sport:
+            view['sport'].config(text=f"  {get_sport_display(sport, sub_sport)}  ",
+                                 bg=get_sport_color(sport, sub_sport))
+            view['sport'].pack(pady=(0, 5), after=view['title'])
+        else:
+            view['sport'].pack_forget()
+
+        # Metadata row
+        meta_parts = []
+        if workout_data.get('source'):
+            meta_parts.append(f"📱 {workout_data['source']}")
+        if workout_data.get('created'):
+            created = workout_data['created'].split(' ')[0] if ' ' in workout_data['created'] else workout_data['created']
+            meta_parts.append(f"📅 {created}")
+
+        summary = summarize_workout(workout_data)
+        if summary['total_duration'] > 0:
+            meta_parts.append(f"⏱ {self.format_duration(summary['total_duration'])}")
+        view['meta'].config(text="  •  ".join(meta_parts))
+
+        # Display exercises
+        view['steps'].show_plan(detail['preview_plan'], workout_data.get('steps', []))
+        view['canvas'].yview_moveto(0)
+
+        # Footer stats
+        view['footer'].config(text=" • ".join(workout_stats(summary, with_rests=True)))
+
+    def _build_detail_view(self):
+        """Build the (reusable) workout detail view; _show_detail_view fills it in"""
+        frame = Frame(self._preview_content, bg='#1a1a1a')
+
         # Back button header
-        header = Frame(content, bg='#1a1a1a')
+        header = Frame(frame, bg='#1a1a1a')
         header.pack(fill=X, padx=15, pady=(10, 5))
         
         back_btn = Label(header, text="← Back", font=('SF Pro Text', 12),
                         bg='#1a1a1a', fg='#007AFF', cursor='hand2')
         back_btn.pack(side=LEFT)
-        back_btn.bind('<Button-1>', lambda e: self._build_list_view())
+        back_btn.bind('<Button-1>', lambda e: self._show_list_view())
         
         # Main container
-        main = Frame(content, bg='#1a1a1a', padx=20, pady=10)
+        main = Frame(frame, bg='#1a1a1a', padx=20, pady=10)
         main.pack(fill=BOTH, expand=True)
         
+        # Warning banner, shown when validation failed
+        warning_frame = Frame(main, bg='#dc3545', padx=10, pady=8)
+        Label(warning_frame, text="⚠️ Compatibility Issue Detected",
+              font=('SF Pro Text', 11, 'bold'), bg='#dc3545', fg='#fff').pack(anchor='w')
+        warning_issues = Label(warning_frame, font=('SF Pro Text', 9),
+                               bg='#dc3545', fg='#fff', wraplength=400, justify=LEFT)
+        warning_issues.pack(anchor='w')
+
         # Watch face simulation
         watch_frame = Frame(main, bg='#000', highlightbackground='#333', 
                            highlightthickness=2, padx=15, pady=15)
         watch_frame.pack(fill=BOTH, expand=True, pady=(0, 15))
         
-        # Workout title
-        title = workout_data.get('name', 'Workout')
-        Label(watch_frame, text=title, font=('SF Pro Display', 16, 'bold'),
-              bg='#000', fg='#fff').pack(pady=(5, 5))
-        
-        # Sport type badge
-        sport = workout_data.get('sport')
-        sub_sport = workout_data.get('sub_sport')
-        if sport:
-            sport_display = get_sport_display(sport, sub_sport)
-            sport_color = get_sport_color(sport, sub_sport)
-
-            sport_badge = Label(watch_frame, text=f"  {sport_display}  ",
-                               font=('SF Pro Text', 10, 'bold'),
-                               bg=sport_color, fg='#fff')
-            sport_badge.pack(pady=(0, 5))
+        # Workout title and sport type badge
+        title_label = Label(watch_frame, font=('SF Pro Display', 16, 'bold'),
+                            bg='#000', fg='#fff')
+        title_label.pack(pady=(5, 5))
+        sport_badge = Label(watch_frame, font=('SF Pro Text', 10, 'bold'), fg='#fff')
 
         # Metadata row
         meta_frame = Frame(watch_frame, bg='#000')
         meta_frame.pack(fill=X, pady=(0, 10))
-        
-        meta_parts = []
-        if workout_data.get('source'):
-            meta_parts.append(f"📱 {workout_data['source']}")
-        if workout_data.get('created'):
-            created = workout_data['created'].split(' ')[0] if ' ' in workout_data['created'] else workout_data['created']
-            meta_parts.append(f"📅 {created}")
-        
-        total_duration = sum(ex.get('duration', 0) for ex in workout_data.get('steps', []))
-        if total_duration > 0:
-            meta_parts.append(f"⏱ {self.format_duration(total_duration)}")
-        
-        if meta_parts:
-            Label(meta_frame, text="  •  ".join(meta_parts), font=('SF Pro Text', 9),
-                  bg='#000', fg='#666').pack()
-        
-        # Scrollable exercise list
+        meta_label = Label(meta_frame, font=('SF Pro Text', 9), bg='#000', fg='#666')
+        meta_label.pack()
+
+        # Footer stats (packed before the list so the list takes the rest)
+        footer = Frame(watch_frame, bg='#000')
+        footer.pack(side=BOTTOM, fill=X, pady=(15, 5))
+        footer_label = Label(footer, font=('SF Pro Text', 11), bg='#000', fg='#666')
+        footer_label.pack()
+
+        # Scrollable exercise list, drawn as items on one canvas
         canvas = Canvas(watch_frame, bg='#000', highlightthickness=0, height=300)
         scrollbar = Scrollbar(watch_frame, orient=VERTICAL, command=canvas.yview)
-        exercise_frame = Frame(canvas, bg='#000')
         
         canvas.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side=RIGHT, fill=Y)
         canvas.pack(side=LEFT, fill=BOTH, expand=True)
         
-        canvas_window = canvas.create_window((0, 0), window=exercise_frame, anchor='nw')
-        
-        def configure_canvas(event):
-            canvas.configure(scrollregion=canvas.bbox('all'))
-            canvas.itemconfig(canvas_window, width=event.width)
-        
-        exercise_frame.bind('<Configure>', configure_canvas)
-        canvas.bind('<Configure>', lambda e: canvas.itemconfig(canvas_window, width=e.width))
-        
         # Mouse wheel scrolling
         def on_mousewheel(event):
             if canvas.winfo_exists():
@@ -2008,84 +2075,13 @@ You still need to drag them to OpenMTP."""
         canvas.bind("<MouseWheel>", on_mousewheel)
         canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", on_mousewheel))
         canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
-        
-        # Display exercises
-        exercises = workout_data.get('steps', [])
-        total_sets = 0
-        rest_count = 0
-
-        for i, exercise in enumerate(exercises):
-            self.create_exercise_row(exercise_frame, exercise, i, sport)
-            total_sets += exercise.get('sets', 1)
-            if exercise.get('is_rest') or exercise.get('step_type') == 'rest':
-                rest_count += 1
-
-        # Footer stats
-        footer = Frame(watch_frame, bg='#000')
-        footer.pack(fill=X, pady=(15, 5))
 
-        # Build stats parts
-        stats_parts = [f"{len(exercises)} steps"]
-        if total_sets > len(exercises):
-            stats_parts.append(f"{total_sets} total sets")
-        if rest_count > 0:
-            stats_parts.append(f"{rest_count} rest")
-
-        Label(footer, text=" • ".join(stats_parts), font=('SF Pro Text', 11),
-              bg='#000', fg='#666').pack()
-
-    def create_exercise_row(self, parent, exercise, index, sport=None):
-        """Create a standalone exercise row (not nested in repeat)"""
-        bg_color = '#111'
-        name = exercise.get('name', f'Exercise {index + 1}')
-        duration_type = exercise.get('duration_type', '')
-
-        row = Frame(parent, bg=bg_color, padx=10, pady=8)
-        row.pack(fill=X, pady=2, padx=2)
-
-        # Exercise name with icon
-        Label(row, text=f"※  {name}", font=('SF Pro Text', 11, 'bold'),
-              bg=bg_color, fg='#fff', anchor='w', wraplength=420).pack(fill=X)
-
-        # Badges row
-        badges = Frame(row, bg=bg_color)
-        badges.pack(fill=X, pady=(4, 0))
-
-        # Reps badge (green)
-        if exercise.get('reps'):
-            self.create_badge(badges, f"{exercise['reps']} reps", "#22c55e")
-
-        # Duration badge (blue)
-        if exercise.get('duration'):
-            duration_str = self.format_duration(exercise['duration'])
-            self.create_badge(badges, duration_str, "#3b82f6")
-        elif duration_type == 'open':
-            self.create_badge(badges, "Lap Button", "#6b7280")
-
-        # Sets badge (green, only if > 1)
-        sets = exercise.get('sets', 1)
-        if sets > 1:
-            self.create_badge(badges, f"{sets} sets", "#22c55e")
-
-        # Category badge (gray)
-        category = exercise.get('category', '')
-        if category:
-            try:
-                cat_id = int(category)
-                cat_name = EXERCISE_CATEGORY_NAMES.get(cat_id, '')
-                if cat_name and cat_name.lower() not in name.lower():
-                    Label(badges, text=cat_name, font=('SF Pro Text', 9),
-                          bg='#374151', fg='#d1d5db', padx=6, pady=2).pack(side=LEFT, padx=(0, 5))
-            except (ValueError, TypeError):
-                if category.lower() not in name.lower():
-                    Label(badges, text=category.replace('_', ' ').title(), font=('SF Pro Text', 9),
-                          bg='#374151', fg='#d1d5db', padx=6, pady=2).pack(side=LEFT, padx=(0, 5))
-
-    def create_badge(self, parent, text, color):
-        """Create a colored badge"""
-        badge = Label(parent, text=text, font=('SF Pro Text', 10, 'bold'),
-                     bg=color, fg='#fff', padx=8, pady=2)
-        badge.pack(side=LEFT, padx=(0, 5))
+        return {
+            'frame': frame, 'warning': warning_frame, 'warning_issues': warning_issues,
+            'watch': watch_frame, 'title': title_label, 'sport': sport_badge, 'meta': meta_label,
+            'canvas': canvas, 'steps': StepCanvas(canvas, self.format_duration, EXERCISE_CATEGORY_NAMES),
+            'footer': footer_label,
+        }
 
     def create_legend_item(self, parent, icon, text, color):
         """Create a legend item with icon matching app style"""
@@ -2126,57 +2122,28 @@ You still need to drag them to OpenMTP."""
 
     def validate_fit_file(self, filepath):
         """Validate FIT file for issues that may prevent it from working on Garmin watches.
-        Returns dict with 'valid' boolean and 'issues' list."""
-        # Try fitfiletool's validator first
-        if FITFILETOOL_AVAILABLE:
-            result = fitfiletool_validate_fit_file(filepath)
-            # Add empty invalid_categories for compatibility
-            if 'invalid_categories' not in result:
-                result['invalid_categories'] = []
-            return result
-
-        # Fall back to local validation
-        if not FITPARSE_AVAILABLE:
-            return {'valid': True, 'issues': [], 'warnings': [], 'invalid_categories': []}
-
-        try:
-            fitfile = FitFile(filepath)
-            issues = []
-            invalid_categories = []
-
-            # Valid FIT SDK exercise categories are 0-32
-            VALID_CATEGORIES = set(range(33))
-
-            for record in fitfile.get_messages('workout_step'):
-                for field in record.fields:
-                    if field.name == 'exercise_category' and field.value is not None:
-                        # Check if it's a raw number (invalid) vs named category
-                        if isinstance(field.value, int) and field.value not in VALID_CATEGORIES:
-                            invalid_categories.append(field.value)
-
-            if invalid_categories:
-                unique_invalid = list(set(invalid_categories))
-                issues.append(f"Invalid exercise categories found: {unique_invalid}")
-                issues.append("These may cause the workout to not appear on your Garmin watch.")
-
-            return {
-                'valid': len(issues) == 0,
-                'issues': issues,
-                'warnings': [],
-                'invalid_categories': list(set(invalid_categories))
-            }
-        except Exception as e:
-            return {'valid': False, 'issues': [f"Error validating file: {str(e)}"], 'warnings': [], 'invalid_categories': []}
+        Returns dict with 'valid' boolean and 'issues' list (cached until the file changes)."""
+        return self.validation_cache.get_or_parse(filepath, validate_workout_file)
 
     def repair_fit_file(self, filepath, workout_data):
-        """Repair a FIT file by regenerating it with valid exercise categories.
-        Uses amakaflow-fitfiletool for proper FIT generation."""
+        """Repair a FIT file's invalid exercise categories.
+        Patches just the category bytes and the CRC, keeping rests, repeats and
+        warmups; files that can't be patched are regenerated with fitfiletool."""
+        try:
+            new_filepath, _replacements = repair_fit_file_binary(filepath)
+            if new_filepath:
+                return new_filepath, None
+            error = "No invalid exercise categories found"
+        except (OSError, FitDecodeError, struct.error) as e:
+            error = f"Error repairing file: {str(e)}"
         if not FITFILETOOL_AVAILABLE:
-            return None, "amakaflow-fitfiletool not available"
+            return None, error
+        return self._rebuild_fit_file(filepath, workout_data)
 
-        try:
-            lookup = GarminExerciseLookup()
+    def _rebuild_fit_file(self, filepath, workout_data):
+        """Regenerate a FIT file from its parsed steps with amakaflow-fitfiletool"""
 
+        try:
             # Convert parsed workout data to fitfiletool format
             exercises = []
             for step in workout_data.get('steps', []):
@@ -2215,327 +2182,132 @@ You still need to drag them to OpenMTP."""
             base, ext = os.path.splitext(filepath)
             new_filepath = f"{base}_repaired{ext}"
 
-            with open(new_filepath, 'wb') as f:
-                f.write(fit_bytes)
+            with FitFileWriter(new_filepath) as writer:
+                writer.write(fit_bytes)
 
             return new_filepath, None
         except Exception as e:
             return None, f"Error repairing file: {str(e)}"
 
-    def parse_fit_file(self, filepath):
-        """Parse a FIT file and extract workout data"""
-        # Try fitfiletool's parser first (uses fitparse internally)
-        if FITFILETOOL_AVAILABLE:
-            result = fitfiletool_parse_fit_file(filepath)
-            if result:
-                return result
-        # Fall back to local fitparse implementation
-        if FITPARSE_AVAILABLE:
-            return self.parse_fit_with_fitparse(filepath)
-        # Last resort: basic binary parsing
-        return self.parse_fit_basic(filepath)
-    
-    def parse_fit_with_fitparse(self, filepath):
-        """Parse FIT file using fitparse library"""
-        try:
-            fitfile = FitFile(filepath)
-            
-            workout_data = {
-                'name': 'Workout',
-                'sport': None,
-                'steps': [],
-                'created': None,
-                'source': None
-            }
-            
-            # Get file metadata
-            for record in fitfile.get_messages('file_id'):
-                for field in record.fields:
-                    if field.name == 'time_created' and field.value:
-                        workout_data['created'] = str(field.value)
-                    elif field.name == 'manufacturer' and field.value:
-                        workout_data['manufacturer'] = str(field.value)
-                    elif field.name == 'garmin_product' and field.value:
-                        workout_data['source'] = str(field.value).replace('_', ' ').title()
-            
-            # First pass: collect exercise titles for lookup (strength workouts)
-            exercise_titles = {}
-            for record in fitfile.get_messages('exercise_title'):
-                title_data = {}
-                for field in record.fields:
-                    if field.name == 'wkt_step_name':
-                        title_data['name'] = field.value
-                    elif field.name == 'exercise_category':
-                        title_data['category'] = str(field.value) if field.value else None
-                    elif field.name == 'exercise_name':
-                        title_data['exercise_id'] = field.value
-                
-                if title_data.get('category') and title_data.get('name'):
-                    key = (title_data.get('category'), title_data.get('exercise_id'))
-                    exercise_titles[key] = title_data['name']
-                    exercise_titles[title_data.get('category')] = title_data['name']
-            
-            # Get workout name and sport type
-            for record in fitfile.get_messages('workout'):
-                for field in record.fields:
-                    if field.name == 'wkt_name' and field.value:
-                        workout_data['name'] = field.value
-                    elif field.name == 'sport' and field.value:
-                        workout_data['sport'] = str(field.value)
-                    elif field.name == 'sub_sport' and field.value:
-                        workout_data['sub_sport'] = str(field.value)
-            
-            # Second pass: get workout steps
-            steps_raw = []
-            for record in fitfile.get_messages('workout_step'):
-                step = {'is_rest': False, 'is_repeat': False}
-                for field in record.fields:
-                    if field.name == 'wkt_step_name' and field.value:
-                        step['name'] = field.value
-                    elif field.name == 'exercise_category' and field.value:
-                        step['category'] = str(field.value)
-                    elif field.name == 'exercise_name':
-                        step['exercise_id'] = field.value
-                    elif field.name == 'duration_type':
-                        dtype_str = str(field.value) if field.value else ''
-                        step['duration_type'] = dtype_str
-                        # FIT SDK: repeat types indicate this is a repeat step
-                        # repeat_until_steps_cmplt=6, repeat_until_time=7, etc.
-                        if 'repeat' in dtype_str.lower() or dtype_str in ('6', '7', '8', '9'):
-                            step['is_repeat'] = True
-                    elif field.name == 'duration_step' and field.value is not None:
-                        # This is which step to repeat back to (for repeat steps)
-                        step['duration_step'] = int(field.value)
-                    elif field.name == 'duration_value' and field.value is not None:
-                        # For repeat steps, this is the repeat count
-                        if step.get('is_repeat'):
-                            step['repeat_count'] = int(field.value)
-                    elif field.name == 'duration_reps' and field.value:
-                        step['reps'] = int(field.value)
-                    elif field.name == 'duration_time' and field.value:
-                        step['duration'] = float(field.value)
-                    elif field.name == 'duration_distance' and field.value:
-                        step['distance'] = float(field.value)
-                    elif field.name == 'intensity':
-                        intensity_raw = field.value
-                        intensity = str(intensity_raw) if intensity_raw is not None else None
-                        step['intensity'] = intensity
-                        # FIT SDK intensity: 0=active, 1=rest, 2=warmup, 3=cooldown
-                        # fitparse may return string or numeric
-                        if intensity in ('rest', '1', 1):
-                            step['is_rest'] = True
-                        elif intensity in ('warmup', '2', 2):
-                            step['is_warmup'] = True
-                    elif field.name == 'repeat_steps' and field.value:
-                        step['is_repeat'] = True
-                        step['repeat_count'] = int(field.value)
-                    elif field.name == 'exercise_weight' and field.value:
-                        step['weight'] = float(field.value)
-                    elif field.name == 'weight_display_unit':
-                        step['weight_unit'] = str(field.value) if field.value else 'kg'
-                    elif field.name == 'notes' and field.value:
-                        step['notes'] = field.value
-                    elif field.name == 'target_type' and field.value:
-                        step['target_type'] = str(field.value)
-                    elif field.name == 'target_value' and field.value:
-                        step['target_value'] = field.value
-                
-                steps_raw.append(step)
-            
-            # Determine if this is a cardio workout (running, cycling, etc.) vs strength
-            sport_lower = (workout_data.get('sport') or '').lower()
-            sub_sport_lower = (workout_data.get('sub_sport') or '').lower()
-            cardio_sports = ['running', 'cycling', 'swimming', 'walking', 'hiking', 'run', 'bike', 'swim', 'walk', 'hike', 'cardio', 'trail_running', 'treadmill']
-            is_cardio = sport_lower in cardio_sports or sub_sport_lower in cardio_sports or 'run' in sport_lower or 'run' in sub_sport_lower
-            
-            # Third pass: process steps
-            # Keep rest and repeat steps as separate entries for grouped display
-            exercises = []
-            i = 0
-            while i < len(steps_raw):
-                step = steps_raw[i]
-
-                # Handle repeat markers - keep as separate step for grouped display
-                if step.get('is_repeat'):
-                    repeat_step = {
-                        'is_repeat': True,
-                        'repeat_count': step.get('repeat_count', 0),
-                        'name': f"{step.get('repeat_count', 0)} Sets",
-                        'step_type': 'repeat'
-                    }
-                    # Also update previous exercise's sets for badge display
-                    if exercises and step.get('repeat_count'):
-                        for ex in reversed(exercises):
-                            if not ex.get('is_rest') and not ex.get('is_repeat'):
-                                ex['sets'] = step['repeat_count']
-                                break
-                    exercises.append(repeat_step)
-                    i += 1
-                    continue
-
-                # Handle rest steps - keep as separate entries for grouped display
-                if step.get('is_rest'):
-                    rest_step = {
-                        'is_rest': True,
-                        'step_type': 'rest',
-                        'name': 'Rest',
-                        'duration_type': step.get('duration_type', 'time'),
-                        'rest_seconds': step.get('duration', 0),
-                        'duration': step.get('duration', 0),
-                        'category': step.get('category')
-                    }
-                    if step.get('duration_type') in ('open', 'repeat_until_steps_cmplt'):
-                        rest_step['duration_type'] = 'open'
-                    exercises.append(rest_step)
-                    i += 1
-                    continue
-
-                # Handle warmup steps - keep as separate entries
-                if step.get('is_warmup'):
-                    warmup_step = {
-                        'step_type': 'warmup',
-                        'name': step.get('name') or 'Warm-Up',
-                        'duration_type': step.get('duration_type', 'time'),
-                        'duration': step.get('duration', 0),
-                        'category': step.get('category')
-                    }
-                    if step.get('duration_type') in ('open', 'repeat_until_steps_cmplt'):
-                        warmup_step['duration_type'] = 'open'
-                    exercises.append(warmup_step)
-                    i += 1
-                    continue
-
-                exercise = {}
-                cat = step.get('category')
-                ex_id = step.get('exercise_id')
-                intensity = step.get('intensity')
-                notes = step.get('notes')
-                
-                # Build step name based on workout type
-                if is_cardio:
-                    # For cardio workouts, use intensity + notes
-                    sport_name = workout_data.get('sport', 'exercise').title()
-
-                    # FIT SDK intensity: 0=active, 1=rest, 2=warmup, 3=cooldown
-                    if intensity in ('warmup', '2', 2):
-                        exercise['name'] = 'Warm Up'
-                        exercise['step_type'] = 'warmup'
-                    elif intensity in ('cooldown', '3', 3):
-                        exercise['name'] = 'Cool Down'
-                        exercise['step_type'] = 'cooldown'
-                    elif intensity in ('rest', '1', 1):
-                        exercise['name'] = 'Recovery'
-                        exercise['step_type'] = 'rest'
-                    elif intensity in ('active', '0', 0):
-                        exercise['name'] = notes if notes else sport_name
-                        exercise['step_type'] = 'active'
-                    else:
-                        exercise['name'] = notes if notes else sport_name
-                        exercise['step_type'] = 'active'
-                    
-                    # Add notes as subtitle if we used intensity for name
-                    if notes and exercise['name'] != notes:
-                        exercise['notes'] = notes
-                else:
-                    # For strength workouts, use exercise title lookup
-                    if step.get('name'):
-                        exercise['name'] = step['name']
-                    elif cat and (cat, ex_id) in exercise_titles:
-                        exercise['name'] = exercise_titles[(cat, ex_id)]
-                    elif cat and cat in exercise_titles:
-                        exercise['name'] = exercise_titles[cat]
-                    elif cat:
-                        exercise['name'] = cat.replace('_', ' ').title()
-                    else:
-                        exercise['name'] = 'Exercise'
-                
-                # Copy over exercise data
-                if step.get('reps'):
-                    exercise['reps'] = step['reps']
-                if step.get('duration'):
-                    exercise['duration'] = step['duration']
-                if step.get('distance'):
-                    exercise['distance'] = step['distance']
-                if step.get('weight'):
-                    weight = step['weight']
-                    unit = step.get('weight_unit', 'kg')
-                    if unit == 'pound':
-                        exercise['weight'] = f"{weight:.0f} lbs"
-                    else:
-                        exercise['weight'] = f"{weight:.1f} kg"
-                if step.get('notes') and is_cardio:
-                    exercise['zone'] = step['notes']
-                
-                exercise['sets'] = 1
-                exercise['type'] = cat.replace('_', ' ').title() if cat else ''
-                exercise['category'] = cat  # Keep original category for display lookup
-
-                exercises.append(exercise)
-                i += 1
-            
-            workout_data['steps'] = exercises
-            return workout_data if exercises else None
-            
-        except Exception as e:
-            # Silently fall back to basic parsing
-            return self.parse_fit_basic(filepath)
-    
-    def parse_fit_basic(self, filepath):
-        """Basic FIT file parsing without fitparse library"""
-        try:
-            with open(filepath, 'rb') as f:
-                data = f.read()
-            
-            # Check FIT header
-            if len(data) < 14:
-                return None
-            
-            header_size = data[0]
-            if header_size < 12:
-                return None
-            
-            # Check for ".FIT" signature
-            if data[8:12] != b'.FIT':
-                return None
-            
-            # Basic parsing - look for workout name in data
-            workout_data = {
-                'name': 'Workout',
-                'steps': []
-            }
-            
-            # Try to find readable strings that might be workout/exercise names
-            # This is a simplified approach
-            text_start = None
-            for i in range(header_size, len(data) - 4):
-                # Look for printable ASCII sequences
-                if 32 <= data[i] <= 126:
-                    if text_start is None:
-                        text_start = i
-                else:
-                    if text_start is not None and i - text_start >= 4:
-                        text = data[text_start:i].decode('ascii', errors='ignore')
-                        # Filter for likely workout/exercise names
-                        if len(text) >= 4 and not text.startswith(('.', '/', '\\')):
-                            if any(kw in text.lower() for kw in ['workout', 'exercise', 'run', 'bike', 'swim', 'strength']):
-                                if not workout_data['steps']:
-                                    workout_data['name'] = text
-                            elif len(text) < 30:
-                                workout_data['steps'].append({'name': text, 'type': 'exercise'})
-                    text_start = None
-            
-            # If we couldn't parse steps, create a placeholder
-            if not workout_data['steps']:
-                workout_data['steps'] = [
-                    {'name': 'Workout content', 'type': 'workout'},
-                    {'name': '(Install fitparse for detailed view)', 'type': 'info'}
-                ]
-            
+    def parse_and_validate_fit_file(self, filepath):
+        """Parse and validate a FIT file; returns (workout_data, validation).
+        Without fitfiletool both come from a single decode; fitfiletool's parser
+        and validator each read the file themselves."""
+        # A parse that decodes the file records its validation in the cache as
+        # it goes; the file is only validated again if that entry was evicted
+        # since (or the workout came from the cache without one)
+        workout_data = self.parse_fit_file(filepath)
+        return workout_data, self.validate_fit_file(filepath)
+
+    def parse_fit_file(self, filepath, summary_only=False):
+        """Parse a FIT file and extract workout data (cached until the file changes).
+        With summary_only, returns just the aggregates list cards show."""
+        if summary_only:
+            return self.summary_cache.get_or_parse(filepath, self._parse_fit_summary)
+        return self.parse_cache.get_or_parse(filepath, self._load_or_parse_fit_file)
+
+    def _parse_fit_summary(self, filepath):
+        """Compute a workout summary, streaming the file unless a full parse is at hand"""
+        workout_data = self.parse_cache.get(filepath)
+        if workout_data is not None:
+            return summarize_workout(workout_data)
+        return summarize_workout_file(filepath)
+
+    def _load_or_parse_fit_file(self, filepath):
+        """Load a workout from the persistent cache, parsing and storing it on a miss"""
+        missing = object()
+        workout_data = self._load_stored_workout(filepath, missing)
+        if workout_data is not missing:
             return workout_data
-            
-        except Exception as e:
-            # Silently return None for invalid files
-            return None
+
+        # A file the background check already validated isn't validated again
+        workout_data, validation = parse_workout_file(filepath, self.validation_cache.get(filepath))
+        self._store_parse_result(filepath, workout_data, validation)
+        return workout_data
+
+    def _load_stored_workout(self, filepath, default=None):
+        """Return the workout the persistent cache holds for filepath, filling the memory caches"""
+        stored = self.workout_store.get(filepath)
+        if not stored:
+            return default
+        if stored['preview_plan'] is not None:
+            self.preview_cache.put(filepath, tuple(PlanRow(*row) for row in stored['preview_plan']))
+        if stored['validation'] is not None:
+            self.validation_cache.put(filepath, stored['validation'])
+        workout_data = Workout(stored['workout'])
+        self.parse_cache.put(filepath, workout_data)
+        return workout_data
+
+    def _store_parse_result(self, filepath, workout_data, validation):
+        """Record a fresh parse in the validation and persistent caches"""
+        self.validation_cache.put(filepath, validation)
+        if workout_data:
+            self.workout_store.put(filepath, workout_data,
+                                   preview_plan=self.preview_plan(filepath, workout_data),
+                                   validation=validation)
+
+    def parse_many(self, filepaths, summary_only=False, ordered=True):
+        """Parse many FIT files, yielding (filepath, workout_data) in order or as each completes.
+        Cached files are served from the caches; the rest are parsed across the worker pool.
+        A file that can't be parsed yields None."""
+        missing = object()
+        entries = []
+        pending = []
+        for filepath in filepaths:
+            if summary_only:
+                value = self.summary_cache.get(filepath, missing)
+                if value is missing:
+                    workout_data = self.parse_cache.get(filepath)
+                    if workout_data is not None:
+                        value = summarize_workout(workout_data)
+            else:
+                value = self.parse_cache.get(filepath, missing)
+                if value is missing:
+                    value = self._load_stored_workout(filepath, missing)
+
+            if value is missing:
+                pending.append(filepath)
+            elif not ordered:
+                yield filepath, value
+                continue
+            entries.append((filepath, value))
+
+        worker = summarize_workout_file if summary_only else parse_workout_file
+        results = (self._accept_batch_result(result, summary_only)
+                   for result in self.batch_parser.parse_many(pending, worker, ordered=ordered))
+        if not ordered:
+            yield from results
+            return
+        for filepath, value in entries:
+            if value is missing:
+                value = next(results)[1]
+            yield filepath, value
+
+    def _record_parse_error(self, filepath, error):
+        """Show a worker's parse failure as the file's validation result (and list badge),
+        unless the file already has one"""
+        if self.validation_cache.get(filepath) is not None:
+            return
+        self.validation_cache.put(filepath, {
+            'valid': False, 'issues': [f"Could not parse file: {error}"], 'warnings': [],
+            'invalid_categories': [], 'validator': None,
+        })
+        self.root.after(0, self._update_file_badge, filepath)
+
+    def _accept_batch_result(self, result, summary_only):
+        """Cache a worker's result and return (filepath, workout_data or summary)"""
+        if result.error is not None:
+            self._record_parse_error(result.filepath, result.error)
+            return result.filepath, None
+        if summary_only:
+            self.summary_cache.put(result.filepath, result.value)
+            return result.filepath, result.value
+        workout_data, validation = result.value
+        # Keep the validation the file's badge already shows
+        validation = self.validation_cache.get(result.filepath) or validation
+        self.parse_cache.put(result.filepath, workout_data)
+        self._store_parse_result(result.filepath, workout_data, validation)
+        return result.filepath, workout_data
 
 
     # =========================================================================
@@ -2778,6 +2550,9 @@ You still need to drag them to OpenMTP."""
 
 
 def main():
+    # Worker processes re-run this entry point in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+
     # Use TkinterDnD if available, otherwise fall back to regular Tk
     global DND_AVAILABLE
     root = None
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Garmin Workout Uploader for Windows"""
 
-import os, sys, shutil, subprocess, re, threading, time, ctypes, json
+import os, sys, shutil, subprocess, re, struct, threading, time, ctypes, json
 from pathlib import Path
 from tkinter import *
 from tkinter import ttk, filedialog, messagebox
@@ -38,7 +38,7 @@ except ImportError:
 # Try to import amakaflow-fitfiletool for workout repair and FIT parsing
 try:
     from amakaflow_fitfiletool import (
-        GarminExerciseLookup, build_fit_workout, get_preview_steps, get_fit_metadata,
+        build_fit_workout, get_preview_steps, get_fit_metadata,
         parse_fit_file as fitfiletool_parse_fit_file,
         validate_fit_file as fitfiletool_validate_fit_file,
         get_sport_display, get_sport_color, format_duration, format_distance,
@@ -55,6 +55,19 @@ except ImportError:
     def fitfiletool_parse_fit_file(filepath): return None
     def fitfiletool_validate_fit_file(filepath): return {'valid': True, 'issues': [], 'warnings': []}
 
+# Built-in FIT decoder (no third-party dependencies)
+from fit_crc import check_fit_file_crc
+from fit_decoder import FitDecodeError, WORKOUT_MESSAGE_TYPES, read_fit_header, read_fit_messages
+from fit_repair import repair_fit_file_binary
+from fit_writer import FitFileWriter
+from display_plan import display_plan, plan_step, row_kind
+from step_fields import WIN_STEP_FIELD_HANDLERS, decode_step_fields
+from workout_rules import check_workout_steps, merge_rule_results
+from workout_cache import ParseCache
+
+# Memory for display plans, kept per file until the file changes
+PREVIEW_CACHE_BUDGET = 4 * 1024 * 1024
+
 # Try to import win32com for MTP file transfer
 try:
     import win32com.client
@@ -168,6 +181,12 @@ class GarminUploaderWin:
         # Track connected device for model-specific adjustments
         self.current_device = None
 
+        # Validation computed while parsing, so a preview decodes each file once
+        self._parsed_validation = None
+        # Display plans keyed on (path, size, mtime_ns), so re-opening a preview
+        # doesn't lay the steps out again
+        self.preview_cache = ParseCache(max_bytes=PREVIEW_CACHE_BUDGET)
+
         # Connect IQ app installation
         self.selected_prg_file = None
         self.prg_build_folder = Path.home() / "dev" / "amakaflow-garmin-app" / "bin"
@@ -628,7 +647,7 @@ class GarminUploaderWin:
                 Label(warning_frame, text=issue, font=('Segoe UI', 9),
                       bg='#dc3545', fg='#fff', wraplength=400, justify=LEFT).pack(anchor='w')
 
-            if FITFILETOOL_AVAILABLE:
+            if FITFILETOOL_AVAILABLE or validation.get('invalid_categories'):
                 def do_repair():
                     new_file, error = self.repair_fit_file(filepath, workout_data)
                     if new_file:
@@ -712,9 +731,9 @@ class GarminUploaderWin:
         canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", on_mousewheel))
         canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
 
-        # Process steps to detect repeat structures
+        # Lay out the steps with their repeat structure
         exercises = workout_data.get('steps', [])
-        processed_steps = self.process_steps_for_preview(exercises)
+        plan = self.preview_plan(filepath, workout_data)
 
         # Stats counters
         exercise_count = 0
@@ -722,24 +741,33 @@ class GarminUploaderWin:
         total_sets = 0
         repeat_count = 0
 
-        # Display processed steps
-        for step_info in processed_steps:
-            step_type = step_info.get('display_type', 'exercise')
+        # Display the plan's rows
+        nested_exercise = None
+        for row in plan:
+            step_info = plan_step(row, exercises)
+            kind = row_kind(row, step_info)
 
-            if step_type == 'repeat_header':
-                self.create_repeat_header(exercise_frame, step_info)
+            if kind == 'repeat_header':
+                self.create_repeat_header(exercise_frame, row.repeat_count)
                 repeat_count += 1
-                total_sets += step_info.get('repeat_count', 1)
-            elif step_type == 'nested_exercise':
+                total_sets += row.repeat_count
+            elif kind == 'nested_exercise':
                 self.create_nested_exercise_row(exercise_frame, step_info)
                 exercise_count += 1
-            elif step_type == 'nested_rest':
+                nested_exercise = step_info
+            elif kind == 'nested_rest':
+                if row.index is None:
+                    # The parser folds the rest between sets into the exercise's
+                    # 'rest'; show that, and no rest at all if the file has none
+                    if not nested_exercise.get('rest'):
+                        continue
+                    step_info = {'rest_seconds': nested_exercise['rest']}
                 self.create_nested_rest_row(exercise_frame, step_info)
                 rest_count += 1
-            elif step_info.get('is_rest') or step_info.get('step_type') == 'rest':
+            elif kind == 'rest':
                 self.create_rest_row(exercise_frame, step_info)
                 rest_count += 1
-            elif step_info.get('step_type') == 'warmup':
+            elif kind == 'warmup':
                 self.create_warmup_row(exercise_frame, step_info)
                 exercise_count += 1
             else:
@@ -779,59 +807,17 @@ class GarminUploaderWin:
                command=on_close, bg='#333', fg='#fff',
                padx=20, pady=8, relief=FLAT, cursor='hand2').pack(pady=(10, 0))
 
-    def process_steps_for_preview(self, steps):
-        """Process flat steps list to detect repeat structures for hierarchical display"""
-        processed = []
-        i = 0
-
-        while i < len(steps):
-            step = steps[i]
-
-            # Check if this step is followed by rest + repeat pattern
-            if i + 2 < len(steps):
-                next_step = steps[i + 1]
-                after_next = steps[i + 2]
-
-                is_rest = next_step.get('is_rest') or next_step.get('step_type') == 'rest'
-                is_repeat = after_next.get('is_repeat', False)
-
-                if is_rest and is_repeat:
-                    repeat_count = after_next.get('repeat_count', 0)
-
-                    processed.append({
-                        'display_type': 'repeat_header',
-                        'repeat_count': repeat_count,
-                        'text': f"{repeat_count} Sets"
-                    })
-
-                    nested_step = step.copy()
-                    nested_step['display_type'] = 'nested_exercise'
-                    processed.append(nested_step)
-
-                    nested_rest = next_step.copy()
-                    nested_rest['display_type'] = 'nested_rest'
-                    processed.append(nested_rest)
-
-                    i += 3
-                    continue
-
-            if step.get('is_repeat', False):
-                i += 1
-                continue
-
-            step_copy = step.copy()
-            step_copy['display_type'] = 'regular'
-            processed.append(step_copy)
-            i += 1
-
-        return processed
+    def preview_plan(self, filepath, workout_data):
+        """Return the display plan for a parsed workout (cached until the file changes)"""
+        return self.preview_cache.get_or_parse(
+            filepath, lambda _path: display_plan(workout_data.get('steps', [])))
 
-    def create_repeat_header(self, parent, step_info):
+    def create_repeat_header(self, parent, repeat_count):
         """Create a repeat/sets header row (blue background)"""
         row = Frame(parent, bg='#3b82f6', padx=10, pady=8)
         row.pack(fill=X, pady=(8, 2), padx=2)
 
-        Label(row, text=f"↻  {step_info.get('text', 'Sets')}",
+        Label(row, text=f"↻  {repeat_count} Sets",
               font=('Segoe UI', 12, 'bold'),
               bg='#3b82f6', fg='#fff').pack(anchor='w')
 
@@ -1030,51 +1016,101 @@ class GarminUploaderWin:
 
     def validate_fit_file(self, filepath):
         """Validate FIT file for issues that may prevent it from working on Garmin watches."""
-        # Try fitfiletool's validator first
+        validation = self._validate_fit_content(filepath)
+        # Corrupted or truncated files fail regardless of their content
+        try:
+            crc_issues = check_fit_file_crc(filepath)
+        except OSError as e:
+            crc_issues = [f"Could not read file: {str(e)}"]
+        if crc_issues:
+            validation['issues'] = crc_issues + validation['issues']
+            validation['valid'] = False
+        return validation
+
+    def _validate_fit_content(self, filepath):
+        """Validate the workout steps of a FIT file"""
+        # Try fitfiletool's validator first, adding the step rules' findings
         if FITFILETOOL_AVAILABLE:
             result = fitfiletool_validate_fit_file(filepath)
             if result:
                 # Convert to expected format if needed
-                return {
+                validation = {
                     'valid': result.get('valid', True),
                     'issues': result.get('issues', []),
                     'invalid_categories': result.get('invalid_categories', [])
                 }
+                try:
+                    steps = read_fit_messages(filepath, ('workout_step',)).get('workout_step', [])
+                except (OSError, FitDecodeError, struct.error):
+                    return validation
+                return merge_rule_results(validation, self.validate_step_messages(steps))
+
+        # Reuse the result from the parse that just decoded this file
+        validation = self._recall_validation(filepath)
+        if validation is not None:
+            return validation
 
         # Fall back to local implementation
+        try:
+            steps = read_fit_messages(filepath, ('workout_step',)).get('workout_step', [])
+            return self.validate_step_messages(steps)
+        except (OSError, FitDecodeError, struct.error):
+            pass
+
         if not FITPARSE_AVAILABLE:
             return {'valid': True, 'issues': [], 'invalid_categories': []}
 
         try:
             fitfile = FitFile(filepath)
-            issues = []
-            invalid_categories = []
-
-            VALID_CATEGORIES = set(range(33))
-
-            for record in fitfile.get_messages('workout_step'):
-                for field in record.fields:
-                    if field.name == 'exercise_category' and field.value is not None:
-                        if isinstance(field.value, int) and field.value not in VALID_CATEGORIES:
-                            invalid_categories.append(field.value)
-
-            if invalid_categories:
-                unique_invalid = list(set(invalid_categories))
-                issues.append(f"Invalid exercise categories found: {unique_invalid}")
-                issues.append("These may cause the workout to not appear on your Garmin watch.")
-
-            return {
-                'valid': len(issues) == 0,
-                'issues': issues,
-                'invalid_categories': list(set(invalid_categories))
-            }
+            steps = []
+            self._visit_fit_messages(fitfile, {'workout_step': steps.append})
+            return self.validate_step_messages(steps)
         except Exception as e:
             return {'valid': False, 'issues': [f"Error validating file: {str(e)}"], 'invalid_categories': []}
 
+    def validate_step_messages(self, steps):
+        """Check decoded workout_step messages for problems watches reject"""
+        return check_workout_steps(steps)
+
+    def _remember_validation(self, filepath, messages):
+        """Validate the steps a parse just decoded, for validate_fit_file to pick up"""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return
+        validation = self.validate_step_messages(messages.get('workout_step', []))
+        self._parsed_validation = ((filepath, st.st_size, st.st_mtime_ns), validation)
+
+    def _recall_validation(self, filepath):
+        """Return the validation remembered for filepath if the file hasn't changed"""
+        if not self._parsed_validation:
+            return None
+        (path, size, mtime_ns), validation = self._parsed_validation
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        if (path, size, mtime_ns) != (filepath, st.st_size, st.st_mtime_ns):
+            return None
+        return validation
+
     def repair_fit_file(self, filepath, workout_data):
-        """Repair a FIT file by regenerating it with valid exercise categories."""
+        """Repair a FIT file's invalid exercise categories.
+        Patches just the category bytes and the CRC, keeping rests, repeats and
+        warmups; files that can't be patched are regenerated with fitfiletool."""
+        try:
+            new_filepath, _replacements = repair_fit_file_binary(filepath)
+            if new_filepath:
+                return new_filepath, None
+            error = "No invalid exercise categories found"
+        except (OSError, FitDecodeError, struct.error) as e:
+            error = f"Error repairing file: {str(e)}"
         if not FITFILETOOL_AVAILABLE:
-            return None, "amakaflow-fitfiletool not available"
+            return None, error
+        return self._rebuild_fit_file(filepath, workout_data)
+
+    def _rebuild_fit_file(self, filepath, workout_data):
+        """Regenerate a FIT file from its parsed steps with amakaflow-fitfiletool"""
 
         try:
             exercises = []
@@ -1110,8 +1146,8 @@ class GarminUploaderWin:
             base, ext = os.path.splitext(filepath)
             new_filepath = f"{base}_repaired{ext}"
 
-            with open(new_filepath, 'wb') as f:
-                f.write(fit_bytes)
+            with FitFileWriter(new_filepath) as writer:
+                writer.write(fit_bytes)
 
             return new_filepath, None
         except Exception as e:
@@ -1124,229 +1160,225 @@ class GarminUploaderWin:
             result = fitfiletool_parse_fit_file(filepath)
             if result:
                 return result
+        # Built-in decoder handles well-formed files without any libraries;
+        # files it can't decode go on to the fallbacks below
+        try:
+            return self.parse_fit_native(filepath)
+        except (OSError, FitDecodeError, struct.error):
+            pass
         # Fall back to local fitparse implementation
         if FITPARSE_AVAILABLE:
             return self.parse_fit_with_fitparse(filepath)
-        # Last resort: basic binary parsing
+        # Last resort: basic header check
         return self.parse_fit_basic(filepath)
 
+    def parse_fit_native(self, filepath):
+        """Parse FIT file using the built-in record-by-record decoder.
+        Raises FitDecodeError if the file can't be decoded."""
+        messages = read_fit_messages(filepath, WORKOUT_MESSAGE_TYPES)
+        self._remember_validation(filepath, messages)
+        return self.build_workout_data(messages)
+
     def parse_fit_with_fitparse(self, filepath):
         """Parse FIT file using fitparse library"""
         try:
             fitfile = FitFile(filepath)
 
-            workout_data = {
-                'name': 'Workout',
-                'sport': None,
-                'steps': [],
-                'created': None,
-                'source': None
-            }
-
-            # Get file metadata
-            for record in fitfile.get_messages('file_id'):
-                for field in record.fields:
-                    if field.name == 'time_created' and field.value:
-                        workout_data['created'] = str(field.value)
-                    elif field.name == 'manufacturer' and field.value:
-                        workout_data['manufacturer'] = str(field.value)
-                    elif field.name == 'garmin_product' and field.value:
-                        workout_data['source'] = str(field.value).replace('_', ' ').title()
-
-            # First pass: collect exercise titles for lookup (strength workouts)
-            exercise_titles = {}
-            for record in fitfile.get_messages('exercise_title'):
-                title_data = {}
-                for field in record.fields:
-                    if field.name == 'wkt_step_name':
-                        title_data['name'] = field.value
-                    elif field.name == 'exercise_category':
-                        title_data['category'] = str(field.value) if field.value else None
-                    elif field.name == 'exercise_name':
-                        title_data['exercise_id'] = field.value
-
-                if title_data.get('category') and title_data.get('name'):
-                    key = (title_data.get('category'), title_data.get('exercise_id'))
-                    exercise_titles[key] = title_data['name']
-                    exercise_titles[title_data.get('category')] = title_data['name']
-
-            # Get workout name and sport type
-            for record in fitfile.get_messages('workout'):
-                for field in record.fields:
-                    if field.name == 'wkt_name' and field.value:
-                        workout_data['name'] = field.value
-                    elif field.name == 'sport' and field.value:
-                        workout_data['sport'] = str(field.value)
-                    elif field.name == 'sub_sport' and field.value:
-                        workout_data['sub_sport'] = str(field.value)
-
-            # Second pass: get workout steps
-            steps_raw = []
-            for record in fitfile.get_messages('workout_step'):
-                step = {'is_rest': False, 'is_repeat': False}
-                for field in record.fields:
-                    if field.name == 'wkt_step_name' and field.value:
-                        step['name'] = field.value
-                    elif field.name == 'exercise_category' and field.value:
-                        step['category'] = str(field.value)
-                    elif field.name == 'exercise_name':
-                        step['exercise_id'] = field.value
-                    elif field.name == 'duration_type':
-                        step['duration_type'] = str(field.value)
-                    elif field.name == 'duration_reps' and field.value:
-                        step['reps'] = int(field.value)
-                    elif field.name == 'duration_time' and field.value:
-                        step['duration'] = float(field.value)
-                    elif field.name == 'duration_distance' and field.value:
-                        step['distance'] = float(field.value)
-                    elif field.name == 'intensity':
-                        intensity = str(field.value) if field.value else None
-                        step['intensity'] = intensity
-                        if intensity == 'rest':
-                            step['is_rest'] = True
-                    elif field.name == 'repeat_steps' and field.value:
-                        step['is_repeat'] = True
-                        step['repeat_count'] = int(field.value)
-                    elif field.name == 'exercise_weight' and field.value:
-                        step['weight'] = float(field.value)
-                    elif field.name == 'weight_display_unit':
-                        step['weight_unit'] = str(field.value) if field.value else 'kg'
-                    elif field.name == 'notes' and field.value:
-                        step['notes'] = field.value
-                    elif field.name == 'target_type' and field.value:
-                        step['target_type'] = str(field.value)
-                    elif field.name == 'target_value' and field.value:
-                        step['target_value'] = field.value
-
-                steps_raw.append(step)
-
-            # Determine if this is a cardio workout (running, cycling, etc.) vs strength
-            sport_lower = (workout_data.get('sport') or '').lower()
-            sub_sport_lower = (workout_data.get('sub_sport') or '').lower()
-            cardio_sports = ['running', 'cycling', 'swimming', 'walking', 'hiking', 'run', 'bike', 'swim', 'walk', 'hike', 'cardio', 'trail_running', 'treadmill']
-            is_cardio = sport_lower in cardio_sports or sub_sport_lower in cardio_sports or 'run' in sport_lower or 'run' in sub_sport_lower
-
-            # Third pass: process steps
-            exercises = []
-            i = 0
-            while i < len(steps_raw):
-                step = steps_raw[i]
-
-                # Handle repeat markers for strength workouts
-                if step.get('is_repeat'):
-                    if exercises and step.get('repeat_count'):
-                        exercises[-1]['sets'] = step['repeat_count']
-                    i += 1
-                    continue
-
-                # For strength workouts, skip pure rest steps
-                if not is_cardio and step.get('is_rest'):
-                    if exercises and step.get('duration'):
-                        exercises[-1]['rest'] = step['duration']
-                    i += 1
-                    continue
+            # Single pass: each message is decoded once and routed by type
+            messages = {message_type: [] for message_type in WORKOUT_MESSAGE_TYPES}
+            self._visit_fit_messages(fitfile, {
+                message_type: collected.append for message_type, collected in messages.items()
+            })
 
-                exercise = {}
-                cat = step.get('category')
-                ex_id = step.get('exercise_id')
-                intensity = step.get('intensity')
-                notes = step.get('notes')
-
-                # Build step name based on workout type
-                if is_cardio:
-                    # For cardio workouts, use intensity + notes
-                    sport_name = workout_data.get('sport', 'exercise').title()
-
-                    if intensity == 'warmup':
-                        exercise['name'] = 'Warm Up'
-                        exercise['step_type'] = 'warmup'
-                    elif intensity == 'cooldown':
-                        exercise['name'] = 'Cool Down'
-                        exercise['step_type'] = 'cooldown'
-                    elif intensity == 'rest':
-                        exercise['name'] = 'Recovery'
-                        exercise['step_type'] = 'rest'
-                    elif intensity == 'active':
-                        exercise['name'] = notes if notes else sport_name
-                        exercise['step_type'] = 'active'
-                    else:
-                        exercise['name'] = notes if notes else sport_name
-                        exercise['step_type'] = 'active'
-
-                    # Add notes as subtitle if we used intensity for name
-                    if notes and exercise['name'] != notes:
-                        exercise['notes'] = notes
-                else:
-                    # For strength workouts, use exercise title lookup
-                    if step.get('name'):
-                        exercise['name'] = step['name']
-                    elif cat and (cat, ex_id) in exercise_titles:
-                        exercise['name'] = exercise_titles[(cat, ex_id)]
-                    elif cat and cat in exercise_titles:
-                        exercise['name'] = exercise_titles[cat]
-                    elif cat:
-                        exercise['name'] = cat.replace('_', ' ').title()
-                    else:
-                        exercise['name'] = f'Exercise {i + 1}'
+            self._remember_validation(filepath, messages)
+            return self.build_workout_data(messages)
 
-                    if cat:
-                        exercise['type'] = cat.replace('_', ' ')
+        except Exception as e:
+            print(f"Error parsing FIT file with fitparse: {e}")
+            return None
 
-                # Add duration
-                if step.get('duration'):
-                    exercise['duration'] = step['duration']
+    def _visit_fit_messages(self, fitfile, collectors):
+        """Walk every fitparse message once, passing each one's fields to the
+        collector registered for its message type"""
+        for record in fitfile.get_messages():
+            collector = collectors.get(record.name)
+            if collector is not None:
+                collector({field.name: field.value for field in record.fields})
+
+    def build_workout_data(self, messages):
+        """Build workout data from decoded FIT messages ({message_name: [fields, ...]})"""
+        workout_data = {
+            'name': 'Workout',
+            'sport': None,
+            'steps': [],
+            'created': None,
+            'source': None
+        }
+
+        # Get file metadata
+        for fields in messages.get('file_id', []):
+            for name, value in fields.items():
+                if name == 'time_created' and value:
+                    workout_data['created'] = str(value)
+                elif name == 'manufacturer' and value:
+                    workout_data['manufacturer'] = str(value)
+                elif name == 'garmin_product' and value:
+                    workout_data['source'] = str(value).replace('_', ' ').title()
+
+        # First pass: collect exercise titles for lookup (strength workouts)
+        exercise_titles = {}
+        for fields in messages.get('exercise_title', []):
+            title_data = {}
+            for name, value in fields.items():
+                if name == 'wkt_step_name':
+                    title_data['name'] = value
+                elif name == 'exercise_category':
+                    title_data['category'] = str(value) if value else None
+                elif name == 'exercise_name':
+                    title_data['exercise_id'] = value
+
+            if title_data.get('category') and title_data.get('name'):
+                key = (title_data.get('category'), title_data.get('exercise_id'))
+                exercise_titles[key] = title_data['name']
+                exercise_titles[title_data.get('category')] = title_data['name']
+
+        # Get workout name and sport type
+        for fields in messages.get('workout', []):
+            for name, value in fields.items():
+                if name == 'wkt_name' and value:
+                    workout_data['name'] = value
+                elif name == 'sport' and value:
+                    workout_data['sport'] = str(value)
+                elif name == 'sub_sport' and value:
+                    workout_data['sub_sport'] = str(value)
+
+        # Second pass: get workout steps
+        steps_raw = [decode_step_fields(fields, WIN_STEP_FIELD_HANDLERS)
+                     for fields in messages.get('workout_step', [])]
+
+        # Determine if this is a cardio workout (running, cycling, etc.) vs strength
+        sport_lower = (workout_data.get('sport') or '').lower()
+        sub_sport_lower = (workout_data.get('sub_sport') or '').lower()
+        cardio_sports = ['running', 'cycling', 'swimming', 'walking', 'hiking', 'run', 'bike', 'swim', 'walk', 'hike', 'cardio', 'trail_running', 'treadmill']
+        is_cardio = sport_lower in cardio_sports or sub_sport_lower in cardio_sports or 'run' in sport_lower or 'run' in sub_sport_lower
+
+        # Third pass: process steps
+        exercises = []
+        i = 0
+        while i < len(steps_raw):
+            step = steps_raw[i]
 
-                # Add distance
-                if step.get('distance'):
-                    exercise['distance'] = step['distance']
+            # Handle repeat markers for strength workouts
+            if step.get('is_repeat'):
+                if exercises and step.get('repeat_count'):
+                    exercises[-1]['sets'] = step['repeat_count']
+                i += 1
+                continue
 
-                # Add reps for strength workouts
-                if step.get('reps'):
-                    exercise['reps'] = step['reps']
-
-                # Add weight
-                if step.get('weight'):
-                    unit = step.get('weight_unit', 'kg')
-                    exercise['weight'] = f"{int(step['weight'])} {unit}"
-
-                # Add target/zone info for cardio
-                if step.get('target_type') and step.get('target_value'):
-                    target_type = step['target_type']
-                    if 'heart_rate' in target_type:
-                        exercise['zone'] = f"HR Zone {int(step['target_value'])}"
-                    elif 'speed' in target_type or 'pace' in target_type:
-                        exercise['zone'] = f"Pace {step['target_value']}"
-                    elif 'power' in target_type:
-                        exercise['zone'] = f"{int(step['target_value'])}W"
-
-                exercise['sets'] = 1  # default
-                exercises.append(exercise)
+            # For strength workouts, skip pure rest steps
+            if not is_cardio and step.get('is_rest'):
+                if exercises and step.get('duration'):
+                    exercises[-1]['rest'] = step['duration']
                 i += 1
+                continue
 
-            workout_data['steps'] = exercises
-            return workout_data
+            exercise = {}
+            cat = step.get('category')
+            ex_id = step.get('exercise_id')
+            intensity = step.get('intensity')
+            notes = step.get('notes')
+
+            # Build step name based on workout type
+            if is_cardio:
+                # For cardio workouts, use intensity + notes
+                sport_name = workout_data.get('sport', 'exercise').title()
+
+                if intensity == 'warmup':
+                    exercise['name'] = 'Warm Up'
+                    exercise['step_type'] = 'warmup'
+                elif intensity == 'cooldown':
+                    exercise['name'] = 'Cool Down'
+                    exercise['step_type'] = 'cooldown'
+                elif intensity == 'rest':
+                    exercise['name'] = 'Recovery'
+                    exercise['step_type'] = 'rest'
+                elif intensity == 'active':
+                    exercise['name'] = notes if notes else sport_name
+                    exercise['step_type'] = 'active'
+                else:
+                    exercise['name'] = notes if notes else sport_name
+                    exercise['step_type'] = 'active'
 
-        except Exception as e:
-            print(f"Error parsing FIT file with fitparse: {e}")
-            return None
+                # Add notes as subtitle if we used intensity for name
+                if notes and exercise['name'] != notes:
+                    exercise['notes'] = notes
+            else:
+                # For strength workouts, use exercise title lookup
+                if step.get('name'):
+                    exercise['name'] = step['name']
+                elif cat and (cat, ex_id) in exercise_titles:
+                    exercise['name'] = exercise_titles[(cat, ex_id)]
+                elif cat and cat in exercise_titles:
+                    exercise['name'] = exercise_titles[cat]
+                elif cat:
+                    exercise['name'] = cat.replace('_', ' ').title()
+                else:
+                    exercise['name'] = f'Exercise {i + 1}'
+
+                if cat:
+                    exercise['type'] = cat.replace('_', ' ')
+
+            # Add duration
+            if step.get('duration'):
+                exercise['duration'] = step['duration']
+
+            # Add distance
+            if step.get('distance'):
+                exercise['distance'] = step['distance']
+
+            # Add reps for strength workouts
+            if step.get('reps'):
+                exercise['reps'] = step['reps']
+
+            # Add weight
+            if step.get('weight'):
+                unit = step.get('weight_unit', 'kg')
+                exercise['weight'] = f"{int(step['weight'])} {unit}"
+
+            # Add target/zone info for cardio
+            if step.get('target_type') and step.get('target_value'):
+                target_type = step['target_type']
+                if 'heart_rate' in target_type:
+                    exercise['zone'] = f"HR Zone {int(step['target_value'])}"
+                elif 'speed' in target_type or 'pace' in target_type:
+                    exercise['zone'] = f"Pace {step['target_value']}"
+                elif 'power' in target_type:
+                    exercise['zone'] = f"{int(step['target_value'])}W"
+
+            exercise['sets'] = 1  # default
+            exercises.append(exercise)
+            i += 1
+
+        workout_data['steps'] = exercises
+        return workout_data
 
     def parse_fit_basic(self, filepath):
-        """Basic FIT file parsing without fitparse library"""
+        """Basic FIT file check when workout records can't be decoded"""
         try:
             with open(filepath, 'rb') as f:
-                data = f.read()
+                read_fit_header(f.read(64))
 
             # Very basic parsing - just show it's a workout file
             workout_data = {
                 'name': 'Workout',
                 'sport': 'training',
-                'steps': [{'name': '(Install fitparse for detailed view)', 'type': 'info'}],
+                'steps': [{'name': '(Workout steps could not be decoded)', 'type': 'info'}],
                 'created': None,
                 'source': 'FIT File'
             }
 
             # Try to extract file size at least
-            workout_data['size'] = len(data)
+            workout_data['size'] = os.path.getsize(filepath)
 
             return workout_data
         except Exception as e:
@@ -0,0 +1,250 @@
+"""
+Canvas renderer for workout step lists.
+
+Draws a workout's display plan (see display_plan.py) - repeat headers, nested
+exercises and rests, warmups, rests and exercises, each with its badges - as
+text and rectangle items on a single Canvas, rather than building a Frame
+and several Labels per row. A 200-step workout is then a few hundred canvas
+items on one widget instead of over a thousand widgets, so it builds and
+scrolls much faster. Rows are re-flowed when the canvas is resized.
+"""
+
+from display_plan import plan_step, row_kind
+
+TITLE_FONT = ('SF Pro Text', 11, 'bold')
+REST_FONT = ('SF Pro Text', 11)
+HEADER_FONT = ('SF Pro Text', 12, 'bold')
+BADGE_FONT = ('SF Pro Text', 10, 'bold')
+CATEGORY_FONT = ('SF Pro Text', 9)
+
+# Space left of and right of every row, and the nesting bar width
+ROW_INSET = 2
+BORDER_WIDTH = 4
+BADGE_SPACING = 5
+
+
+class StepCanvas:
+    """Draws workout steps as items on a Canvas"""
+
+    def __init__(self, canvas, format_duration, category_names=None):
+        self.canvas = canvas
+        self.format_duration = format_duration
+        self.category_names = category_names or {}
+        self._rows = []
+        self._width = None
+        canvas.bind('<Configure>', self._on_configure, add='+')
+
+    def show_plan(self, plan, steps):
+        """Draw a workout's display plan"""
+        rows = []
+        exercise_count = 0
+        for row in plan:
+            step = plan_step(row, steps)
+            kind = row_kind(row, step)
+            if kind == 'repeat_header':
+                rows.append((kind, step, row.repeat_count))
+                continue
+            rows.append((kind, step, exercise_count))
+            if kind in ('nested_exercise', 'warmup', 'exercise'):
+                exercise_count += 1
+        self._rows = rows
+        self.redraw()
+
+    def redraw(self, width=None):
+        canvas = self.canvas
+        canvas.delete('all')
+        width = self._width = max(width or canvas.winfo_width(), 100)
+        y = 0
+        for kind, step, index in self._rows:
+            y = self._DRAW[kind](self, y, width, step, index)
+        canvas.configure(scrollregion=(0, 0, width, y))
+
+    def _on_configure(self, event):
+        if event.width != self._width:
+            self.redraw(event.width)
+
+    # =====================================================================
+    # Drawing primitives
+    # =====================================================================
+
+    def _box(self, top, width, bg, outline=''):
+        """Background rectangle for a row; sized once its content is drawn"""
+        return self.canvas.create_rectangle(ROW_INSET, top, width - ROW_INSET, top,
+                                            fill=bg, outline=outline)
+
+    def _close_box(self, box, top, width, bottom, border=None):
+        self.canvas.coords(box, ROW_INSET, top, width - ROW_INSET, bottom)
+        if border:
+            self.canvas.create_rectangle(ROW_INSET, top, ROW_INSET + BORDER_WIDTH, bottom,
+                                         fill=border, outline='')
+
+    def _text(self, x, y, text, font, fill, wrap=None):
+        """Draw text at (x, y); returns (right, bottom)"""
+        item = self.canvas.create_text(x, y, text=text, font=font, fill=fill, anchor='nw',
+                                       width=wrap)
+        _x0, _y0, x1, y1 = self.canvas.bbox(item)
+        return x1, y1
+
+    def _badge(self, x, y, text, bg, fg='#fff', font=BADGE_FONT, padx=8, pady=2):
+        """Draw a filled badge; returns (right, bottom)"""
+        rect = self.canvas.create_rectangle(x, y, x, y, fill=bg, outline='')
+        right, bottom = self._text(x + padx, y + pady, text, font, fg)
+        self.canvas.coords(rect, x, y, right + padx, bottom + pady)
+        return right + padx, bottom + pady
+
+    def _badges(self, x, y, badges):
+        """Draw a row of badges; returns its bottom (y when there are none)"""
+        bottom = y
+        for badge in badges:
+            text, bg = badge[:2]
+            if len(badge) > 2:
+                right, badge_bottom = self._badge(x, y, text, bg, fg=badge[2], font=CATEGORY_FONT,
+                                                  padx=6)
+            else:
+                right, badge_bottom = self._badge(x, y, text, bg)
+            x = right + BADGE_SPACING
+            bottom = max(bottom, badge_bottom)
+        return bottom
+
+    def _category_badge(self, step_info, name):
+        """The gray category badge, unless the name already says it"""
+        category = step_info.get('category', '')
+        if not category:
+            return None
+        try:
+            cat_name = self.category_names.get(int(category), '')
+            if cat_name and cat_name.lower() not in name.lower():
+                return (cat_name, '#374151', '#d1d5db')
+        except (ValueError, TypeError):
+            if category.lower() not in name.lower():
+                return (category.replace('_', ' ').title(), '#374151', '#d1d5db')
+        return None
+
+    def _exercise_badges(self, step_info, name, with_sets):
+        badges = []
+        # Reps badge (green)
+        if step_info.get('reps'):
+            badges.append((f"{step_info['reps']} reps", '#22c55e'))
+        # Duration badge (blue)
+        if step_info.get('duration'):
+            badges.append((self.format_duration(step_info['duration']), '#3b82f6'))
+        elif step_info.get('duration_type') == 'open':
+            badges.append(("Lap Button", '#6b7280'))
+        # Sets badge (green, only if > 1)
+        sets = step_info.get('sets', 1)
+        if with_sets and sets > 1:
+            badges.append((f"{sets} sets", '#22c55e'))
+        category = self._category_badge(step_info, name)
+        if category:
+            badges.append(category)
+        return badges
+
+    @staticmethod
+    def _rest_seconds(rest_info):
+        return rest_info.get('rest_seconds', rest_info.get('duration', 0))
+
+    # =====================================================================
+    # Rows
+    # =====================================================================
+
+    def _repeat_header(self, y, width, step, repeat_count):
+        """Repeat/sets header (green background like web app)"""
+        top = y + 8
+        box = self._box(top, width, '#166534')
+        _right, bottom = self._text(ROW_INSET + 10, top + 8, f"↻  {repeat_count} Sets",
+                                    HEADER_FONT, '#4ade80')
+        self._close_box(box, top, width, bottom + 8)
+        return bottom + 8 + 2
+
+    def _nested_exercise(self, y, width, exercise, index):
+        """Exercise nested within a repeat block (blue bar, orange for warm-up sets)"""
+        is_warmup_set = exercise.get('is_warmup_set', False)
+        border_color = '#f97316' if is_warmup_set else '#3b82f6'
+        bg_color = '#1a1520' if is_warmup_set else '#111827'
+        text_color = '#fbbf24' if is_warmup_set else '#93c5fd'
+        suffix = " (Warm-Up)" if is_warmup_set else ""
+
+        top = y + 1
+        box = self._box(top, width, bg_color)
+        x = ROW_INSET + BORDER_WIDTH + 10
+        name = exercise.get('name', 'Exercise')
+        _right, bottom = self._text(x, top + 8, f"※  {name}{suffix}", TITLE_FONT, text_color,
+                                    wrap=width - x - 12)
+        badges = self._exercise_badges(exercise, name, with_sets=False)
+        if badges:
+            bottom = self._badges(x, bottom + 4, badges)
+        self._close_box(box, top, width, bottom + 8, border=border_color)
+        return bottom + 8 + 1
+
+    def _nested_rest(self, y, width, rest_info, index):
+        """Rest nested within a repeat block (gray bar)"""
+        top = y + 1
+        box = self._box(top, width, '#111')
+        x = ROW_INSET + BORDER_WIDTH + 10
+        right, bottom = self._text(x, top + 6, "↷  Rest", REST_FONT, '#9ca3af')
+
+        rest_seconds = self._rest_seconds(rest_info)
+        if rest_info.get('duration_type', '') in ('open', 'lap_button') or rest_seconds <= 0:
+            text = "Lap Button"
+        else:
+            text = f"{int(rest_seconds)}s rest"
+        _right, badge_bottom = self._badge(right + 6, top + 6, text, '#6b7280')
+        bottom = max(bottom, badge_bottom)
+        self._close_box(box, top, width, bottom + 6, border='#6b7280')
+        return bottom + 6 + 1
+
+    def _rest(self, y, width, rest_info, index):
+        """Standalone rest"""
+        top = y + 2
+        box = self._box(top, width, '#1f2937')
+        right, bottom = self._text(ROW_INSET + 10, top + 8, "↷  Rest", TITLE_FONT, '#9ca3af')
+
+        rest_seconds = self._rest_seconds(rest_info)
+        if rest_info.get('duration_type', '') in ('open', 'lap_button') or rest_seconds <= 0:
+            text = "Lap Button"
+        else:
+            text = f"{int(rest_seconds)}s"
+        _right, badge_bottom = self._badge(right + 6, top + 8, text, '#f97316')
+        bottom = max(bottom, badge_bottom)
+        self._close_box(box, top, width, bottom + 8)
+        return bottom + 8 + 2
+
+    def _warmup(self, y, width, warmup_info, index):
+        """Warmup with timer icon (gold outline)"""
+        top = y + 2
+        box = self._box(top, width, '#1c1917', outline='#eab308')
+        x = ROW_INSET + 10
+        _right, bottom = self._text(x, top + 8, f"⊙  {warmup_info.get('name', 'Warmup')}",
+                                    TITLE_FONT, '#eab308', wrap=width - x - 12)
+
+        duration = warmup_info.get('duration', 0)
+        duration_type = warmup_info.get('duration_type', '')
+        if duration > 0:
+            bottom = self._badges(x, bottom + 4, [(self.format_duration(duration), '#3b82f6')])
+        elif duration_type in ('open', 5):  # 5 is FIT SDK OPEN
+            bottom = self._badges(x, bottom + 4, [("Press Lap", '#6b7280')])
+        self._close_box(box, top, width, bottom + 8)
+        return bottom + 8 + 2
+
+    def _exercise(self, y, width, exercise, index):
+        """Standalone exercise (not nested in a repeat)"""
+        top = y + 2
+        box = self._box(top, width, '#111')
+        x = ROW_INSET + 10
+        name = exercise.get('name', f'Exercise {index + 1}')
+        _right, bottom = self._text(x, top + 8, f"※  {name}", TITLE_FONT, '#fff',
+                                    wrap=width - x - 12)
+        badges = self._exercise_badges(exercise, name, with_sets=True)
+        if badges:
+            bottom = self._badges(x, bottom + 4, badges)
+        self._close_box(box, top, width, bottom + 8)
+        return bottom + 8 + 2
+
+    _DRAW = {
+        'repeat_header': _repeat_header,
+        'nested_exercise': _nested_exercise,
+        'nested_rest': _nested_rest,
+        'rest': _rest,
+        'warmup': _warmup,
+        'exercise': _exercise,
+    }
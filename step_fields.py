@@ -0,0 +1,126 @@
+"""
+Table-driven decoding of workout_step fields.
+
+Each decoded workout_step message ({field name: value}) is turned into the
+raw step dict the Mac and Windows workout builders work from. Rather than
+testing every field against a chain of names, each field name maps to a
+handler that updates the step; fields without a handler are ignored.
+
+The two apps share the handlers for most fields and differ only in how
+they read duration_type, duration_value and intensity.
+"""
+
+
+def _store(key, convert=None):
+    """Handler storing a truthy value under key, optionally converted"""
+    if convert is None:
+        def handler(step, value):
+            if value:
+                step[key] = value
+    else:
+        def handler(step, value):
+            if value:
+                step[key] = convert(value)
+    return handler
+
+
+def _exercise_name(step, value):
+    step['exercise_id'] = value
+
+
+def _repeat_steps(step, value):
+    if value:
+        step['is_repeat'] = True
+        step['repeat_count'] = int(value)
+
+
+def _weight_display_unit(step, value):
+    step['weight_unit'] = str(value) if value else 'kg'
+
+
+COMMON_STEP_FIELD_HANDLERS = {
+    'wkt_step_name': _store('name'),
+    'exercise_category': _store('category', str),
+    'exercise_name': _exercise_name,
+    'duration_reps': _store('reps', int),
+    'duration_time': _store('duration', float),
+    'duration_distance': _store('distance', float),
+    'repeat_steps': _repeat_steps,
+    'exercise_weight': _store('weight', float),
+    'weight_display_unit': _weight_display_unit,
+    'notes': _store('notes'),
+    'target_type': _store('target_type', str),
+    'target_value': _store('target_value'),
+}
+
+
+# Mac: repeat steps are recognized from the duration type too, and
+# intensity may come through as a name or a raw number
+def _mac_duration_type(step, value):
+    dtype_str = str(value) if value else ''
+    step['duration_type'] = dtype_str
+    # FIT SDK: repeat types indicate this is a repeat step
+    # repeat_until_steps_cmplt=6, repeat_until_time=7, etc.
+    if 'repeat' in dtype_str.lower() or dtype_str in ('6', '7', '8', '9'):
+        step['is_repeat'] = True
+
+
+def _mac_duration_step(step, value):
+    # This is which step to repeat back to (for repeat steps)
+    if value is not None:
+        step['duration_step'] = int(value)
+
+
+def _mac_duration_value(step, value):
+    # For repeat steps, this is the repeat count
+    if value is not None and step.get('is_repeat'):
+        step['repeat_count'] = int(value)
+
+
+def _mac_intensity(step, value):
+    intensity = str(value) if value is not None else None
+    step['intensity'] = intensity
+    # FIT SDK intensity: 0=active, 1=rest, 2=warmup, 3=cooldown
+    # fitparse may return string or numeric
+    if intensity in ('rest', '1'):
+        step['is_rest'] = True
+    elif intensity in ('warmup', '2'):
+        step['is_warmup'] = True
+
+
+MAC_STEP_FIELD_HANDLERS = {
+    **COMMON_STEP_FIELD_HANDLERS,
+    'duration_type': _mac_duration_type,
+    'duration_step': _mac_duration_step,
+    'duration_value': _mac_duration_value,
+    'intensity': _mac_intensity,
+}
+
+
+# Windows: only explicit repeat_steps mark repeats, and only 'rest' is special
+def _win_duration_type(step, value):
+    step['duration_type'] = str(value)
+
+
+def _win_intensity(step, value):
+    intensity = str(value) if value else None
+    step['intensity'] = intensity
+    if intensity == 'rest':
+        step['is_rest'] = True
+
+
+WIN_STEP_FIELD_HANDLERS = {
+    **COMMON_STEP_FIELD_HANDLERS,
+    'duration_type': _win_duration_type,
+    'intensity': _win_intensity,
+}
+
+
+def decode_step_fields(fields, handlers):
+    """Build a raw step dict from one workout_step message's fields, in field order"""
+    step = {'is_rest': False, 'is_repeat': False}
+    for name, value in fields.items():
+        handler = handlers.get(name)
+        if handler is not None:
+            handler(step, value)
+    return step
@@ -0,0 +1,44 @@
+"""
+Workout step rules, on decoded workout_step messages and merged into
+fitfiletool's validation.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fit_decoder import WKT_STEP_DURATION
+from workout_rules import check_workout_steps, merge_rule_results
+
+
+def test_reps_step_is_a_known_duration_type():
+    # The decoder names duration type 29 'reps' (28 is repetition_time)
+    steps = [
+        {'message_index': 0, 'duration_type': WKT_STEP_DURATION[29], 'duration_reps': 10,
+         'exercise_category': 'squat'},
+        {'message_index': 1, 'duration_type': 'repetition_time', 'duration_time': 30.0},
+    ]
+    validation = check_workout_steps(steps, 'native')
+    assert validation['valid']
+    assert validation['warnings'] == []
+
+
+def test_unknown_duration_type_warns():
+    validation = check_workout_steps([{'message_index': 0, 'duration_type': 30}])
+    assert validation['warnings'] == ["Unsupported step duration types: ['30']"]
+
+
+def test_rule_findings_merge_into_fitfiletool_result():
+    fitfiletool = {'valid': True, 'issues': [], 'warnings': ['Workout uses generic sport type.']}
+    steps = [
+        {'message_index': 0, 'duration_type': 'reps', 'exercise_category': 40},
+        {'message_index': 1, 'duration_type': 'repeat_until_steps_cmplt', 'duration_step': 3,
+         'repeat_steps': 2},
+    ]
+    validation = merge_rule_results(fitfiletool, check_workout_steps(steps, 'native'))
+    assert not validation['valid']
+    assert validation['invalid_categories'] == [40]
+    assert "Step 2 repeats from step 4, but the workout only has 2 steps" in validation['issues']
+    assert validation['warnings'] == ['Workout uses generic sport type.']
+    assert 'duration_type' in validation['rule_timings']
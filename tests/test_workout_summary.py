@@ -0,0 +1,68 @@
+"""
+Workout summary aggregates, as the parser records them and as the list's
+streaming summary computes them, and the preview footer built from them.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from workout_parser import build_workout_data
+from workout_summary import summarize_fit_messages, summarize_steps, workout_stats
+
+
+def _repeat(back_to, count):
+    return {'duration_type': 'repeat_until_steps_cmplt', 'duration_step': back_to, 'repeat_steps': count}
+
+
+# Warmup, then squats x3 with a rest, a single plank, then lunges x2 with a rest:
+# 9 steps, 4 exercises (the warmup included), 3 rests and 3 + 1 + 2 = 6 sets
+MIXED_WORKOUT_STEPS = [
+    {'wkt_step_name': 'Warm Up', 'intensity': 'warmup', 'duration_type': 'time', 'duration_time': 300.0},
+    {'wkt_step_name': 'Squat', 'intensity': 'active', 'duration_type': 'reps', 'duration_reps': 10},
+    {'intensity': 'rest', 'duration_type': 'time', 'duration_time': 60.0},
+    _repeat(1, 3),
+    {'wkt_step_name': 'Plank', 'intensity': 'active', 'duration_type': 'time', 'duration_time': 45.0},
+    {'intensity': 'rest', 'duration_type': 'time', 'duration_time': 30.0},
+    {'wkt_step_name': 'Lunge', 'intensity': 'active', 'duration_type': 'reps', 'duration_reps': 8},
+    {'intensity': 'rest', 'duration_type': 'time', 'duration_time': 60.0},
+    _repeat(6, 2),
+]
+
+WORKOUT = {'wkt_name': 'Mixed', 'sport': 'training', 'sub_sport': 'strength_training'}
+
+
+def _parsed():
+    return build_workout_data({'workout': [WORKOUT], 'workout_step': MIXED_WORKOUT_STEPS})
+
+
+def test_parser_summary_counts_sets_over_exercises_only():
+    summary = _parsed()['summary']
+    assert summary['step_count'] == 9
+    assert summary['exercise_count'] == 4
+    assert summary['rest_count'] == 3
+    assert summary['total_sets'] == 6
+    assert summary['total_duration'] == 300 + 60 + 45 + 30 + 60
+
+
+def test_preview_footer_stats():
+    assert " • ".join(workout_stats(_parsed()['summary'])) == "9 steps • 4 exercises • 6 total sets"
+
+
+def test_detail_footer_stats():
+    stats = workout_stats(_parsed()['summary'], with_rests=True)
+    assert " • ".join(stats) == "9 steps • 4 exercises • 6 total sets • 3 rest"
+
+
+def test_summaries_agree():
+    workout_data = _parsed()
+    messages = [('workout', WORKOUT)] + [('workout_step', fields) for fields in MIXED_WORKOUT_STEPS]
+    assert summarize_fit_messages(messages) == workout_data['summary']
+    assert summarize_steps(workout_data) == workout_data['summary']
+
+
+def test_footer_omits_total_sets_without_repeats():
+    steps = [MIXED_WORKOUT_STEPS[0], MIXED_WORKOUT_STEPS[4], MIXED_WORKOUT_STEPS[5]]
+    summary = build_workout_data({'workout': [WORKOUT], 'workout_step': steps})['summary']
+    assert workout_stats(summary) == ["3 steps", "2 exercises"]
@@ -0,0 +1,267 @@
+"""
+Caches for parsed workouts and validation results.
+
+In-memory entries are keyed on a file fingerprint (path, size, mtime_ns), so a
+cached result is reused until the file on disk changes. The persistent store
+is keyed on a digest of the file's contents, so it survives relaunches and
+files being copied or renamed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+from fit_io import open_fit_buffer
+
+# Default memory budget for an in-memory cache
+DEFAULT_CACHE_BUDGET = 64 * 1024 * 1024
+
+# Bump whenever the parser, the validation rules or the cached step model change;
+# a store written by another version is discarded on open
+CACHE_SCHEMA_VERSION = 8
+
+
+def file_fingerprint(filepath):
+    """Return the (path, size, mtime_ns) key identifying a file's current contents"""
+    st = os.stat(filepath)
+    return (os.path.abspath(filepath), st.st_size, st.st_mtime_ns)
+
+
+def content_digest(filepath):
+    """Return a hex digest of a file's contents"""
+    with open_fit_buffer(filepath) as data:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _json_default(obj):
+    """Serialize model records as dicts and anything else as a string"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    return str(obj)
+
+
+def estimate_size(obj):
+    """Rough deep size in bytes of a parse result (dicts, lists, strings, numbers)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if hasattr(item, 'to_dict'):
+            # Slotted records (workout_model): count the values they hold
+            stack.extend(item.values())
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return total
+
+
+class ParseCache:
+    """Thread-safe LRU cache of per-file results, bounded by a memory budget"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BUDGET, sizeof=estimate_size):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # fingerprint -> (value, size)
+        self._lock = threading.Lock()
+
+    def get(self, filepath, default=None):
+        """Return the cached result for filepath, or default if missing or stale"""
+        try:
+            key = file_fingerprint(filepath)
+        except OSError:
+            return default
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, filepath, value):
+        """Cache value for the current contents of filepath"""
+        try:
+            key = file_fingerprint(filepath)
+        except OSError:
+            return
+        self._store(key, value)
+
+    def get_or_parse(self, filepath, parse):
+        """Return the cached result for filepath, calling parse(filepath) on a miss"""
+        try:
+            key = file_fingerprint(filepath)
+        except OSError:
+            return parse(filepath)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = parse(filepath)
+        self._store(key, value)
+        return value
+
+    def invalidate(self, filepath):
+        """Drop every cached entry for filepath, whatever its fingerprint"""
+        path = os.path.abspath(filepath)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _store(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return  # Larger than the whole budget - not worth evicting everything
+        with self._lock:
+            # A newer fingerprint replaces any stale entry for the same path
+            for stale in [k for k in self._entries if k[0] == key[0] and k != key]:
+                self.current_bytes -= self._entries.pop(stale)[1]
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _key, (_value, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+
+class PersistentParseCache:
+    """SQLite store of parsed workouts and their preview display plans, keyed on content digest.
+
+    parser_tag identifies the parser configuration that produced an entry;
+    entries written under a different tag are treated as misses.
+    """
+
+    def __init__(self, db_path, parser_tag=''):
+        self.db_path = str(db_path)
+        self.parser_tag = parser_tag
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self._conn = self._open()
+        except sqlite3.Error as e:
+            print(f"Parse cache disabled: {e}")
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # A lost write only costs a re-parse, so trade durability for speed
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS workouts")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workouts (
+                digest TEXT PRIMARY KEY,
+                parser TEXT NOT NULL,
+                workout TEXT NOT NULL,
+                preview_plan TEXT,
+                validation TEXT,
+                updated REAL NOT NULL DEFAULT (julianday('now'))
+            )
+        """)
+        conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+        conn.commit()
+        return conn
+
+    def get(self, filepath):
+        """Return {'workout', 'preview_plan', 'validation'} stored for filepath's contents, or None"""
+        if self._conn is None:
+            return None
+        try:
+            digest = content_digest(filepath)
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT workout, preview_plan, validation FROM workouts WHERE digest = ? AND parser = ?",
+                    (digest, self.parser_tag)).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        workout, preview_plan, validation = row
+        return {
+            'workout': json.loads(workout),
+            'preview_plan': json.loads(preview_plan) if preview_plan else None,
+            'validation': json.loads(validation) if validation else None,
+        }
+
+    def put(self, filepath, workout, preview_plan=None, validation=None):
+        """Store the parse results for filepath's current contents"""
+        if self._conn is None:
+            return
+        try:
+            digest = content_digest(filepath)
+            row = (
+                digest, self.parser_tag,
+                json.dumps(workout, default=_json_default),
+                json.dumps(preview_plan, default=_json_default) if preview_plan is not None else None,
+                json.dumps(validation, default=_json_default) if validation is not None else None,
+            )
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO workouts (digest, parser, workout, preview_plan, validation) "
+                    "VALUES (?, ?, ?, ?, ?)", row)
+                self._conn.commit()
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
+
+    def stats(self):
+        """Return hit/miss counters and entry count"""
+        entries = 0
+        if self._conn is not None:
+            with self._lock:
+                entries = self._conn.execute("SELECT COUNT(*) FROM workouts").fetchone()[0]
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
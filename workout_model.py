@@ -0,0 +1,244 @@
+"""
+Compact in-memory model for parsed workouts.
+
+Steps and workouts are __slots__ records rather than dicts, with enum values
+for step_type, intensity and duration_type, so a library of thousands of
+workouts stays small in memory. Both classes also behave like the dicts
+they replace (get, [], in, copy, keys/items), so the preview renderers work
+on them unchanged; keys outside the model are kept in a per-record extras
+dict.
+"""
+
+import sys
+from enum import Enum
+
+from fit_decoder import INTENSITY, WKT_STEP_DURATION
+
+
+class _StrEnum(str, Enum):
+    """Enum whose members compare, format and serialize as their string values"""
+
+    def __str__(self):
+        return self.value
+
+    def __format__(self, format_spec):
+        return format(self.value, format_spec)
+
+
+class StepType(_StrEnum):
+    ACTIVE = 'active'
+    REST = 'rest'
+    WARMUP = 'warmup'
+    COOLDOWN = 'cooldown'
+    REPEAT = 'repeat'
+
+
+# FIT profile names, e.g. Intensity.REST == 'rest', DurationType.OPEN == 'open'
+Intensity = _StrEnum('Intensity', [(name.upper(), name) for name in INTENSITY.values()],
+                     module=__name__, qualname='Intensity')
+DurationType = _StrEnum('DurationType', [(name.upper(), name) for name in WKT_STEP_DURATION.values()],
+                        module=__name__, qualname='DurationType')
+
+
+def _enum_value(enum):
+    """Coerce known string values to enum members; keep anything else as-is"""
+    members = enum._value2member_map_
+    def coerce(value):
+        if isinstance(value, str):
+            return members.get(value, value)
+        return value
+    return coerce
+
+
+def _interned(value):
+    """Share repeated strings (step names, categories) across workouts"""
+    if isinstance(value, str) and type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class _Record:
+    """Dict-compatible base for slotted records"""
+
+    __slots__ = ('_extras',)
+
+    FIELDS = ()
+    _FIELD_SET = frozenset()
+    _COERCE = {}
+
+    def __init__(self, fields=None, **kwargs):
+        self._extras = None
+        if fields:
+            for key, value in fields.items():
+                self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def __setitem__(self, key, value):
+        coerce = self._COERCE.get(key)
+        if coerce is not None:
+            value = coerce(value)
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[key] = value
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extras is not None and key in self._extras:
+            return self._extras[key]
+        raise KeyError(key)
+
+    def __delitem__(self, key):
+        if key in self._FIELD_SET and hasattr(self, key):
+            delattr(self, key)
+        elif self._extras is not None and key in self._extras:
+            del self._extras[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self._FIELD_SET:
+            return hasattr(self, key)
+        return self._extras is not None and key in self._extras
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = [name for name in self.FIELDS if hasattr(self, name)]
+        if self._extras:
+            keys.extend(self._extras)
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def copy(self):
+        """Shallow copy, like dict.copy()"""
+        clone = self.__class__.__new__(self.__class__)
+        for name in self.FIELDS:
+            try:
+                setattr(clone, name, getattr(self, name))
+            except AttributeError:
+                pass
+        clone._extras = dict(self._extras) if self._extras else None
+        return clone
+
+    def to_dict(self):
+        """Plain dict of the set fields (enum values become strings)"""
+        return {key: (value.value if isinstance(value, Enum) else value)
+                for key, value in self.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, (_Record, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+    @classmethod
+    def _define(cls, fields, coerce=None):
+        cls.FIELDS = fields
+        cls._FIELD_SET = frozenset(fields)
+        cls._COERCE = coerce or {}
+
+
+_STEP_FIELDS = (
+    'name', 'step_type', 'intensity', 'duration_type', 'duration', 'distance', 'reps',
+    'sets', 'rest_seconds', 'repeat_count', 'is_rest', 'is_repeat', 'weight', 'zone',
+    'notes', 'category', 'type', 'display_type', 'text',
+)
+
+
+class Step(_Record):
+    """One workout step (exercise, rest, warmup or repeat marker)"""
+
+    __slots__ = _STEP_FIELDS
+
+
+Step._define(_STEP_FIELDS, {
+    'step_type': _enum_value(StepType),
+    'intensity': _enum_value(Intensity),
+    'duration_type': _enum_value(DurationType),
+    'name': _interned,
+    'category': _interned,
+    'type': _interned,
+    'weight': _interned,
+    'display_type': _interned,
+})
+
+
+def _as_steps(steps):
+    return [step if isinstance(step, Step) else Step(step) for step in steps or ()]
+
+
+_SUMMARY_FIELDS = (
+    'name', 'sport', 'sub_sport', 'created',
+    'step_count', 'total_duration', 'total_sets', 'exercise_count', 'rest_count',
+)
+
+
+class WorkoutSummary(_Record):
+    """A workout's aggregates (step and set counts, total duration) plus the
+    metadata list cards show; computed once by the parser"""
+
+    __slots__ = _SUMMARY_FIELDS
+
+
+WorkoutSummary._define(_SUMMARY_FIELDS, {
+    'sport': _interned,
+    'sub_sport': _interned,
+})
+
+
+def _as_summary(summary):
+    if summary is None or isinstance(summary, WorkoutSummary):
+        return summary
+    return WorkoutSummary(summary)
+
+
+_WORKOUT_FIELDS = ('name', 'sport', 'sub_sport', 'created', 'source', 'manufacturer', 'steps', 'summary')
+
+
+class Workout(_Record):
+    """A parsed workout: metadata plus its list of Steps"""
+
+    __slots__ = _WORKOUT_FIELDS
+
+    def to_dict(self):
+        data = super().to_dict()
+        if 'steps' in data:
+            data['steps'] = [step.to_dict() for step in data['steps']]
+        if data.get('summary') is not None:
+            data['summary'] = data['summary'].to_dict()
+        return data
+
+
+Workout._define(_WORKOUT_FIELDS, {
+    'steps': _as_steps,
+    'summary': _as_summary,
+    'sport': _interned,
+    'sub_sport': _interned,
+})
@@ -0,0 +1,461 @@
+"""
+Workout parsing pipeline for the Mac app.
+
+Turns a FIT workout file into the workout dict the previews render, and
+checks it for problems that stop workouts appearing on the watch. Nothing
+here touches Tk, so these functions can run in worker processes (see
+fit_batch.py); GarminUploaderMac wraps them with its caches.
+"""
+
+import struct
+
+from fit_crc import check_fit_file_crc, verify_fit_crc
+from fit_decoder import (
+    FitDecodeError, WORKOUT_MESSAGE_TYPES, decode_fit_messages, read_fit_header
+)
+from fit_io import open_fit_buffer
+from fit_repair import repair_fit_file_binary
+from step_fields import MAC_STEP_FIELD_HANDLERS, decode_step_fields
+from workout_model import Step, Workout, WorkoutSummary
+from workout_rules import check_workout_steps, merge_rule_results
+from workout_summary import is_set_step, summarize_fit_file, summarize_workout
+
+# Try to import fitparse for FIT file parsing
+try:
+    from fitparse import FitFile
+    FITPARSE_AVAILABLE = True
+except ImportError:
+    FITPARSE_AVAILABLE = False
+
+# Try to import amakaflow-fitfiletool's parser and validator
+try:
+    from amakaflow_fitfiletool import (
+        parse_fit_file as fitfiletool_parse_fit_file,
+        validate_fit_file as fitfiletool_validate_fit_file,
+    )
+    FITFILETOOL_AVAILABLE = True
+except ImportError:
+    FITFILETOOL_AVAILABLE = False
+
+
+def parse_workout_file(filepath, validation=None):
+    """Parse a FIT file into (workout_data, validation).
+    workout_data is None if the file isn't a readable workout. A validation
+    the caller already has for the file is returned as-is, not redone."""
+    # Try fitfiletool's parser first (uses fitparse internally)
+    if FITFILETOOL_AVAILABLE:
+        result = fitfiletool_parse_fit_file(filepath)
+        if result:
+            return Workout(result), _validated(filepath, validation)
+    # Built-in decoder handles well-formed files without any libraries
+    try:
+        return parse_fit_native(filepath, validation)
+    except (OSError, FitDecodeError, struct.error):
+        pass
+    # Fall back to local fitparse implementation
+    if FITPARSE_AVAILABLE:
+        return parse_fit_with_fitparse(filepath, validation)
+    # Last resort: basic header check
+    return parse_fit_basic(filepath), _validated(filepath, validation)
+
+
+def summarize_workout_file(filepath):
+    """Compute the list-card summary of a FIT file, streaming it where possible.
+    Cards don't show validation, so the file is never validated here."""
+    # fitfiletool's parse is authoritative when installed, so summarize that
+    if FITFILETOOL_AVAILABLE:
+        result = fitfiletool_parse_fit_file(filepath)
+        if result:
+            return summarize_workout(Workout(result))
+    try:
+        return summarize_fit_file(filepath)
+    except (OSError, FitDecodeError, struct.error):
+        pass
+    if FITPARSE_AVAILABLE:
+        try:
+            return summarize_workout(build_workout_data(read_with_fitparse(filepath)))
+        except Exception:
+            pass
+    return summarize_workout(parse_fit_basic(filepath))
+
+
+def _validated(filepath, validation=None):
+    """validation if already known, else validate the file"""
+    return validate_workout_file(filepath) if validation is None else validation
+
+
+def validate_workout_file(filepath):
+    """Validate FIT file for issues that may prevent it from working on Garmin watches.
+    Returns dict with 'valid' boolean, 'issues' list and the 'validator' that checked the steps."""
+    # Built-in decoder: one mapping of the file serves the rules and the CRC check
+    try:
+        with open_fit_buffer(filepath) as data:
+            steps = decode_fit_messages(data, ('workout_step',)).get('workout_step', [])
+            crc_issues = verify_fit_crc(data)
+    except (OSError, FitDecodeError, struct.error):
+        return _with_integrity_check(filepath, _validate_workout_content(filepath))
+    return _with_integrity_check(filepath, _validate_steps(filepath, steps, 'native'), crc_issues)
+
+
+def repair_workout_file(filepath):
+    """Validate a FIT file and repair its exercise categories if they need it.
+    Returns (validation, repaired_filepath or None, error or None)."""
+    validation = validate_workout_file(filepath)
+    # Not every validator reports invalid_categories (fitfiletool's doesn't),
+    # so let the repair find them; it writes nothing when there are none
+    try:
+        new_filepath, _replacements = repair_fit_file_binary(filepath)
+    except (OSError, FitDecodeError, struct.error) as e:
+        return validation, None, None if validation['valid'] else str(e)
+    return validation, new_filepath, None
+
+
+def _with_integrity_check(filepath, validation, crc_issues=None):
+    """Add header/file CRC problems (corrupted or truncated files) to a validation result.
+    crc_issues may be passed in when the caller has already checked the file."""
+    if crc_issues is None:
+        try:
+            crc_issues = check_fit_file_crc(filepath)
+        except OSError as e:
+            crc_issues = [f"Could not read file: {str(e)}"]
+    validation['crc_valid'] = not crc_issues
+    if crc_issues:
+        validation['issues'] = crc_issues + validation['issues']
+        validation['valid'] = False
+    return validation
+
+
+def _validate_workout_content(filepath):
+    """Validate the workout steps of a FIT file the built-in decoder can't read,
+    with fitfiletool and/or the rules over fitparse's decode"""
+    if not FITPARSE_AVAILABLE:
+        if FITFILETOOL_AVAILABLE:
+            return _fitfiletool_validation(filepath)
+        return {'valid': True, 'issues': [], 'warnings': [], 'invalid_categories': [], 'validator': None}
+
+    try:
+        fitfile = FitFile(filepath)
+        steps = []
+        visit_fit_messages(fitfile, {'workout_step': steps.append})
+    except Exception as e:
+        if FITFILETOOL_AVAILABLE:
+            return _fitfiletool_validation(filepath)
+        return {'valid': False, 'issues': [f"Error validating file: {str(e)}"], 'warnings': [],
+                'invalid_categories': [], 'validator': 'fitparse'}
+    return _validate_steps(filepath, steps, 'fitparse')
+
+
+def _fitfiletool_validation(filepath):
+    """fitfiletool's validation of a file, in our result format"""
+    result = fitfiletool_validate_fit_file(filepath)
+    # Add empty invalid_categories for compatibility
+    if 'invalid_categories' not in result:
+        result['invalid_categories'] = []
+    result.setdefault('warnings', [])
+    result['validator'] = 'fitfiletool'
+    return result
+
+
+def _validate_steps(filepath, steps, decoder):
+    """Run the rules over a file's decoded workout_step messages, adding in
+    fitfiletool's validation when it's installed.
+    decoder names the decoder the steps came from."""
+    validation = validate_step_messages(steps, decoder)
+    if not FITFILETOOL_AVAILABLE:
+        return validation
+    return merge_rule_results(_fitfiletool_validation(filepath), validation)
+
+
+def validate_step_messages(steps, validator=None):
+    """Check decoded workout_step messages for problems watches reject (see workout_rules.py).
+    validator names the decoder the steps came from."""
+    return check_workout_steps(steps, validator)
+
+
+def _validate_decoded(filepath, messages, decoder, crc_issues=None):
+    """Validate the steps a parse just decoded"""
+    steps = messages.get('workout_step', [])
+    return _with_integrity_check(filepath, _validate_steps(filepath, steps, decoder), crc_issues)
+
+
+def parse_fit_native(filepath, validation=None):
+    """Parse FIT file using the built-in record-by-record decoder into (workout_data, validation).
+    The file is mapped once for both decoding and the CRC check (skipped when
+    validation is already known).
+    Raises FitDecodeError if the file can't be decoded."""
+    with open_fit_buffer(filepath) as data:
+        messages = decode_fit_messages(data, WORKOUT_MESSAGE_TYPES)
+        if validation is not None:
+            return build_workout_data(messages), validation
+        crc_issues = verify_fit_crc(data)
+    return build_workout_data(messages), _validate_decoded(filepath, messages, 'native', crc_issues)
+
+
+def parse_fit_with_fitparse(filepath, validation=None):
+    """Parse FIT file using fitparse library into (workout_data, validation)"""
+    try:
+        messages = read_with_fitparse(filepath)
+        if validation is None:
+            validation = _validate_decoded(filepath, messages, 'fitparse')
+        return build_workout_data(messages), validation
+
+    except Exception as e:
+        # Silently fall back to basic parsing
+        return parse_fit_basic(filepath), _validated(filepath, validation)
+
+
+def read_with_fitparse(filepath):
+    """Decode a FIT file's workout messages with fitparse ({message_name: [fields, ...]})"""
+    fitfile = FitFile(filepath)
+
+    # Single pass: each message is decoded once and routed by type
+    messages = {message_type: [] for message_type in WORKOUT_MESSAGE_TYPES}
+    visit_fit_messages(fitfile, {
+        message_type: collected.append for message_type, collected in messages.items()
+    })
+    return messages
+
+
+def visit_fit_messages(fitfile, collectors):
+    """Walk every fitparse message once, passing each one's fields to the
+    collector registered for its message type"""
+    for record in fitfile.get_messages():
+        collector = collectors.get(record.name)
+        if collector is not None:
+            collector({field.name: field.value for field in record.fields})
+
+
+def build_workout_data(messages):
+    """Build workout data from decoded FIT messages ({message_name: [fields, ...]})"""
+    workout_data = Workout({
+        'name': 'Workout',
+        'sport': None,
+        'steps': [],
+        'created': None,
+        'source': None
+    })
+
+    # Get file metadata
+    for fields in messages.get('file_id', []):
+        for name, value in fields.items():
+            if name == 'time_created' and value:
+                workout_data['created'] = str(value)
+            elif name == 'manufacturer' and value:
+                workout_data['manufacturer'] = str(value)
+            elif name == 'garmin_product' and value:
+                workout_data['source'] = str(value).replace('_', ' ').title()
+
+    # First pass: collect exercise titles for lookup (strength workouts)
+    exercise_titles = {}
+    for fields in messages.get('exercise_title', []):
+        title_data = {}
+        for name, value in fields.items():
+            if name == 'wkt_step_name':
+                title_data['name'] = value
+            elif name == 'exercise_category':
+                title_data['category'] = str(value) if value else None
+            elif name == 'exercise_name':
+                title_data['exercise_id'] = value
+
+        if title_data.get('category') and title_data.get('name'):
+            key = (title_data.get('category'), title_data.get('exercise_id'))
+            exercise_titles[key] = title_data['name']
+            exercise_titles[title_data.get('category')] = title_data['name']
+
+    # Get workout name and sport type
+    for fields in messages.get('workout', []):
+        for name, value in fields.items():
+            if name == 'wkt_name' and value:
+                workout_data['name'] = value
+            elif name == 'sport' and value:
+                workout_data['sport'] = str(value)
+            elif name == 'sub_sport' and value:
+                workout_data['sub_sport'] = str(value)
+
+    # Second pass: get workout steps
+    steps_raw = [decode_step_fields(fields, MAC_STEP_FIELD_HANDLERS)
+                 for fields in messages.get('workout_step', [])]
+
+    # Determine if this is a cardio workout (running, cycling, etc.) vs strength
+    sport_lower = (workout_data.get('sport') or '').lower()
+    sub_sport_lower = (workout_data.get('sub_sport') or '').lower()
+    cardio_sports = ['running', 'cycling', 'swimming', 'walking', 'hiking', 'run', 'bike', 'swim', 'walk', 'hike', 'cardio', 'trail_running', 'treadmill']
+    is_cardio = sport_lower in cardio_sports or sub_sport_lower in cardio_sports or 'run' in sport_lower or 'run' in sub_sport_lower
+
+    # Third pass: process steps, totting up the workout summary as we go
+    # Keep rest and repeat steps as separate entries for grouped display
+    exercises = []
+    total_duration = 0
+    total_sets = 0
+    rest_count = 0
+    repeat_count = 0
+    i = 0
+    while i < len(steps_raw):
+        step = steps_raw[i]
+
+        # Handle repeat markers - keep as separate step for grouped display
+        if step.get('is_repeat'):
+            repeat_step = Step({
+                'is_repeat': True,
+                'repeat_count': step.get('repeat_count', 0),
+                'name': f"{step.get('repeat_count', 0)} Sets",
+                'step_type': 'repeat'
+            })
+            # Also update previous exercise's sets for badge display
+            if exercises and step.get('repeat_count'):
+                for ex in reversed(exercises):
+                    if not ex.get('is_rest') and not ex.get('is_repeat'):
+                        if is_set_step(ex):
+                            total_sets += step['repeat_count'] - ex.get('sets', 1)
+                        ex['sets'] = step['repeat_count']
+                        break
+            exercises.append(repeat_step)
+            repeat_count += 1
+            i += 1
+            continue
+
+        # Handle rest steps - keep as separate entries for grouped display
+        if step.get('is_rest'):
+            rest_step = Step({
+                'is_rest': True,
+                'step_type': 'rest',
+                'name': 'Rest',
+                'intensity': step.get('intensity'),
+                'duration_type': step.get('duration_type', 'time'),
+                'rest_seconds': step.get('duration', 0),
+                'duration': step.get('duration', 0),
+                'category': step.get('category')
+            })
+            if step.get('duration_type') in ('open', 'repeat_until_steps_cmplt'):
+                rest_step['duration_type'] = 'open'
+            exercises.append(rest_step)
+            total_duration += rest_step['duration']
+            rest_count += 1
+            i += 1
+            continue
+
+        # Handle warmup steps - keep as separate entries
+        if step.get('is_warmup'):
+            warmup_step = Step({
+                'step_type': 'warmup',
+                'name': step.get('name') or 'Warm-Up',
+                'intensity': step.get('intensity'),
+                'duration_type': step.get('duration_type', 'time'),
+                'duration': step.get('duration', 0),
+                'category': step.get('category')
+            })
+            if step.get('duration_type') in ('open', 'repeat_until_steps_cmplt'):
+                warmup_step['duration_type'] = 'open'
+            exercises.append(warmup_step)
+            total_duration += warmup_step['duration']
+            i += 1
+            continue
+
+        exercise = Step()
+        cat = step.get('category')
+        ex_id = step.get('exercise_id')
+        intensity = step.get('intensity')
+        notes = step.get('notes')
+        if intensity is not None:
+            exercise['intensity'] = intensity
+
+        # Build step name based on workout type
+        if is_cardio:
+            # For cardio workouts, use intensity + notes
+            sport_name = workout_data.get('sport', 'exercise').title()
+
+            # FIT SDK intensity: 0=active, 1=rest, 2=warmup, 3=cooldown
+            if intensity in ('warmup', '2', 2):
+                exercise['name'] = 'Warm Up'
+                exercise['step_type'] = 'warmup'
+            elif intensity in ('cooldown', '3', 3):
+                exercise['name'] = 'Cool Down'
+                exercise['step_type'] = 'cooldown'
+            elif intensity in ('rest', '1', 1):
+                exercise['name'] = 'Recovery'
+                exercise['step_type'] = 'rest'
+            elif intensity in ('active', '0', 0):
+                exercise['name'] = notes if notes else sport_name
+                exercise['step_type'] = 'active'
+            else:
+                exercise['name'] = notes if notes else sport_name
+                exercise['step_type'] = 'active'
+
+            # Add notes as subtitle if we used intensity for name
+            if notes and exercise['name'] != notes:
+                exercise['notes'] = notes
+        else:
+            # For strength workouts, use exercise title lookup
+            if step.get('name'):
+                exercise['name'] = step['name']
+            elif cat and (cat, ex_id) in exercise_titles:
+                exercise['name'] = exercise_titles[(cat, ex_id)]
+            elif cat and cat in exercise_titles:
+                exercise['name'] = exercise_titles[cat]
+            elif cat:
+                exercise['name'] = cat.replace('_', ' ').title()
+            else:
+                exercise['name'] = 'Exercise'
+
+        # Copy over exercise data
+        if step.get('reps'):
+            exercise['reps'] = step['reps']
+        if step.get('duration'):
+            exercise['duration'] = step['duration']
+        if step.get('distance'):
+            exercise['distance'] = step['distance']
+        if step.get('weight'):
+            weight = step['weight']
+            unit = step.get('weight_unit', 'kg')
+            if unit == 'pound':
+                exercise['weight'] = f"{weight:.0f} lbs"
+            else:
+                exercise['weight'] = f"{weight:.1f} kg"
+        if step.get('notes') and is_cardio:
+            exercise['zone'] = step['notes']
+
+        exercise['sets'] = 1
+        exercise['type'] = cat.replace('_', ' ').title() if cat else ''
+        exercise['category'] = cat  # Keep original category for display lookup
+
+        exercises.append(exercise)
+        total_duration += exercise.get('duration', 0)
+        if exercise.get('step_type') == 'rest':
+            rest_count += 1
+        elif is_set_step(exercise):
+            total_sets += 1
+        i += 1
+
+    workout_data['steps'] = exercises
+    workout_data['summary'] = WorkoutSummary({
+        'name': workout_data['name'],
+        'sport': workout_data['sport'],
+        'sub_sport': workout_data.get('sub_sport'),
+        'created': workout_data['created'],
+        'step_count': len(exercises),
+        'total_duration': total_duration,
+        'total_sets': total_sets,
+        'exercise_count': len(exercises) - rest_count - repeat_count,
+        'rest_count': rest_count,
+    })
+    return workout_data if exercises else None
+
+
+def parse_fit_basic(filepath):
+    """Basic FIT file check when workout records can't be decoded"""
+    try:
+        with open(filepath, 'rb') as f:
+            read_fit_header(f.read(64))
+
+        # The header is valid but the records aren't - show a placeholder
+        return Workout({
+            'name': 'Workout',
+            'steps': [
+                Step({'name': 'Workout content', 'type': 'workout'}),
+                Step({'name': '(Workout steps could not be decoded)', 'type': 'info'})
+            ]
+        })
+
+    except Exception as e:
+        # Silently return None for invalid files
+        return None
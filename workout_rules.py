@@ -0,0 +1,187 @@
+"""
+Structural validation rules for workout steps.
+
+Each rule looks at one decoded workout_step message ({field name: value})
+at a time and may finish with a check over the whole workout. The rules are
+compiled once into a RuleSet, which runs every rule over the steps in a
+single pass and records how long each rule took, so new rules can be kept
+cheap enough to run on every file that is added.
+"""
+
+import time
+from collections import namedtuple
+
+from fit_decoder import WKT_STEP_DURATION
+
+# Valid FIT SDK exercise categories are 0-32
+VALID_CATEGORIES = frozenset(range(33))
+
+# Duration types of the FIT profile (named as the decoder and fitparse name them)
+DURATION_TYPES = WKT_STEP_DURATION
+REPEAT_DURATION_TYPES = frozenset(name for name in DURATION_TYPES.values() if name.startswith('repeat_'))
+
+# Most Garmin watches load workouts of up to 50 steps
+MAX_WORKOUT_STEPS = 50
+
+# name: label used for timings; check(report, index, step) runs per step and
+# finish(report) once at the end (either may be None)
+Rule = namedtuple('Rule', ['name', 'check', 'finish'])
+
+
+class RuleReport:
+    """What the rules found in one workout"""
+
+    __slots__ = ('step_count', 'issues', 'warnings', 'invalid_categories', 'unknown_durations')
+
+    def __init__(self, step_count):
+        self.step_count = step_count
+        self.issues = []
+        self.warnings = []
+        self.invalid_categories = set()
+        self.unknown_durations = set()
+
+
+def _step_number(index, step):
+    """The step's message_index when present, else its position"""
+    value = step.get('message_index')
+    return value if isinstance(value, int) else index
+
+
+def _duration_name(step):
+    value = step.get('duration_type')
+    return value if value is None or isinstance(value, str) else DURATION_TYPES.get(value, value)
+
+
+# =========================================================================
+# Rules
+# =========================================================================
+
+def _check_category(report, index, step):
+    value = step.get('exercise_category')
+    # Named categories are valid; raw numbers are ones the decoder doesn't know
+    if isinstance(value, int) and value not in VALID_CATEGORIES:
+        report.invalid_categories.add(value)
+
+
+def _finish_category(report):
+    if report.invalid_categories:
+        report.issues.append(f"Invalid exercise categories found: {list(report.invalid_categories)}")
+        report.issues.append("These may cause the workout to not appear on your Garmin watch.")
+
+
+def _check_repeat_target(report, index, step):
+    if _duration_name(step) not in REPEAT_DURATION_TYPES:
+        return
+    target = step.get('duration_step')
+    if not isinstance(target, int):
+        return
+    number = _step_number(index, step)
+    if target >= report.step_count:
+        report.issues.append(f"Step {number + 1} repeats from step {target + 1}, "
+                             f"but the workout only has {report.step_count} steps")
+    elif target > number:
+        report.issues.append(f"Step {number + 1} repeats from step {target + 1}, which comes after it")
+
+
+def _check_zero_repeat(report, index, step):
+    duration = _duration_name(step)
+    if duration not in REPEAT_DURATION_TYPES:
+        return
+    number = _step_number(index, step)
+    if step.get('duration_step') == number:
+        report.issues.append(f"Step {number + 1} repeats itself - the repeat has no steps in it")
+    elif duration == 'repeat_until_steps_cmplt' and step.get('repeat_steps') == 0:
+        report.issues.append(f"Step {number + 1} repeats 0 times")
+
+
+def _finish_step_limit(report):
+    if report.step_count > MAX_WORKOUT_STEPS:
+        report.warnings.append(f"Workout has {report.step_count} steps - most Garmin watches "
+                               f"only load workouts of up to {MAX_WORKOUT_STEPS} steps")
+
+
+_KNOWN_DURATIONS = frozenset(DURATION_TYPES.values())
+
+
+def _check_duration_type(report, index, step):
+    duration = _duration_name(step)
+    if duration is not None and duration not in _KNOWN_DURATIONS:
+        report.unknown_durations.add(str(duration))
+
+
+def _finish_duration_type(report):
+    if report.unknown_durations:
+        report.warnings.append(f"Unsupported step duration types: {sorted(report.unknown_durations)}")
+
+
+WORKOUT_RULES = (
+    Rule('exercise_category', _check_category, _finish_category),
+    Rule('repeat_target', _check_repeat_target, None),
+    Rule('zero_repeat', _check_zero_repeat, None),
+    Rule('step_limit', None, _finish_step_limit),
+    Rule('duration_type', _check_duration_type, _finish_duration_type),
+)
+
+
+# =========================================================================
+# Engine
+# =========================================================================
+
+class RuleSet:
+    """A compiled set of rules, run over a workout's steps in one pass"""
+
+    def __init__(self, rules):
+        self.names = tuple(rule.name for rule in rules)
+        self._checks = tuple((rule.name, rule.check) for rule in rules if rule.check)
+        self._finishers = tuple((rule.name, rule.finish) for rule in rules if rule.finish)
+
+    def run(self, steps, validator=None):
+        """Check decoded workout_step messages; returns the validation dict.
+        validator names the decoder the steps came from; 'rule_timings'
+        gives each rule's time in milliseconds."""
+        steps = steps if isinstance(steps, (list, tuple)) else list(steps)
+        report = RuleReport(len(steps))
+        timings = dict.fromkeys(self.names, 0)
+        clock = time.perf_counter_ns
+        checks = self._checks
+
+        for index, step in enumerate(steps):
+            for name, check in checks:
+                start = clock()
+                check(report, index, step)
+                timings[name] += clock() - start
+        for name, finish in self._finishers:
+            start = clock()
+            finish(report)
+            timings[name] += clock() - start
+
+        return {
+            'valid': not report.issues,
+            'issues': report.issues,
+            'warnings': report.warnings,
+            'invalid_categories': list(report.invalid_categories),
+            'validator': validator,
+            'rule_timings': {name: elapsed / 1e6 for name, elapsed in timings.items()},
+        }
+
+
+DEFAULT_RULE_SET = RuleSet(WORKOUT_RULES)
+
+
+def check_workout_steps(steps, validator=None):
+    """Run the standard rules over decoded workout_step messages"""
+    return DEFAULT_RULE_SET.run(steps, validator)
+
+
+def merge_rule_results(validation, rules):
+    """Add the findings of check_workout_steps (rules) to another validator's
+    result, e.g. fitfiletool's; returns validation"""
+    issues = validation.get('issues', [])
+    warnings = validation.get('warnings', [])
+    validation['issues'] = issues + [issue for issue in rules['issues'] if issue not in issues]
+    validation['warnings'] = warnings + [warning for warning in rules['warnings'] if warning not in warnings]
+    validation['invalid_categories'] = sorted(set(validation.get('invalid_categories', []))
+                                              | set(rules['invalid_categories']))
+    validation['valid'] = validation.get('valid', True) and rules['valid']
+    validation['rule_timings'] = rules['rule_timings']
+    return validation
@@ -0,0 +1,176 @@
+"""
+Workout summaries.
+
+A WorkoutSummary (see workout_model.py) carries a workout's name, sport and
+created date plus its aggregates - step, exercise and rest counts, total
+duration and total sets. The parser records one with every workout it
+builds, so views read it rather than iterating steps; for list cards it can
+also be computed while streaming decoded FIT messages, without building
+per-step dicts or resolving exercise titles.
+"""
+
+from fit_decoder import iter_fit_messages
+from fit_io import open_fit_buffer
+from workout_model import WorkoutSummary
+
+# Messages and fields a summary needs (exercise titles and step names
+# only affect how steps are labelled, so they're never decoded)
+SUMMARY_MESSAGE_TYPES = ('file_id', 'workout', 'workout_step')
+SUMMARY_FIELD_NAMES = frozenset((
+    'time_created',
+    'wkt_name', 'sport', 'sub_sport',
+    'duration_type', 'duration_value', 'target_type', 'target_value', 'intensity',
+))
+
+
+def _is_repeat_step(fields):
+    """Mirror the parser's repeat detection for a decoded workout_step"""
+    if fields.get('repeat_steps'):
+        return True
+    dtype_str = str(fields['duration_type']) if fields.get('duration_type') else ''
+    return 'repeat' in dtype_str.lower() or dtype_str in ('6', '7', '8', '9')
+
+
+def _is_rest_step(fields):
+    """Mirror the parser's rest detection for a decoded workout_step"""
+    intensity = fields.get('intensity')
+    intensity = str(intensity) if intensity is not None else None
+    return intensity in ('rest', '1')
+
+
+def _is_warmup_step(fields):
+    """Mirror the parser's warmup detection for a decoded workout_step"""
+    intensity = fields.get('intensity')
+    intensity = str(intensity) if intensity is not None else None
+    return intensity in ('warmup', '2')
+
+
+def is_set_step(step):
+    """Whether a parsed step counts toward total sets: exercises do (a repeated
+    one as its repeat count); rests, warmups and repeat markers don't"""
+    if step.get('is_rest') or step.get('is_repeat'):
+        return False
+    return step.get('step_type') not in ('rest', 'warmup')
+
+
+def _repeat_count(fields):
+    """Repeat count the parser would record for a repeat step"""
+    if fields.get('repeat_steps'):
+        return int(fields['repeat_steps'])
+    value = fields.get('duration_value')
+    return int(value) if value is not None else 0
+
+
+def summarize_fit_messages(messages):
+    """Build a workout summary from (message_name, fields) pairs in file order.
+
+    Matches the summary the parser records for the same workout.
+    Returns None if the messages contain no workout steps.
+    """
+    summary = {
+        'name': 'Workout',
+        'sport': None,
+        'sub_sport': None,
+        'created': None,
+        'step_count': 0,
+        'total_duration': 0,
+        'total_sets': 0,
+        'exercise_count': 0,
+        'rest_count': 0,
+    }
+    # Sets of the last step a repeat marker would apply to, and whether
+    # that step counts toward total sets (warmups don't)
+    last_sets = None
+    last_counts = False
+
+    for name, fields in messages:
+        if name == 'workout_step':
+            summary['step_count'] += 1
+            if _is_repeat_step(fields):
+                count = _repeat_count(fields)
+                if count and last_sets is not None:
+                    if last_counts:
+                        summary['total_sets'] += count - last_sets
+                    last_sets = count
+                continue
+            if fields.get('duration_time'):
+                summary['total_duration'] += float(fields['duration_time'])
+            if _is_rest_step(fields):
+                summary['rest_count'] += 1
+            else:
+                summary['exercise_count'] += 1
+                last_sets = 1
+                last_counts = not _is_warmup_step(fields)
+                if last_counts:
+                    summary['total_sets'] += 1
+        elif name == 'workout':
+            if fields.get('wkt_name'):
+                summary['name'] = fields['wkt_name']
+            if fields.get('sport'):
+                summary['sport'] = str(fields['sport'])
+            if fields.get('sub_sport'):
+                summary['sub_sport'] = str(fields['sub_sport'])
+        elif name == 'file_id':
+            if fields.get('time_created'):
+                summary['created'] = str(fields['time_created'])
+
+    return WorkoutSummary(summary) if summary['step_count'] else None
+
+
+def summarize_fit_file(filepath):
+    """Stream a FIT file's workout messages into a summary.
+    Raises FitDecodeError if the file can't be decoded."""
+    with open_fit_buffer(filepath) as data:
+        return summarize_fit_messages(iter_fit_messages(data, SUMMARY_MESSAGE_TYPES, SUMMARY_FIELD_NAMES))
+
+
+def summarize_steps(workout_data):
+    """Compute a parsed workout's summary from its steps, in one pass"""
+    steps = workout_data.get('steps', [])
+    total_duration = 0
+    total_sets = 0
+    rest_count = 0
+    repeat_count = 0
+    for step in steps:
+        total_duration += step.get('duration', 0)
+        if is_set_step(step):
+            total_sets += step.get('sets', 1)
+        if step.get('is_repeat'):
+            repeat_count += 1
+        elif step.get('is_rest') or step.get('step_type') == 'rest':
+            rest_count += 1
+    return WorkoutSummary({
+        'name': workout_data.get('name'),
+        'sport': workout_data.get('sport'),
+        'sub_sport': workout_data.get('sub_sport'),
+        'created': workout_data.get('created'),
+        'step_count': len(steps),
+        'total_duration': total_duration,
+        'total_sets': total_sets,
+        'exercise_count': len(steps) - rest_count - repeat_count,
+        'rest_count': rest_count,
+    })
+
+
+def summarize_workout(workout_data):
+    """Return a parsed workout's summary - the one the parser recorded, when it did"""
+    if not workout_data:
+        return None
+    summary = workout_data.get('summary')
+    if summary is None:
+        # Parsed elsewhere (e.g. by fitfiletool); remember it with the workout
+        summary = workout_data['summary'] = summarize_steps(workout_data)
+    return summary
+
+
+def workout_stats(summary, with_rests=False):
+    """The preview footers' stats ("9 steps", "4 exercises", "6 total sets"),
+    followed by the rest count ("3 rest") with_rests"""
+    parts = [f"{summary['step_count']} steps"]
+    if summary['exercise_count'] > 0:
+        parts.append(f"{summary['exercise_count']} exercises")
+    if summary['total_sets'] > summary['exercise_count']:
+        parts.append(f"{summary['total_sets']} total sets")
+    if with_rests and summary['rest_count'] > 0:
+        parts.append(f"{summary['rest_count']} rest")
+    return parts